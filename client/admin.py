@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Employee, Attendance, Performance
+from .models import Employee, Attendance, Performance, AttendanceMonthlyRollup, DepartmentMonthlyRollup
+from .search import search_employee_ids
+from .services import employee_status_count
+
+ADMIN_SEARCH_LIMIT = 1000  # best full-text matches listed by the changelist search
 
 
 # ========================================
@@ -29,6 +33,12 @@ class EmployeeAdmin(admin.ModelAdmin):
     def get_email(self, obj):
         return obj.user.email if obj.user else "-"
 
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text index on the search documents instead of icontains across the user join
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(id__in=search_employee_ids(search_term, ADMIN_SEARCH_LIMIT)), False
+
 
 # ========================================
 # Attendance Admin
@@ -57,19 +67,20 @@ class AttendanceAdmin(admin.ModelAdmin):
     def get_employee_email(self, obj):
         return obj.employee.user.email if obj.employee and obj.employee.user else "-"
 
-    @admin.display(description="Present Days")
+    def get_queryset(self, request):
+        # Per-employee totals come back with the changelist query itself
+        return super().get_queryset(request).annotate(
+            present_days_count=employee_status_count(Attendance.STATUS_PRESENT),
+            absent_days_count=employee_status_count(Attendance.STATUS_ABSENT),
+        )
+
+    @admin.display(description="Present Days", ordering="present_days_count")
     def present_days(self, obj):
-        return Attendance.objects.filter(
-            employee=obj.employee,
-            status=Attendance.STATUS_PRESENT
-        ).count()
+        return obj.present_days_count
 
-    @admin.display(description="Absent Days")
+    @admin.display(description="Absent Days", ordering="absent_days_count")
     def absent_days(self, obj):
-        return Attendance.objects.filter(
-            employee=obj.employee,
-            status=Attendance.STATUS_ABSENT
-        ).count()
+        return obj.absent_days_count
 
 
 # ========================================
@@ -93,3 +104,37 @@ class PerformanceAdmin(admin.ModelAdmin):
     @admin.display(description="Employee Username", ordering="employee__user__username")
     def get_employee_username(self, obj):
         return obj.employee.user.username if obj.employee and obj.employee.user else "-"
+
+
+# ========================================
+# Attendance Rollup Admin (read-only)
+# ========================================
+class ReadOnlyRollupAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AttendanceMonthlyRollup)
+class AttendanceMonthlyRollupAdmin(ReadOnlyRollupAdmin):
+    list_display = ("id", "get_employee_username", "month", "present_count", "absent_count")
+    list_filter = ("month",)
+    search_fields = ("employee__user__username",)
+    ordering = ("-month",)
+    list_select_related = ("employee", "employee__user")
+
+    @admin.display(description="Employee Username", ordering="employee__user__username")
+    def get_employee_username(self, obj):
+        return obj.employee.user.username if obj.employee and obj.employee.user else "-"
+
+
+@admin.register(DepartmentMonthlyRollup)
+class DepartmentMonthlyRollupAdmin(ReadOnlyRollupAdmin):
+    list_display = ("id", "department", "month", "present_count", "absent_count")
+    list_filter = ("month", "department")
+    ordering = ("-month", "department")
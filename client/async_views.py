@@ -0,0 +1,191 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .authentication import EMPLOYEE_ID_CLAIM, ClaimsJWTAuthentication, ClaimsUser, get_employee_id
+from .cache import aget_cached_profile, aget_profile_version, aset_cached_profile
+from .conditional import EMBEDS_EMPLOYEE, aconditional_response, aqueryset_state, conditional_response
+from .fieldsets import always_loaded, sparse_queryset, wants_sparse
+from .models import Employee, Attendance, Performance
+from .filters import filter_attendance, filter_performance
+from .pagination import DateKeysetPagination, PerformanceKeysetPagination
+from .serializers import (
+    AttendanceSerializer, PerformanceSerializer, AttendanceCompactSerializer, PerformanceCompactSerializer,
+    EmployeeCompactSerializer,
+)
+from .services import aget_dashboard_metrics
+from .views import profile_payload, wants_compact, wants_employee_sideload
+
+
+# ======================================
+# ASYNC AUTH / PERMISSIONS
+# ======================================
+# Native async views for the read-heavy endpoints. Under ASGI they run on
+# the event loop instead of holding a worker thread; every database call
+# goes through the async ORM and every cache call through the async cache API.
+
+async def aauthenticate(request):
+    """
+    ClaimsJWTAuthentication for async views. Tokens carrying our claims
+    become a ClaimsUser without any I/O; older tokens fall back to the
+    (cached) User lookup in a thread. Returns None without credentials.
+    """
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    token = authentication.get_validated_token(raw_token)
+    if EMPLOYEE_ID_CLAIM in token and jwt_settings.USER_ID_CLAIM in token:
+        return ClaimsUser(token)
+    return await sync_to_async(authentication.get_user)(token)
+
+
+def error_response(exc):
+    response = JsonResponse({"detail": exc.detail} if isinstance(exc.detail, str) else exc.detail,
+                            status=exc.status_code, safe=False)
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+        response["WWW-Authenticate"] = 'Bearer realm="api"'
+    return response
+
+
+def async_read_view(view):
+    """
+    GET-only async view: JWT authentication, IsAuthenticated, and DRF
+    exceptions rendered as JSON, mirroring the sync DRF views.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return JsonResponse({"detail": f'Method "{request.method}" not allowed.'},
+                                status=status.HTTP_405_METHOD_NOT_ALLOWED)
+        try:
+            try:
+                user = await aauthenticate(request)
+            except TokenError as exc:
+                raise InvalidToken(exc.args[0])
+            if user is None:
+                raise NotAuthenticated()
+            request.user = user
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            return error_response(exc)
+    return wrapper
+
+
+def is_admin(user):
+    return user.is_staff or user.is_superuser
+
+
+async def asideload_employees(employee_ids):
+    employees = Employee.objects.filter(id__in=set(employee_ids)).only(
+        "id", "user_id", "name", "department", "role"
+    )
+    return {employee.id: EmployeeCompactSerializer(employee).data async for employee in employees}
+
+
+async def paginated_response(request, queryset, serializer_class, compact, pagination_class=DateKeysetPagination):
+    """
+    Keyset page + optional employee side-load, validated by ETag. The page
+    is only read and serialized when the client's copy is out of date.
+    """
+    query = Request(request)
+    context = {"request": query}
+    if wants_sparse(query):
+        queryset = sparse_queryset(
+            queryset, serializer_class(context=context),
+            always=always_loaded(queryset.model, pagination_class) + ["employee"],
+        )
+    last_modified, count = await aqueryset_state(queryset, related=EMBEDS_EMPLOYEE)
+
+    async def render():
+        paginator = pagination_class()
+        page = await paginator.apaginate_queryset(queryset, query)
+        data = {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": serializer_class(page, many=True, context=context).data,
+        }
+        if compact and wants_employee_sideload(query):
+            data["employees"] = await asideload_employees(row.employee_id for row in page)
+        return JsonResponse(data)
+
+    return await aconditional_response(request, last_modified, count, render, send_last_modified=False)
+
+
+# ======================================
+# PROFILE
+# ======================================
+
+@async_read_view
+async def my_profile(request):
+    """Async my-profile: same versioned cache entry as the sync view."""
+    user = request.user
+    version = await aget_profile_version(user.id)
+    cached = await aget_cached_profile(user.id, version)
+    if cached is None:
+        db_user = await User.objects.select_related("employee").aget(pk=user.id)
+        cached = profile_payload(db_user)
+        await aset_cached_profile(user.id, version, *cached)
+
+    data, updated_at = cached
+    return conditional_response(request, updated_at, 1, lambda: JsonResponse(data), version=version)
+
+
+# ======================================
+# DASHBOARD
+# ======================================
+
+@async_read_view
+async def dashboard_home(request):
+    return JsonResponse(await aget_dashboard_metrics())
+
+
+# ======================================
+# PERFORMANCE LIST
+# ======================================
+
+@async_read_view
+async def performance_list(request):
+    """Async GET of /performance/: admins see all, employees their own records."""
+    user = request.user
+    performances = Performance.objects.select_related("employee", "employee__user")
+    if not is_admin(user):
+        employee_id = get_employee_id(user)
+        if not employee_id:
+            return JsonResponse({"error": "Employee record not found"}, status=status.HTTP_404_NOT_FOUND)
+        performances = performances.filter(employee_id=employee_id)
+
+    query = Request(request)
+    performances = filter_performance(performances, query)
+    compact = wants_compact(query)
+    if compact:
+        performances = performances.select_related(None)
+    serializer_class = PerformanceCompactSerializer if compact else PerformanceSerializer
+    return await paginated_response(request, performances, serializer_class, compact, PerformanceKeysetPagination)
+
+
+# ======================================
+# ATTENDANCE LIST
+# ======================================
+
+@async_read_view
+async def attendance_list(request):
+    """Async GET of /attendance/ with the same keyset pages and ?compact=true."""
+    query = Request(request)
+    attendance = filter_attendance(Attendance.objects.select_related("employee", "employee__user"), query)
+    compact = wants_compact(query)
+    if compact:
+        attendance = attendance.select_related(None)
+    serializer_class = AttendanceCompactSerializer if compact else AttendanceSerializer
+    return await paginated_response(request, attendance, serializer_class, compact)
@@ -0,0 +1,186 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cache import jwt_user_cache_key, jwt_user_cache_timeout
+from .models import Employee
+
+# Claims that let an access token stand in for the User row
+EMPLOYEE_ID_CLAIM = "employee_id"
+# request.auth of a Prometheus scrape authenticated by MetricsTokenAuthentication
+METRICS_SCRAPE = "metrics-scrape"
+
+
+# -------------------------------
+# Credential lookups
+# -------------------------------
+def users_by_login(field, value):
+    """
+    Case-insensitive match on `username` or `email` written as
+    LOWER(field) = LOWER(value) so the functional indexes from
+    migration 0011 serve it.
+    """
+    return (
+        User.objects.select_related("employee")
+        .annotate(login_key=Lower(field))
+        .filter(login_key=Lower(Value(value)))
+    )
+
+
+# -------------------------------
+# Token issuing
+# -------------------------------
+def add_user_claims(token, user):
+    """Embed the identity the views need so requests can skip the user query."""
+    token["username"] = user.username
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token[EMPLOYEE_ID_CLAIM] = get_employee_id(user)
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token without the user claims. Each access token it mints reads
+    them from the current User row, so a demotion or a profile created after
+    login shows up on the next refresh instead of living as long as the
+    refresh token. Claims left in older refresh tokens are not copied.
+    """
+    no_copy_claims = (*RefreshToken.no_copy_claims, "username", "is_staff", "is_superuser", EMPLOYEE_ID_CLAIM)
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.user = user
+        return token
+
+    @property
+    def access_token(self):
+        user = getattr(self, "user", None)
+        if user is None:
+            user = User.objects.select_related("employee").get(
+                **{api_settings.USER_ID_FIELD: self[api_settings.USER_ID_CLAIM]}
+            )
+        return add_user_claims(super().access_token, user)
+
+
+def issue_tokens(user):
+    """Refresh token whose .access_token carries the user claims."""
+    return ClaimsRefreshToken.for_user(user)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """api/token/ issues the same tokens as login/signup."""
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """api/token/refresh/ re-reads the user claims instead of copying them."""
+    token_class = ClaimsRefreshToken
+
+
+# -------------------------------
+# Claim-backed user
+# -------------------------------
+class ClaimsUser(TokenUser):
+    """
+    Lightweight request.user built from token claims. Reading `id`,
+    `is_staff`, `is_superuser` or `employee_id` never touches the database;
+    `db_user` and `employee` are the explicit, lazily loaded ways in.
+    Claims are re-read from the database whenever the access token is
+    refreshed, so they are at most ACCESS_TOKEN_LIFETIME old.
+    """
+    @cached_property
+    def employee_id(self):
+        return self.token.get(EMPLOYEE_ID_CLAIM)
+
+    @cached_property
+    def db_user(self):
+        return User.objects.get(pk=self.id)
+
+    @cached_property
+    def employee(self):
+        if self.employee_id is None:
+            raise AttributeError("User has no employee profile.")
+        return Employee.objects.get(pk=self.employee_id)
+
+
+def get_employee_id(user):
+    """Employee id of request.user; free for claim-backed users."""
+    if isinstance(user, ClaimsUser):
+        return user.employee_id
+    employee = getattr(user, "employee", None)
+    return employee.id if employee else None
+
+
+def get_db_user(user):
+    """The real User row for request.user (one query for claim-backed users)."""
+    return user.db_user if isinstance(user, ClaimsUser) else user
+
+
+# -------------------------------
+# Authentication classes
+# -------------------------------
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication whose user lookup can be served from the cache.
+
+    Enabled by JWT_USER_CACHE_TIMEOUT (seconds, 0 = always hit the database).
+    Entries are dropped by the User post_save/post_delete signals. Token
+    revocation checks need the live password hash, so they bypass the cache.
+    """
+    def get_user(self, validated_token):
+        timeout = jwt_user_cache_timeout()
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not timeout or user_id is None or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        key = jwt_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout)
+        elif api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    """
+    Builds a ClaimsUser straight from tokens that carry our claims; older
+    tokens without them fall back to the (optionally cached) User lookup.
+    """
+    def get_user(self, validated_token):
+        if EMPLOYEE_ID_CLAIM in validated_token and api_settings.USER_ID_CLAIM in validated_token:
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """
+    `Authorization: Bearer <REQUEST_METRICS_TOKEN>` from a Prometheus
+    scraper. Matches leave request.auth set to METRICS_SCRAPE on an
+    anonymous user; any other header is left to the next authenticator.
+    """
+    def authenticate(self, request):
+        token = getattr(settings, "REQUEST_METRICS_TOKEN", "")
+        if token and hmac.compare_digest(get_authorization_header(request), f"Bearer {token}".encode()):
+            return AnonymousUser(), METRICS_SCRAPE
+        return None
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="api"'
+
@@ -0,0 +1,323 @@
+import datetime
+import io
+import json
+import math
+import re
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from .authentication import issue_tokens
+from .models import Attendance, Performance
+from .search import prefix_index
+from .urls import router, urlpatterns
+
+BENCHMARK_PASSWORD = "Bench-Password-123"
+
+
+# -------------------------------
+# Endpoints and query budgets
+# -------------------------------
+class Endpoint:
+    """
+    One request to time. `args` / `body` are callables over the benchmark
+    context (and the iteration number for bodies, so signups stay unique).
+    `budget` is the most queries a single request may run, cold caches
+    included; it must not depend on how many rows the tables hold.
+    """
+    def __init__(self, label, route, budget, method="get", user="admin", args=None, query="", body=None,
+                 body_format="json"):
+        self.label = label
+        self.route = route
+        self.budget = budget
+        self.method = method
+        self.user = user
+        self.args = args
+        self.query = query
+        self.body = body
+        self.body_format = body_format
+
+    def url(self, context):
+        args = self.args(context) if self.args else None
+        url = reverse(self.route, args=args)
+        return f"{url}?{self.query}" if self.query else url
+
+
+ENDPOINTS = [
+    # Auth (signup includes the new employee's search document upsert)
+    Endpoint("signup", "signup", 7, method="post", user=None, body=lambda ctx, n: {
+        "username": f"bench_signup_{ctx['employees']}_{n}", "email": f"bench_signup_{ctx['employees']}_{n}@example.com",
+        "password": BENCHMARK_PASSWORD,
+    }),
+    Endpoint("login", "login", 1, method="post", user=None, body=lambda ctx, n: {
+        "username": ctx["employee_user"].username, "password": BENCHMARK_PASSWORD,
+    }),
+
+    # Profile / dashboard
+    Endpoint("my profile", "my-profile", 2, user="employee"),
+    Endpoint("dashboard", "dashboard", 3),
+    # One query per resource; admins +1 when the users page misses users of the employees page
+    Endpoint("bootstrap (admin pages)", "bootstrap", 7, method="post", body=lambda ctx, n: {"resources": [
+        {"name": "profile"}, {"name": "users"}, {"name": "employees"}, {"name": "attendance"},
+        {"name": "performance", "params": {"compact": True, "include": "employees"}}, {"name": "latest_performance"},
+    ]}),
+    Endpoint("bootstrap (employee pages)", "bootstrap", 4, method="post", user="employee", body=lambda ctx, n: {
+        "resources": [{"name": "profile"}, {"name": "employees"}, {"name": "attendance"}, {"name": "latest_performance"}],
+    }),
+
+    # Async read path: same budgets as the sync views they mirror
+    Endpoint("async my profile", "async-my-profile", 1, user="employee"),
+    Endpoint("async dashboard", "async-dashboard", 3),
+    Endpoint("async performance list", "async-performance", 2),
+    Endpoint("async performance list compact", "async-performance", 3, query="compact=1&include=employees"),
+    Endpoint("async attendance list", "async-attendance", 2),
+    Endpoint("async attendance list compact", "async-attendance", 3, query="compact=1&include=employees"),
+
+    # CSV import: 30 days for one employee, re-imported (upserted) on every run; rollups refreshed
+    # once after the batches, in their own transaction: six statements per month (see below)
+    Endpoint("import attendance", "import", 20, method="post", args=lambda ctx: ["attendance"],
+             body=lambda ctx, n: {"file": attendance_csv(ctx)}, body_format="multipart"),
+
+    # Metrics (admin scrape): served from memory, no SQL
+    Endpoint("metrics", "metrics", 0),
+
+    # Performance
+    Endpoint("performance list", "performance", 2),
+    Endpoint("performance list compact", "performance", 3, query="compact=1&include=employees"),
+    Endpoint("performance list filtered", "performance", 2, query="rating_min=1&ordering=-rating"),
+    Endpoint("performance list sparse", "performance", 2, query="fields=id,date,rating"),
+    Endpoint("performance list (employee)", "performance", 2, user="employee"),
+    Endpoint("performance latest", "performance-latest", 1, args=lambda ctx: [ctx["employee_id"]]),
+    Endpoint("performance analytics", "performance-analytics", 3),
+    Endpoint("performance export", "performance-export", 1, query="output=ndjson"),
+    Endpoint("performance detail", "performance-detail", 1, args=lambda ctx: [ctx["performance_id"]]),
+
+    # Admin API
+    Endpoint("employees list", "admin-employees-list", 2),
+    Endpoint("employee detail", "admin-employees-detail", 1, args=lambda ctx: [ctx["employee_id"]]),
+    Endpoint("users list", "admin-users-list", 1),
+    Endpoint("user detail", "admin-users-detail", 1, args=lambda ctx: [ctx["employee_user"].pk]),
+    # Full-text ids, then the employees. Typeahead only queries to load its in-memory
+    # index (1) or, after a delete, to drop removed rows and pull recent saves (2)
+    Endpoint("employee search", "admin-employees-search", 2, query="q=employee1"),
+    Endpoint("employee typeahead", "admin-employees-typeahead", 2, query="q=emp"),
+
+    # Employee API
+    Endpoint("own profile list", "employee-profile-list", 2, user="employee"),
+    Endpoint("own profile detail", "employee-profile-detail", 1, user="employee",
+             args=lambda ctx: [ctx["employee_id"]]),
+    Endpoint("own attendance list", "employee-attendance-list", 2, user="employee"),
+    Endpoint("own attendance detail", "employee-attendance-detail", 1, user="employee",
+             args=lambda ctx: [ctx["attendance_id"]]),
+    # Rollups per month touched: create + lock + count + upsert the employee rows, then one
+    # incrementing department upsert and a sweep of department rows left at zero. MySQL
+    # reads the row id back after the upsert (no RETURNING): one more there
+    Endpoint("mark present", "employee-attendance-mark-present", 10, method="post", user="employee"),
+
+    # Attendance
+    Endpoint("attendance list", "attendance-list", 2),
+    Endpoint("attendance list compact", "attendance-list", 3, query="compact=1&include=employees"),
+    Endpoint("attendance list filtered", "attendance-list", 2, query="status=present&ordering=date"),
+    Endpoint("attendance list sparse", "attendance-list", 2, query="fields=id,date,status"),
+    Endpoint("attendance list expand", "attendance-list", 2, query="fields=id,date,employee.name&expand=employee"),
+    Endpoint("attendance detail", "attendance-detail", 1, args=lambda ctx: [ctx["attendance_id"]]),
+    Endpoint("attendance summary", "attendance-summary", 1, query="group_by=department"),
+    Endpoint("attendance monthly", "attendance-monthly", 1, query="group_by=department"),
+    Endpoint("attendance export", "attendance-export", 1),
+    Endpoint("attendance bulk", "attendance-bulk", 10, method="post", body=lambda ctx, n: {
+        "date": ctx["today"].isoformat(), "department": "IT", "status": "present",
+    }),
+]
+
+
+def attendance_csv(context, days=30):
+    lines = ["username,date,status"] + [
+        f"{context['employee_user'].username},{context['today'] - datetime.timedelta(days=offset)},present"
+        for offset in range(days)
+    ]
+    return SimpleUploadedFile("attendance.csv", "\n".join(lines).encode("utf-8"), content_type="text/csv")
+
+
+def route_names():
+    """Every named route in client/urls.py, router routes included."""
+    names = {pattern.name for pattern in urlpatterns if getattr(pattern, "name", None)}
+    names.update(pattern.name for pattern in router.urls if pattern.name)
+    return names
+
+
+def uncovered_routes(endpoints=ENDPOINTS):
+    covered = {endpoint.route for endpoint in endpoints}
+    return sorted(name for name in route_names() if name not in covered and name != "api-root")
+
+
+# -------------------------------
+# Dataset
+# -------------------------------
+def seed_benchmark_data(employees, days, performance_per_employee=3):
+    """
+    Seed a scaled dataset through seed_data and return the context the
+    endpoint definitions need. Call inside a transaction you roll back.
+    """
+    call_command(
+        "seed_data", employees=employees, days=days, performance_per_employee=performance_per_employee,
+        password=BENCHMARK_PASSWORD, stdout=io.StringIO(),
+    )
+    admin = User.objects.get(username="admin")
+    employee_user = User.objects.select_related("employee").get(username="employee1")
+    employee_id = employee_user.employee.pk
+    latest_attendance = Attendance.objects.filter(employee_id=employee_id).order_by("-date").first()
+    return {
+        "employees": employees,
+        "admin": admin,
+        "employee_user": employee_user,
+        "employee_id": employee_id,
+        "attendance_id": latest_attendance.pk,
+        "today": latest_attendance.date,
+        "performance_id": Performance.objects.filter(employee_id=employee_id).values_list("pk", flat=True).first(),
+    }
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def api_client(context, user):
+    client = APIClient(HTTP_HOST="localhost")
+    if user:
+        account = context["admin"] if user == "admin" else context["employee_user"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {issue_tokens(account).access_token}")
+    return client
+
+
+def run_endpoint(endpoint, context, repeat=20):
+    """
+    Time `repeat` requests with cold caches on the first one. Returns a dict
+    of latency percentiles (ms), the worst query count and the response size.
+    """
+    for cache in caches.all():
+        cache.clear()
+    prefix_index.clear()
+    client = api_client(context, endpoint.user)
+    url = endpoint.url(context)
+
+    timings, queries, statuses, size = [], 0, set(), 0
+    for n in range(max(repeat, 1)):
+        kwargs = {"format": endpoint.body_format}
+        if endpoint.body:
+            kwargs["data"] = endpoint.body(context, n)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, endpoint.method)(url, **kwargs)
+            # Streaming responses run their queries while being consumed
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = max(queries, len(captured.captured_queries))
+        statuses.add(response.status_code)
+        size = len(content)
+
+    return {
+        "label": endpoint.label,
+        "url": url,
+        "status": sorted(statuses),
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "queries": queries,
+        "budget": endpoint.budget,
+        "bytes": size,
+        "over_budget": queries > endpoint.budget,
+    }
+
+
+def run_suite(context, repeat=20, endpoints=ENDPOINTS):
+    return [run_endpoint(endpoint, context, repeat) for endpoint in endpoints]
+
+
+def format_results(results):
+    lines = [f"{'endpoint':<30} {'status':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>9} {'bytes':>8}"]
+    for row in results:
+        status_codes = ",".join(str(code) for code in row["status"])
+        queries = f"{row['queries']}/{row['budget']}"
+        lines.append(
+            f"{row['label']:<30} {status_codes:>7} {row['p50_ms']:8.2f} {row['p95_ms']:8.2f} "
+            f"{row['p99_ms']:8.2f} {queries:>9} {row['bytes']:8d}"
+        )
+    return "\n".join(lines)
+
+
+def results_json(scales):
+    return json.dumps(scales, indent=2, default=str)
+
+
+# -------------------------------
+# Query plans
+# -------------------------------
+SQLITE_PLAN_STEP = re.compile(r"(SEARCH|SCAN) (?:TABLE )?(\w+)(?: AS \w+)?( USING .*)?")
+MYSQL_FULL_ACCESS = {"ALL": "scan", "index": "index"}
+POSTGRES_PLAN_STEP = re.compile(r"(Seq Scan|Bitmap Heap Scan|Index(?: Only)? Scan(?: Backward)? using \w+) on (\w+)")
+
+
+def query_plan(query):
+    """
+    [(table, access)] from EXPLAIN of a queryset or an SQL string (as
+    captured by CaptureQueriesContext). access is "search" for a keyed
+    lookup or range, "index" for a walk over a whole index and "scan" for
+    reading the whole table.
+    """
+    sql, params = (query, ()) if isinstance(query, str) else query.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            steps = (SQLITE_PLAN_STEP.fullmatch(row[-1]) for row in cursor.fetchall())
+            return [
+                (step[2], sqlite_access(*step.groups()[::2])) for step in steps if step
+            ]
+        if connection.vendor == "mysql":
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description]
+            rows = (dict(zip(columns, values)) for values in cursor.fetchall())
+            return [(row["table"], MYSQL_FULL_ACCESS.get(row["type"], "search")) for row in rows if row["type"]]
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN {sql}", params)
+            lines = [line for line, in cursor.fetchall()] + [""]
+            plan = []
+            for line, following in zip(lines, lines[1:]):
+                step = POSTGRES_PLAN_STEP.search(line)
+                if step:
+                    # An index scan without an "Index Cond:" line walks the whole index
+                    searched = step[1] == "Bitmap Heap Scan" or "Index Cond:" in following
+                    plan.append((step[2], "scan" if step[1] == "Seq Scan" else "search" if searched else "index"))
+            return plan
+    raise NotImplementedError(f"No query plan check for {connection.vendor}")
+
+
+def sqlite_access(operation, using):
+    if using and "AUTOMATIC" in using:
+        return "scan"  # a transient index built by reading the whole table
+    if operation == "SEARCH":
+        return "search"
+    return "index" if using else "scan"
+
+
+def full_table_scans(query):
+    """Tables the database plans to read in full; walking a whole index does not count."""
+    return [table for table, access in query_plan(query) if access == "scan"]
+
+
+def searched_tables(query):
+    """Tables the database reads through a key or range lookup."""
+    return [table for table, access in query_plan(query) if access == "search"]
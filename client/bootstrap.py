@@ -0,0 +1,264 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import QueryDict
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .authentication import get_employee_id
+from .cache import get_cached_profile, get_profile_version, set_cached_profile
+from .models import Employee, Attendance, Performance
+from .filters import filter_attendance, filter_performance
+from .pagination import IdKeysetPagination, DateKeysetPagination, PerformanceKeysetPagination
+from .serializers import (
+    EmployeeSerializer, AttendanceSerializer, PerformanceSerializer, UserSerializer,
+    EmployeeCompactSerializer, AttendanceCompactSerializer, PerformanceCompactSerializer,
+    BootstrapSerializer,
+)
+from .services import latest_performances
+from .views import performance_chart, profile_payload, wants_compact, wants_employee_sideload
+
+MAX_LATEST_EMPLOYEES = 500
+
+
+# ======================================
+# IDENTITY MAP
+# ======================================
+# One bootstrap request resolves several SPA resources with a single
+# authentication, on one connection and inside one transaction. Resources
+# load their own rows without joins and take related Employee / User rows
+# from a shared identity map, so a row read by one resource is never
+# fetched again by the next.
+
+class IdentityMap:
+    """Employee and User rows already loaded in this request, by primary key."""
+    def __init__(self):
+        self.users = {}
+        self.employees = {}
+
+    def add_users(self, users):
+        """Register rows; returns the canonical instances in the same order."""
+        return [self.users.setdefault(user.pk, user) for user in users]
+
+    def add_employees(self, employees):
+        return [self.employees.setdefault(employee.pk, employee) for employee in employees]
+
+    def get_employees(self, ids):
+        ids = set(ids)
+        missing = ids - self.employees.keys()
+        if missing:
+            self.add_employees(Employee.objects.filter(id__in=missing))
+        return {pk: self.employees[pk] for pk in ids if pk in self.employees}
+
+    def attach_users(self, employees):
+        """Set employee.user from the map, loading the missing users in one query."""
+        missing = {employee.user_id for employee in employees} - self.users.keys()
+        if missing:
+            self.add_users(User.objects.filter(id__in=missing))
+        field = Employee._meta.get_field("user")
+        for employee in employees:
+            field.set_cached_value(employee, self.users[employee.user_id])
+
+    def attach_employees(self, rows):
+        """Set row.employee (with its user) on attendance / performance rows."""
+        employees = self.get_employees(row.employee_id for row in rows)
+        self.attach_users(employees.values())
+        for row in rows:
+            row._meta.get_field("employee").set_cached_value(row, employees[row.employee_id])
+
+
+class ResourceRequest:
+    """
+    What a resource sees of the request: the caller, and its params as
+    query parameters. Pagination links point at the standalone endpoint,
+    so the SPA pages further with plain GETs.
+    """
+    def __init__(self, request, params):
+        self._request = request
+        self.user = request.user
+        self.route = None
+        self.query_params = QueryDict(mutable=True)
+        for name, value in params.items():
+            if isinstance(value, (list, tuple)):
+                value = ",".join(str(item) for item in value)
+            elif isinstance(value, bool):
+                value = "true" if value else "false"
+            self.query_params[name] = "" if value is None else str(value)
+
+    def build_absolute_uri(self):
+        path = reverse(self.route)
+        query = self.query_params.urlencode()
+        return self._request.build_absolute_uri(f"{path}?{query}" if query else path)
+
+
+def is_admin(user):
+    return user.is_staff or user.is_superuser
+
+
+def paginated(request, route, pagination_class, queryset):
+    request.route = route
+    paginator = pagination_class()
+    return paginator, paginator.paginate_queryset(queryset, request)
+
+
+def page_payload(paginator, data):
+    return {"next": paginator.get_next_link(), "previous": paginator.get_previous_link(), "results": data}
+
+
+# ======================================
+# RESOURCES
+# ======================================
+# Same payloads and visibility rules as the endpoints the SPA calls on mount.
+
+def profile_resource(request, identity):
+    """my-profile/: the versioned profile cache, else one User + Employee query."""
+    user_id = request.user.id
+    version = get_profile_version(user_id)
+    cached = get_cached_profile(user_id, version)
+    if cached is None:
+        user = User.objects.select_related("employee").get(pk=user_id)
+        identity.add_users([user])
+        if hasattr(user, "employee"):
+            identity.add_employees([user.employee])
+        cached = profile_payload(user, request)
+        set_cached_profile(user_id, version, *cached)
+    return cached[0]
+
+
+def users_resource(request, identity):
+    """admin-api/users/"""
+    if not request.user.is_staff:
+        raise PermissionDenied()
+    paginator, page = paginated(request, "admin-users-list", IdKeysetPagination, User.objects.all())
+    return page_payload(paginator, UserSerializer(identity.add_users(page), many=True).data)
+
+
+def employees_resource(request, identity):
+    """admin-api/employees/ for admins, employee-api/profile/ for employees."""
+    if is_admin(request.user):
+        route, employees = "admin-employees-list", Employee.objects.all()
+    else:
+        route, employees = "employee-profile-list", Employee.objects.filter(user_id=request.user.id)
+    paginator, page = paginated(request, route, IdKeysetPagination, employees)
+    page = identity.add_employees(page)
+    identity.attach_users(page)
+    return page_payload(paginator, EmployeeSerializer(page, many=True).data)
+
+
+def dated_list(request, identity, route, queryset, serializer_class, compact_serializer_class,
+               pagination_class=DateKeysetPagination):
+    """Keyset page of attendance / performance rows, honouring ?compact and ?include."""
+    paginator, page = paginated(request, route, pagination_class, queryset)
+    if not wants_compact(request):
+        identity.attach_employees(page)
+        return page_payload(paginator, serializer_class(page, many=True).data)
+
+    data = page_payload(paginator, compact_serializer_class(page, many=True).data)
+    if wants_employee_sideload(request):
+        employees = identity.get_employees(row.employee_id for row in page)
+        data["employees"] = {pk: EmployeeCompactSerializer(employee).data for pk, employee in employees.items()}
+    return data
+
+
+def attendance_resource(request, identity):
+    """attendance/ for admins, employee-api/attendance/ for employees."""
+    if is_admin(request.user):
+        route, attendance = "attendance-list", Attendance.objects.all()
+    else:
+        route = "employee-attendance-list"
+        attendance = Attendance.objects.filter(employee_id=get_employee_id(request.user))
+    attendance = filter_attendance(attendance, request)
+    return dated_list(request, identity, route, attendance, AttendanceSerializer, AttendanceCompactSerializer)
+
+
+def performance_resource(request, identity):
+    """performance/: admins see all, employees their own records."""
+    performances = Performance.objects.all()
+    if not is_admin(request.user):
+        employee_id = get_employee_id(request.user)
+        if not employee_id:
+            raise NotFound("Employee record not found")
+        performances = performances.filter(employee_id=employee_id)
+    performances = filter_performance(performances, request)
+    return dated_list(
+        request, identity, "performance", performances, PerformanceSerializer, PerformanceCompactSerializer,
+        PerformanceKeysetPagination,
+    )
+
+
+def latest_performance_resource(request, identity):
+    """
+    performance/latest/<id>/ for many employees at once: {employee_id: chart}.
+    ?employee_ids= defaults to the employees already loaded in this request
+    (or the caller's own record), so one query replaces a call per employee.
+    """
+    raw = request.query_params.get("employee_ids", "")
+    if raw:
+        try:
+            employee_ids = {int(value) for value in raw.split(",") if value.strip()}
+        except ValueError:
+            raise ValidationError({"employee_ids": "Expected a list of integers."})
+    elif is_admin(request.user):
+        employee_ids = set(identity.employees)
+    else:
+        employee_ids = {get_employee_id(request.user)} - {None}
+    if len(employee_ids) > MAX_LATEST_EMPLOYEES:
+        raise ValidationError({"employee_ids": f"At most {MAX_LATEST_EMPLOYEES} employees per request."})
+
+    latest = latest_performances(employee_ids) if employee_ids else {}
+    return {employee_id: performance_chart(latest.get(employee_id)) for employee_id in sorted(employee_ids)}
+
+
+# name -> resolver, in resolution order: rows loaded by earlier resources
+# are reused by later ones whatever order the client lists them in
+RESOURCES = {
+    "profile": profile_resource,
+    "users": users_resource,
+    "employees": employees_resource,
+    "attendance": attendance_resource,
+    "performance": performance_resource,
+    "latest_performance": latest_performance_resource,
+}
+
+
+# ======================================
+# BOOTSTRAP VIEW
+# ======================================
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def bootstrap_view(request):
+    """
+    Several SPA resources in one round trip.
+    Body: {"resources": [{"name": "employees", "params": {"page_size": 100}},
+                         {"name": "latest_performance"}, ...]}
+    Each entry may set "key" to name its slot in the response. A resource
+    that fails (e.g. 403) is reported under "errors" without failing the rest.
+    """
+    serializer = BootstrapSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    resources = serializer.validated_data["resources"]
+    unknown = sorted({resource["name"] for resource in resources} - RESOURCES.keys())
+    if unknown:
+        raise ValidationError({"resources": f"Unknown resources: {', '.join(unknown)}"})
+
+    order = list(RESOURCES)
+    identity = IdentityMap()
+    results, errors = {}, {}
+    with transaction.atomic(savepoint=False):
+        for resource in sorted(resources, key=lambda resource: order.index(resource["name"])):
+            try:
+                results[resource["key"]] = RESOURCES[resource["name"]](
+                    ResourceRequest(request, resource["params"]), identity
+                )
+            except APIException as exc:
+                errors[resource["key"]] = {"status": exc.status_code, "detail": exc.detail}
+
+    data = {resource["key"]: results[resource["key"]] for resource in resources if resource["key"] in results}
+    if errors:
+        data["errors"] = errors
+    return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,104 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+# -------------------------------
+# Dashboard counters
+# -------------------------------
+DASHBOARD_CACHE_PREFIX = "dashboard:metrics"
+
+
+def dashboard_cache_key(day=None):
+    # Keyed by local date so "today" metrics roll over at midnight on their own
+    day = day or timezone.localdate()
+    return f"{DASHBOARD_CACHE_PREFIX}:{day.isoformat()}"
+
+
+def dashboard_cache_timeout():
+    return getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+
+
+def invalidate_dashboard_metrics():
+    """Drop the cached counters once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(dashboard_cache_key()))
+
+
+# -------------------------------
+# my-profile payloads
+# -------------------------------
+def profile_version_key(user_id):
+    return f"profile:version:{user_id}"
+
+
+def profile_cache_key(user_id, version):
+    return f"profile:{user_id}:{version}"
+
+
+def profile_cache_timeout():
+    return getattr(settings, "PROFILE_CACHE_TIMEOUT", 600)
+
+
+def get_profile_version(user_id):
+    """Current version token for the user's profile, created on first use."""
+    key = profile_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def get_cached_profile(user_id, version):
+    """(data, updated_at) cached for this profile version, or None."""
+    return cache.get(profile_cache_key(user_id, version))
+
+
+def set_cached_profile(user_id, version, data, updated_at):
+    cache.set(profile_cache_key(user_id, version), (data, updated_at), profile_cache_timeout())
+
+
+async def aget_profile_version(user_id):
+    key = profile_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(key, version, None):
+            version = await cache.aget(key, version)
+    return version
+
+
+async def aget_cached_profile(user_id, version):
+    return await cache.aget(profile_cache_key(user_id, version))
+
+
+async def aset_cached_profile(user_id, version, data, updated_at):
+    await cache.aset(profile_cache_key(user_id, version), (data, updated_at), profile_cache_timeout())
+
+
+def bump_profile_version(user_id):
+    """
+    Point the user at a fresh version once the transaction commits; old
+    entries are never read again and expire on their own. A timestamp
+    version cannot collide with an evicted earlier one.
+    """
+    transaction.on_commit(lambda: cache.set(profile_version_key(user_id), time.time_ns(), None))
+
+
+# -------------------------------
+# JWT user lookups
+# -------------------------------
+def jwt_user_cache_key(user_id):
+    return f"jwt:user:{user_id}"
+
+
+def jwt_user_cache_timeout():
+    return getattr(settings, "JWT_USER_CACHE_TIMEOUT", 0)
+
+
+def invalidate_jwt_user(user_id):
+    transaction.on_commit(lambda: cache.delete(jwt_user_cache_key(user_id)))
@@ -0,0 +1,133 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.response import Response
+
+
+# -------------------------------
+# Conditional GET (ETag / Last-Modified)
+# -------------------------------
+# `related` for attendance / performance payloads, which embed the employee
+# and its user (user edits bump Employee.updated_at, see signals.py)
+EMBEDS_EMPLOYEE = ("employee__updated_at",)
+
+def latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def queryset_state(queryset, field="updated_at", related=()):
+    """
+    (max modification time, row count) in one aggregate query, no rows
+    loaded. `related` names the updated_at of rows the payload embeds
+    (e.g. "employee__updated_at") so editing those changes the state too.
+    """
+    state = queryset.order_by().aggregate(count=Count("pk"), **state_aggregates(field, related))
+    return latest(*(state[name] for name in state if name != "count")), state["count"]
+
+
+async def aqueryset_state(queryset, field="updated_at", related=()):
+    state = await queryset.order_by().aaggregate(count=Count("pk"), **state_aggregates(field, related))
+    return latest(*(state[name] for name in state if name != "count")), state["count"]
+
+
+def state_aggregates(field, related):
+    return {f"last_modified_{n}": Max(path) for n, path in enumerate((field, *related))}
+
+
+def instance_state(instance, field="updated_at", related=()):
+    """
+    Modification time of a loaded row and the related rows it embeds.
+    Relations that were not loaded are not embedded, so they are skipped
+    rather than fetched.
+    """
+    return latest(getattr(instance, field), *(loaded_value(instance, path) for path in related))
+
+
+def loaded_value(instance, path):
+    *relations, attname = path.split("__")
+    for name in relations:
+        field = instance._meta.get_field(name)
+        if not field.is_cached(instance):
+            return None
+        instance = field.get_cached_value(instance)
+        if instance is None:
+            return None
+    if attname in instance.get_deferred_fields():
+        return None
+    return getattr(instance, attname)
+
+
+def conditional_response(request, last_modified, count, render, version="", send_last_modified=True):
+    """
+    Answer 304 Not Modified when the client's validators still match;
+    otherwise call `render()` and stamp ETag / Last-Modified on the result.
+
+    The ETag covers the full path (filters, cursor, page size), the caller,
+    the (max updated_at, count) state, so deletes change it too, and an
+    optional cache `version` for payloads built from more than one table.
+    Lists pass send_last_modified=False: a delete leaves their max
+    updated_at as it was, so only the ETag can tell.
+    """
+    etag, timestamp = conditional_validators(request, last_modified, count, version, send_last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+    return stamp_validators(response, etag, timestamp)
+
+
+async def aconditional_response(request, last_modified, count, arender, version="", send_last_modified=True):
+    """conditional_response() for async views: `arender()` is awaited, and only without a 304."""
+    etag, timestamp = conditional_validators(request, last_modified, count, version, send_last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = await arender()
+    return stamp_validators(response, etag, timestamp)
+
+
+def conditional_validators(request, last_modified, count, version, send_last_modified):
+    """(ETag, Last-Modified timestamp or None) for the state of a response."""
+    timestamp = int(last_modified.timestamp()) if last_modified and send_last_modified else None
+    user_id = getattr(request.user, "pk", None)
+    stamp = last_modified.isoformat() if last_modified else ""
+    raw = f"{request.get_full_path()}|{user_id}|{count}|{stamp}|{version}"
+    return quote_etag(hashlib.md5(raw.encode("utf-8")).hexdigest()), timestamp
+
+
+def stamp_validators(response, etag, timestamp):
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag on `list`, ETag / Last-Modified on `retrieve`. Lists validate
+    against one aggregate over the filtered queryset; details against the
+    loaded row. Both include the updated_at of the related rows named in
+    `conditional_related`, which the serializer embeds.
+    """
+    conditional_related = ()
+
+    def list(self, request, *args, **kwargs):
+        last_modified, count = queryset_state(
+            self.filter_queryset(self.get_queryset()), related=self.conditional_related,
+        )
+        return conditional_response(
+            request, last_modified, count,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+            send_last_modified=False,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return conditional_response(
+            request, instance_state(instance, related=self.conditional_related), 1,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
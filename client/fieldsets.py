@@ -0,0 +1,167 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+# -------------------------------
+# Parsing
+# -------------------------------
+def parse_fieldset(value):
+    """'id,employee.name,employee.user' -> {"id": {}, "employee": {"name": {}, "user": {}}}; None when absent."""
+    if not value:
+        return None
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree or None
+
+
+def requested_fieldsets(request):
+    """(fields, expand) trees from ?fields= / ?expand=; each None when not given."""
+    params = getattr(request, "query_params", None)
+    if params is None:
+        return None, None
+    return parse_fieldset(params.get(FIELDS_PARAM)), parse_fieldset(params.get(EXPAND_PARAM))
+
+
+def wants_sparse(request):
+    return any(tree is not None for tree in requested_fieldsets(request))
+
+
+# -------------------------------
+# Serializers
+# -------------------------------
+class FlexFieldsMixin:
+    """
+    ?fields= / ?expand= for ModelSerializers. Without either the output is
+    unchanged. With either, nested serializers (employee, user) collapse to
+    their primary key unless listed in ?expand=, and ?fields= keeps only the
+    listed fields. Dotted names select inside an expansion and imply it:
+    ?fields=id,date,employee.name
+
+    On writes (POST/PUT/PATCH) ?fields= only shapes the response: writable
+    fields stay on the serializer and unlisted ones are dropped from the
+    output instead.
+    """
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_fields = fields
+        self.requested_expand = expand
+
+    def is_root(self):
+        root = self.root
+        return root is self or (isinstance(root, serializers.ListSerializer) and root.child is self)
+
+    def fieldsets(self):
+        if self.requested_fields is None and self.requested_expand is None and self.is_root():
+            return requested_fieldsets(self.context.get("request"))
+        return self.requested_fields, self.requested_expand
+
+    def is_write(self):
+        request = self.root.context.get("request")
+        return request is not None and request.method not in SAFE_METHODS
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = self.fieldsets()
+        if requested is None and expand is None:
+            return fields
+
+        requested, expand = requested or {}, dict(expand or {})
+        for name, subfields in requested.items():
+            if subfields:
+                expand.setdefault(name, {})
+
+        for name, field in list(fields.items()):
+            if not isinstance(field, FlexFieldsMixin) or field.write_only:
+                continue
+            if name in expand:
+                fields[name] = type(field)(
+                    *field._args, **field._kwargs, fields=requested.get(name) or None, expand=expand[name],
+                )
+            else:
+                source = field._kwargs.get("source")
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, **({"source": source} if source else {}))
+
+        if requested:
+            keep = (lambda field: not field.read_only) if self.is_write() else (lambda field: field.write_only)
+            fields = {name: field for name, field in fields.items() if name in requested or keep(field)}
+        return fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        requested = self.fieldsets()[0]
+        if requested and self.is_write():
+            for name in [name for name in data if name not in requested]:
+                del data[name]
+        return data
+
+
+# -------------------------------
+# Querysets
+# -------------------------------
+def serializer_columns(serializer, model, prefix=""):
+    """
+    (only() paths, select_related() paths) covering every field `serializer`
+    reads, or None when a field reads more than plain columns.
+    """
+    concrete = {field.name for field in model._meta.concrete_fields}
+    attnames = {field.attname: field.name for field in model._meta.concrete_fields}
+    columns, relations = [], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*" or "." in field.source or isinstance(field, serializers.ListSerializer):
+            return None
+        name = attnames.get(field.source, field.source)
+        if name not in concrete:
+            return None
+        columns.append(prefix + name)
+        if isinstance(field, serializers.BaseSerializer):
+            nested = serializer_columns(field, model._meta.get_field(name).related_model, f"{prefix}{name}__")
+            if nested is None:
+                return None
+            relations.append(prefix + name)
+            columns += nested[0]
+            relations += nested[1]
+    return columns, relations
+
+
+def sparse_queryset(queryset, serializer, always=()):
+    """
+    Load only the columns `serializer` reads (plus `always`) and join only
+    the relations it expands. Unchanged when that cannot be worked out.
+    """
+    narrowed = serializer_columns(serializer, queryset.model)
+    if narrowed is None:
+        return queryset
+    columns, relations = narrowed
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns, *always)
+
+
+def always_loaded(model, paginator=None):
+    """Columns read outside the serializer: keyset orderings and updated_at (ETag)."""
+    orderings = [getattr(paginator, "ordering", ()), *getattr(paginator, "orderings", {}).values()]
+    names = list(dict.fromkeys(name.lstrip("-") for ordering in orderings for name in ordering))
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        names.append("updated_at")
+    return names
+
+
+class SparseFieldsMixin:
+    """Narrows GET querysets to what the serializer reads when ?fields= or ?expand= is given."""
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in ("GET", "HEAD") and wants_sparse(self.request):
+            queryset = sparse_queryset(
+                queryset, self.get_serializer(), always=always_loaded(queryset.model, self.paginator),
+            )
+        return queryset
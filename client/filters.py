@@ -0,0 +1,53 @@
+from .serializers import AttendanceFilterSerializer, PerformanceFilterSerializer
+
+
+# -------------------------------
+# Attendance / performance list filters
+# -------------------------------
+# Every filter is served by an index: date ranges by (-date, id) and
+# (date, status), employee_id by (employee, date), department by
+# employee_department_idx, ratings by (rating, id). The list ETag aggregates
+# read (status, employee, updated_at) / (employee, updated_at) instead of the
+# table. client/tests.py checks the query plans.
+
+def filter_records(queryset, date_from=None, date_to=None, employee_id=None, department=None,
+                   status=None, rating_min=None, rating_max=None):
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if employee_id:
+        queryset = queryset.filter(employee_id=employee_id)
+    if department:
+        queryset = queryset.filter(employee__department=department)
+    if status:
+        queryset = queryset.filter(status=status)
+    if rating_min is not None:
+        queryset = queryset.filter(rating__gte=rating_min)
+    if rating_max is not None:
+        queryset = queryset.filter(rating__lte=rating_max)
+    return queryset
+
+
+def list_filters(request, serializer_class):
+    """Validated filter params of a list request; 400 on bad values."""
+    params = serializer_class(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return params.validated_data
+
+
+def filter_attendance(queryset, request):
+    return filter_records(queryset, **list_filters(request, AttendanceFilterSerializer))
+
+
+def filter_performance(queryset, request):
+    return filter_records(queryset, **list_filters(request, PerformanceFilterSerializer))
+
+
+class AttendanceFilterMixin:
+    """?date_from=&date_to=&status=&employee_id=&department= on the attendance list."""
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == "list":
+            queryset = filter_attendance(queryset, self.request)
+        return queryset
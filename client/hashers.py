@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+# -------------------------------
+# Tunable password hashers
+# -------------------------------
+# Same algorithm names as Django's hashers, so existing hashes keep verifying.
+# When a tunable changes, must_update() flags old hashes and
+# User.check_password() re-hashes them on the next successful login.
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PBKDF2_ITERATIONS from settings."""
+    @property
+    def iterations(self):
+        return getattr(settings, "PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with ARGON2_TIME_COST / ARGON2_MEMORY_COST (KiB) /
+    ARGON2_PARALLELISM from settings. Needs `argon2-cffi` installed.
+    """
+    @property
+    def time_cost(self):
+        return getattr(settings, "ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, "ARGON2_MEMORY_COST", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
@@ -0,0 +1,412 @@
+import csv
+import datetime
+import io
+import secrets
+from contextlib import nullcontext
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, UNUSABLE_PASSWORD_SUFFIX_LENGTH, make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .cache import bump_profile_version, invalidate_dashboard_metrics, invalidate_jwt_user
+from .models import Employee, Attendance, Performance
+from .search import refresh_search_documents
+from .services import bulk_create_users, insert_rows, month_start, refresh_attendance_rollups
+
+IMPORT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+EMPLOYEE_PROFILE_FIELDS = ("name", "role", "department", "address", "phone")
+ROLES = {value for value, _ in Employee.ROLE_CHOICES}
+STATUSES = {value for value, _ in Attendance.STATUS_CHOICES}
+username_validator = UnicodeUsernameValidator()
+
+
+class ImportFileError(ValueError):
+    """The file as a whole cannot be imported (bad header)."""
+
+
+class RowError(ValueError):
+    """One row is invalid; it is reported and skipped."""
+
+
+# -------------------------------
+# Result
+# -------------------------------
+class ImportResult:
+    def __init__(self, kind, max_errors=MAX_REPORTED_ERRORS):
+        self.kind = kind
+        self.max_errors = max_errors
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+# -------------------------------
+# Parsing helpers
+# -------------------------------
+def read_rows(reader):
+    """Yield (line_number, row) from a csv.DictReader with values stripped."""
+    for row in reader:
+        yield reader.line_num, {key: (value or "").strip() for key, value in row.items() if key}
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise RowError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+
+def parse_rating(value):
+    if not value:
+        return None
+    try:
+        rating = int(value)
+    except ValueError:
+        raise RowError(f"Invalid rating {value!r}")
+    if not 0 <= rating <= 32767:
+        raise RowError(f"Rating {rating} is out of range")
+    return rating
+
+
+def check_length(model, field, value):
+    max_length = model._meta.get_field(field).max_length
+    if max_length and len(value) > max_length:
+        raise RowError(f"{field} is longer than {max_length} characters")
+    return value
+
+
+def employee_reference(row):
+    """("id", int) or ("username", str) from an employee_id or username column."""
+    if row.get("employee_id"):
+        try:
+            return "id", int(row["employee_id"])
+        except ValueError:
+            raise RowError(f"Invalid employee_id {row['employee_id']!r}")
+    if row.get("username"):
+        return "username", row["username"]
+    raise RowError("employee_id or username is required")
+
+
+def resolve_employees(references):
+    """Map ("id"|"username", value) references to employee ids with one query per kind."""
+    ids = {value for kind, value in references if kind == "id"}
+    usernames = {value for kind, value in references if kind == "username"}
+    resolved = {}
+    if ids:
+        resolved.update((("id", pk), pk) for pk in Employee.objects.filter(id__in=ids).values_list("id", flat=True))
+    if usernames:
+        resolved.update(
+            (("username", username), pk)
+            for username, pk in Employee.objects.filter(user__username__in=usernames).values_list("user__username", "id")
+        )
+    return resolved
+
+
+def hash_password(password):
+    """make_password(), with a cheaper random suffix for the unusable password of blank cells."""
+    if not password:
+        return UNUSABLE_PASSWORD_PREFIX + secrets.token_hex(UNUSABLE_PASSWORD_SUFFIX_LENGTH // 2)
+    return make_password(password)
+
+
+def role_flags(role):
+    """is_staff / is_superuser for an Employee role, as signup sets them."""
+    return {"is_staff": role in ("admin", "superuser"), "is_superuser": role == "superuser"}
+
+
+# -------------------------------
+# Importers (one batch, inside a transaction)
+# -------------------------------
+def import_employees(batch, result, columns):
+    """
+    Create missing users with their Employee rows (bulk, no signals) and
+    update the profile fields of existing ones from the columns present.
+    Usernames and emails must be unique ignoring case, within the file and
+    against other users, as on signup; the role also sets is_staff /
+    is_superuser. Blank name / role / email cells keep the current values
+    (new users get their username / "employee" / no email). Blank passwords
+    give an unusable password; set ones are hashed per row, which dominates
+    the run time with production hashers.
+    """
+    parsed, seen_usernames, seen_emails = {}, set(), set()
+    for line, row in batch:
+        try:
+            username = row.get("username", "")
+            email = row.get("email", "")
+            if not username:
+                raise RowError("username is required")
+            try:
+                username_validator(check_length(User, "username", username))
+                if email:
+                    validate_email(email)
+            except ValidationError as error:
+                raise RowError(" ".join(error.messages))
+            if username.lower() in seen_usernames:
+                raise RowError(f"Duplicate username {username!r} in file")
+            if email and email.lower() in seen_emails:
+                raise RowError(f"Duplicate email {email!r} in file")
+            profile = {field: row[field] for field in ("name", "role") if row.get(field)}
+            if profile.get("role", "employee") not in ROLES:
+                raise RowError(f"Invalid role {profile['role']!r}")
+            profile["department"] = row.get("department") or None
+            profile["address"] = row.get("address", "")
+            profile["phone"] = row.get("phone", "")
+            for field in ("name", "department", "phone"):
+                if profile.get(field):
+                    check_length(Employee, field, profile[field])
+            seen_usernames.add(username.lower())
+            if email:
+                seen_emails.add(email.lower())
+            parsed[username] = (line, profile, email, row.get("password", ""))
+        except RowError as error:
+            result.add_error(line, str(error))
+
+    # Earlier batches are already written, so these lookups cover the whole file
+    users = list(
+        User.objects.select_related("employee")
+        .annotate(login_key=Lower("username"))
+        .filter(login_key__in=seen_usernames)
+    )
+    existing = {user.username: user for user in users if user.username in parsed}
+    by_username = {username.lower(): username for username in parsed}
+    for user in users:
+        username = by_username.get(user.login_key)
+        if username in parsed and username not in existing:
+            result.add_error(parsed.pop(username)[0], f"Username {username!r} already exists")
+    if seen_emails:
+        by_email = {email.lower(): username for username, (_, _, email, _) in parsed.items() if email}
+        owners = (
+            User.objects.annotate(login_key=Lower("email"))
+            .filter(login_key__in=seen_emails)
+            .values_list("login_key", "username")
+        )
+        for email_key, owner in owners:
+            username = by_email.get(email_key)
+            if username in parsed and username != owner:
+                line, _, email, _ = parsed.pop(username)
+                existing.pop(username, None)
+                result.add_error(line, f"Email {email!r} already exists")
+
+    new_users, profiles = [], {}
+    for username, (_, profile, email, password) in parsed.items():
+        if username not in existing:
+            new_users.append(User(
+                username=username, email=email, password=hash_password(password),
+                **role_flags(profile.get("role", "employee")),
+            ))
+            profiles[username] = profile
+    if new_users:
+        bulk_create_users(new_users, profiles, batch_size=len(new_users))
+        result.created += len(new_users)
+
+    update_fields = [field for field in EMPLOYEE_PROFILE_FIELDS if field in columns]
+    user_fields = (["email"] if "email" in columns else []) + (["is_staff", "is_superuser"] if "role" in columns else [])
+    changed_users, changed_employees, missing_employees = [], [], []
+    now = timezone.now()
+    for username, user in existing.items():
+        _, profile, email, _ = parsed[username]
+        values = {"email": email} if email else {}
+        if "role" in profile:
+            values.update(role_flags(profile["role"]))
+        changed = False
+        for field, value in values.items():
+            if getattr(user, field) != value:
+                setattr(user, field, value)
+                changed = True
+        if changed:
+            changed_users.append(user)
+
+        employee = getattr(user, "employee", None)
+        if employee is None:
+            missing_employees.append(Employee(user_id=user.pk, **{"name": username, **profile}))
+            changed = True
+        else:
+            for field in update_fields:
+                if field in profile:
+                    setattr(employee, field, profile[field])
+            if employee.get_dirty_fields():
+                employee.updated_at = now
+                changed_employees.append(employee)
+                changed = True
+
+        if changed:
+            result.updated += 1
+            bump_profile_version(user.pk)
+            invalidate_jwt_user(user.pk)
+        else:
+            result.unchanged += 1
+
+    if changed_users:
+        User.objects.bulk_update(changed_users, user_fields)
+    if changed_employees:
+        Employee.objects.bulk_update(changed_employees, update_fields + ["updated_at"])
+    if missing_employees:
+        Employee.objects.bulk_create(missing_employees)
+    if changed_employees or missing_employees:
+        invalidate_dashboard_metrics()
+    if new_users or changed_users or changed_employees or missing_employees:
+        refresh_search_documents(Employee.objects.filter(user__username__in=list(parsed)))
+
+
+def import_attendance(batch, result, columns):
+    """
+    Upsert (employee, date) -> status. Returns the (employee, month) rollup
+    keys it touched; import_csv() refreshes them once, after the last batch.
+    """
+    parsed = []
+    for line, row in batch:
+        try:
+            status = row.get("status", "").lower()
+            if status not in STATUSES:
+                raise RowError(f"Invalid status {row.get('status', '')!r}")
+            parsed.append((line, employee_reference(row), parse_date(row.get("date", "")), status))
+        except RowError as error:
+            result.add_error(line, str(error))
+
+    employees = resolve_employees({reference for _, reference, _, _ in parsed})
+    rows = {}
+    for line, reference, date, status in parsed:
+        employee_id = employees.get(reference)
+        if employee_id is None:
+            result.add_error(line, f"Employee {reference[1]!r} not found")
+        elif (employee_id, date) in rows:
+            result.add_error(line, "Duplicate employee and date in batch")
+        else:
+            rows[(employee_id, date)] = status
+    if not rows:
+        return
+
+    # created = growth of the (employees x dates) block the batch writes into
+    block = Attendance.objects.filter(
+        employee_id__in={employee_id for employee_id, _ in rows},
+        date__in={date for _, date in rows},
+    )
+    before = block.count()
+    now = timezone.now()
+    insert_rows(
+        Attendance, ("employee", "date", "status", "updated_at"),
+        ((employee_id, date, status, now) for (employee_id, date), status in rows.items()),
+        unique_fields=("employee", "date"), update_fields=("status", "updated_at"),
+    )
+    created = block.count() - before
+
+    invalidate_dashboard_metrics()
+    result.created += created
+    result.updated += len(rows) - created
+    return {(employee_id, month_start(date)) for employee_id, date in rows}
+
+
+def import_performance(batch, result, columns):
+    """Append performance records; there is no natural key to upsert on."""
+    parsed = []
+    for line, row in batch:
+        try:
+            parsed.append((
+                line, employee_reference(row), parse_date(row.get("date", "")),
+                check_length(Performance, "task", row.get("task", "")),
+                parse_rating(row.get("rating", "")), row.get("remarks", ""),
+            ))
+        except RowError as error:
+            result.add_error(line, str(error))
+
+    employees = resolve_employees({reference for _, reference, *_ in parsed})
+    rows, now = [], timezone.now()
+    for line, reference, date, task, rating, remarks in parsed:
+        employee_id = employees.get(reference)
+        if employee_id is None:
+            result.add_error(line, f"Employee {reference[1]!r} not found")
+            continue
+        rows.append((employee_id, date, task, rating, remarks, now))
+    if rows:
+        insert_rows(Performance, ("employee", "date", "task", "rating", "remarks", "updated_at"), rows)
+        invalidate_dashboard_metrics()
+        result.created += len(rows)
+
+
+IMPORTERS = {
+    # kind -> (importer, column groups that each need at least one column present)
+    "employees": (import_employees, [{"username"}]),
+    "attendance": (import_attendance, [{"date"}, {"status"}, {"employee_id", "username"}]),
+    "performance": (import_performance, [{"date"}, {"employee_id", "username"}]),
+}
+
+
+# -------------------------------
+# Entry point
+# -------------------------------
+def import_csv(kind, stream, batch_size=IMPORT_BATCH_SIZE, max_errors=MAX_REPORTED_ERRORS, dry_run=False):
+    """
+    Stream-parse CSV text from `stream` and import it `batch_size` rows at a
+    time. Every batch is validated, resolved with one lookup per reference
+    type and written with bulk_create / bulk_update in its own transaction,
+    unless `dry_run` wraps and rolls back the whole import. Bad rows are
+    reported in the returned ImportResult and skipped. Attendance rollups
+    are refreshed once at the end (also when a batch fails), since batches
+    of consecutive days keep hitting the same months.
+    """
+    if kind not in IMPORTERS:
+        raise ImportFileError(f"Unknown import type {kind!r}")
+    importer, required = IMPORTERS[kind]
+    if isinstance(stream, (bytes, str)):
+        stream = io.StringIO(stream.decode("utf-8-sig") if isinstance(stream, bytes) else stream)
+
+    reader = csv.DictReader(stream)
+    reader.fieldnames = [name.strip() for name in reader.fieldnames or []]
+    columns = set(reader.fieldnames)
+    for group in required:
+        if not group & columns:
+            raise ImportFileError(f"CSV needs a column named {' or '.join(sorted(group))}")
+
+    result = ImportResult(kind, max_errors)
+    rollup_keys = set()
+    with transaction.atomic() if dry_run else nullcontext():
+        try:
+            for batch in batched(read_rows(reader), max(batch_size, 1)):
+                result.rows += len(batch)
+                with transaction.atomic():
+                    rollup_keys.update(importer(batch, result, columns) or ())
+        finally:
+            if rollup_keys:
+                with transaction.atomic():
+                    refresh_attendance_rollups(rollup_keys)
+        if dry_run:
+            transaction.set_rollback(True)
+    return result
@@ -0,0 +1,63 @@
+# client/management/commands/benchmark_api.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+
+from client.benchmarks import ENDPOINTS, format_results, results_json, run_suite, seed_benchmark_data, uncovered_routes
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every client API endpoint against seeded datasets of increasing size and fail when a "
+        "query budget is exceeded or a query count grows with the data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, nargs="+", default=[20, 200], help="Dataset sizes to run at")
+        parser.add_argument("--days", type=int, default=10, help="Days of attendance per employee")
+        parser.add_argument("--repeat", type=int, default=20, help="Requests per endpoint")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+
+    def handle(self, *args, **options):
+        missing = uncovered_routes()
+        if missing:
+            raise CommandError(f"Routes without a benchmark: {', '.join(missing)}")
+
+        scales = {}
+        # Each scale is seeded and measured inside a rolled-back transaction
+        # and with the login throttles off, so the database is left untouched
+        with override_settings(LOGIN_THROTTLE_ENABLED=False, REQUEST_METRICS_LOG=False, REQUEST_METRICS_ENDPOINT=True):
+            for employees in options["employees"]:
+                with transaction.atomic():
+                    context = seed_benchmark_data(employees, options["days"])
+                    scales[employees] = run_suite(context, repeat=options["repeat"])
+                    transaction.set_rollback(True)
+
+        if options["json"]:
+            self.stdout.write(results_json({"vendor": connection.vendor, "scales": scales}))
+        else:
+            for employees, results in scales.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f"{connection.vendor}: {employees} employees x {options['days']} days"
+                ))
+                self.stdout.write(format_results(results))
+
+        failures = self.failures(scales)
+        if failures:
+            raise CommandError("Benchmark failed:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(ENDPOINTS)} endpoints within their query budgets"))
+
+    def failures(self, scales):
+        failures = []
+        query_counts = {}
+        for employees, results in scales.items():
+            for row in results:
+                if row["over_budget"]:
+                    failures.append(f"{row['label']}: {row['queries']} queries, budget {row['budget']} ({employees} employees)")
+                if any(code >= 400 for code in row["status"]):
+                    failures.append(f"{row['label']}: HTTP {row['status']} ({employees} employees)")
+                query_counts.setdefault(row["label"], set()).add(row["queries"])
+        for label, counts in query_counts.items():
+            if len(counts) > 1:
+                failures.append(f"{label}: query count grows with the data ({sorted(counts)})")
+        return failures
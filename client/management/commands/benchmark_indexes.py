@@ -0,0 +1,66 @@
+# client/management/commands/benchmark_indexes.py
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from client.models import Employee, Attendance, Performance
+from client.pagination import DateKeysetPagination
+
+# Plan lines that mean "read every row of the table"
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?!.*\bUSING\b)\S+\s*$", re.MULTILINE),
+    "mysql": re.compile(r"\bALL\b"),
+    "postgresql": re.compile(r"\bSeq Scan\b"),
+}
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN and time the hot list / latest queries to confirm they use index range scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50, help="Timed executions per query")
+        parser.add_argument("--strict", action="store_true", help="Exit non-zero if any query plan is a full scan")
+
+    def hot_queries(self):
+        employee = Employee.objects.order_by("id").first()
+        employee_id = employee.id if employee else 0
+        department = employee.department if employee else ""
+        today = timezone.localdate()
+        page_ordering = DateKeysetPagination.ordering
+
+        return [
+            ("attendance list page", Attendance.objects.order_by(*page_ordering)[:50]),
+            ("attendance for employee", Attendance.objects.filter(employee_id=employee_id).order_by(*page_ordering)[:50]),
+            ("attendance present today", Attendance.objects.filter(date=today, status=Attendance.STATUS_PRESENT)),
+            ("performance list page", Performance.objects.order_by(*page_ordering)[:50]),
+            ("performance for employee", Performance.objects.filter(employee_id=employee_id).order_by(*page_ordering)[:50]),
+            ("performance latest", Performance.objects.filter(employee_id=employee_id).order_by("-date")[:1]),
+            ("employees by department", Employee.objects.filter(department=department)),
+            ("employees by role", Employee.objects.filter(role="admin")),
+        ]
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        full_scans = []
+
+        for label, queryset in self.hot_queries():
+            plan = queryset.explain()
+            started = time.perf_counter()
+            for _ in range(options["repeat"]):
+                list(queryset.all())
+            elapsed_ms = (time.perf_counter() - started) * 1000 / max(options["repeat"], 1)
+
+            full_scan = bool(pattern and pattern.search(plan))
+            if full_scan:
+                full_scans.append(label)
+            verdict = self.style.ERROR("FULL SCAN") if full_scan else self.style.SUCCESS("index")
+            self.stdout.write(f"{label:<28} {elapsed_ms:8.3f} ms  {verdict}")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+
+        if full_scans and options["strict"]:
+            raise CommandError(f"Full table scans: {', '.join(full_scans)}")
+        self.stdout.write(self.style.SUCCESS(f"✅ Checked {connection.vendor} query plans"))
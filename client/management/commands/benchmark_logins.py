@@ -0,0 +1,58 @@
+# client/management/commands/benchmark_logins.py
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = "Measure login throughput (logins per second per core) for the active password hasher profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20, help="Successful logins to time")
+        parser.add_argument("--password", default="Bench-Password-123")
+
+    def handle(self, *args, **options):
+        logins = max(options["logins"], 1)
+        password = options["password"]
+        hasher = get_hasher()
+        self.stdout.write(
+            f"Profile: {getattr(settings, 'PASSWORD_HASHER_PROFILE', '-')}  hasher: {hasher.algorithm}"
+        )
+
+        # Everything runs inside a rolled-back transaction: no benchmark users are left behind
+        with transaction.atomic():
+            user = User.objects.create_user("bench_login_user", "bench_login_user@example.com", password)
+
+            started, cpu_started = time.perf_counter(), time.process_time()
+            for _ in range(logins):
+                user.check_password(password)
+            hash_wall = time.perf_counter() - started
+            hash_cpu = time.process_time() - cpu_started
+
+            client = Client(HTTP_HOST="localhost")
+            url = reverse("login")
+            # Measure the login path itself, not the rate limiter
+            with override_settings(LOGIN_THROTTLE_ENABLED=False):
+                started, cpu_started = time.perf_counter(), time.process_time()
+                for _ in range(logins):
+                    response = client.post(
+                        url, {"username": user.username, "password": password}, content_type="application/json"
+                    )
+                    if response.status_code != 200:
+                        transaction.set_rollback(True)
+                        self.stderr.write(self.style.ERROR(f"Login failed with {response.status_code}: {response.content[:200]}"))
+                        return
+                login_wall = time.perf_counter() - started
+                login_cpu = time.process_time() - cpu_started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Password check : {hash_wall * 1000 / logins:8.2f} ms/op  {logins / hash_cpu:8.1f} ops/s per core")
+        self.stdout.write(f"Full login     : {login_wall * 1000 / logins:8.2f} ms/op  {logins / login_cpu:8.1f} logins/s per core")
+        self.stdout.write(self.style.SUCCESS(f"✅ {logins} logins timed"))
@@ -0,0 +1,66 @@
+# client/management/commands/benchmark_search.py
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from client.benchmarks import percentile
+from client.models import Employee, EmployeeSearchDocument
+from client.search import prefix_index, search_employee_ids, tokenize
+
+
+class Command(BaseCommand):
+    help = (
+        "Latency of employee search: the in-memory typeahead index, the ranked full-text "
+        "query and the admin's former icontains scan, over prefixes of existing names and some misses"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=200, help="Distinct prefixes to time")
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        total = EmployeeSearchDocument.objects.count()
+        if not total:
+            raise CommandError("No search documents; run seed_data or rebuild_search_index first")
+
+        rng = random.Random(options["seed"])
+        names = list(EmployeeSearchDocument.objects.order_by("?").values_list("name", flat=True)[:options["queries"]])
+        queries = []
+        for name in names:
+            word = rng.choice(tokenize(name) or ["a"])
+            if rng.random() < 0.2:
+                queries.append(f"{word[::-1]}qx")  # a miss: the icontains scan reads every row
+            else:
+                queries.append(word[:rng.randint(1, min(len(word), 4))])
+
+        started = time.perf_counter()
+        prefix_index.clear()
+        prefix_index.ensure_loaded()
+        self.stdout.write(f"typeahead index: {total} employees, {len(prefix_index.keys)} words, "
+                          f"loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        limit = options["limit"]
+        self.stdout.write(f"{'method':<22} {'p50 ms':>8} {'p99 ms':>8} {'avg hits':>9}")
+        self.report("typeahead (memory)", queries, lambda query: prefix_index.search(query, limit))
+        self.report("full-text (database)", queries, lambda query: search_employee_ids(query, limit))
+        self.report("icontains (database)", queries, lambda query: list(
+            Employee.objects.filter(
+                Q(user__username__icontains=query) | Q(user__email__icontains=query)
+                | Q(phone__icontains=query) | Q(name__icontains=query)
+            ).values_list("id", flat=True)[:limit]
+        ))
+        self.stdout.write(self.style.SUCCESS(f"✅ Timed {len(queries)} search queries"))
+
+    def report(self, label, queries, run):
+        timings, hits = [], 0
+        for query in queries:
+            started = time.perf_counter()
+            hits += len(run(query))
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(
+            f"{label:<22} {percentile(timings, 50) * 1000:>8.3f} {percentile(timings, 99) * 1000:>8.3f} "
+            f"{hits / len(queries):>9.1f}"
+        )
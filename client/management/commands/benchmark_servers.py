@@ -0,0 +1,200 @@
+# client/management/commands/benchmark_servers.py
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from client.authentication import issue_tokens
+from client.benchmarks import percentile
+
+# endpoint -> (sync path, async path)
+ENDPOINT_PATHS = {
+    "profile": ("/api/my-profile/", "/api/async/my-profile/"),
+    "dashboard": ("/api/dashboard/", "/api/async/dashboard/"),
+    "performance": ("/api/performance/", "/api/async/performance/"),
+    "attendance": ("/api/attendance/", "/api/async/attendance/"),
+}
+
+
+# -------------------------------
+# Minimal keep-alive HTTP/1.1 load generator
+# -------------------------------
+async def read_response(reader):
+    """Read one response; returns (status, server wants the connection closed)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    length, chunked, close = None, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value:
+            chunked = True
+        elif name == "connection" and value == "close":
+            close = True
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        close = True
+    return status, close
+
+
+async def connection_loop(host, port, request, deadline, record_after, latencies, errors):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, close = await read_response(reader)
+            if started >= record_after:
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    errors.append(status)
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError) as error:
+            if time.perf_counter() >= record_after:
+                errors.append(type(error).__name__)
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(host, port, path, token, connections, duration, warmup):
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        f"Authorization: Bearer {token}\r\nAccept: application/json\r\n\r\n"
+    ).encode("latin-1")
+    latencies, errors = [], []
+    started = time.perf_counter()
+    record_after = started + warmup
+    deadline = record_after + duration
+    await asyncio.gather(*(
+        connection_loop(host, port, request, deadline, record_after, latencies, errors)
+        for _ in range(connections)
+    ))
+    return latencies, errors
+
+
+# -------------------------------
+# Servers
+# -------------------------------
+def free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(host, port, process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"Server exited with code {process.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server on {host}:{port} did not start within {timeout}s")
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests/s and p99 latency of the read endpoints at increasing connection counts: "
+        "sync views under gunicorn (WSGI) and uvicorn (ASGI), and the async views under uvicorn"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, nargs="+", default=[50, 200, 1000])
+        parser.add_argument("--duration", type=float, default=10, help="Measured seconds per run")
+        parser.add_argument("--warmup", type=float, default=2, help="Unmeasured seconds before each run")
+        parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINT_PATHS), default=["attendance", "dashboard"])
+        parser.add_argument("--workers", type=int, default=1, help="Server processes for both servers")
+        parser.add_argument("--threads", type=int, default=16, help="Threads per gunicorn worker")
+        parser.add_argument("--username", help="User to authenticate as (default: first superuser)")
+        parser.add_argument("--host", default="127.0.0.1")
+
+    def handle(self, *args, **options):
+        missing = [name for name in ("uvicorn", "gunicorn") if importlib.util.find_spec(name) is None]
+        if missing:
+            raise CommandError(f"Install {' and '.join(missing)} to run this benchmark")
+
+        users = User.objects.filter(username=options["username"]) if options["username"] else (
+            User.objects.filter(is_superuser=True).order_by("id")
+        )
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to authenticate as; run seed_data first")
+        token = str(issue_tokens(user).access_token)
+
+        host, workers = options["host"], str(options["workers"])
+        servers = [
+            ("wsgi gunicorn", ("sync",), lambda port: [
+                sys.executable, "-m", "gunicorn", "ems.wsgi:application", "--bind", f"{host}:{port}",
+                "--workers", workers, "--threads", str(options["threads"]), "--worker-class", "gthread",
+                "--log-level", "warning",
+            ]),
+            ("asgi uvicorn", ("sync", "async"), lambda port: [
+                sys.executable, "-m", "uvicorn", "ems.asgi:application", "--host", host, "--port", str(port),
+                "--workers", workers, "--log-level", "warning", "--no-access-log",
+            ]),
+        ]
+        env = dict(os.environ, EMS_REQUEST_LOG_LEVEL="WARNING")
+
+        self.stdout.write(f"{'server':<15} {'view':<6} {'endpoint':<12} {'conns':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>9} {'errors':>7}")
+        for label, views, command in servers:
+            port = free_port(host)
+            process = subprocess.Popen(command(port), env=env)
+            try:
+                wait_for_port(host, port, process)
+                for endpoint in options["endpoints"]:
+                    for view, path in zip(("sync", "async"), ENDPOINT_PATHS[endpoint]):
+                        if view not in views:
+                            continue
+                        for connections in options["connections"]:
+                            self.report(label, view, endpoint, connections, asyncio.run(run_load(
+                                host, port, path, token, connections, options["duration"], options["warmup"],
+                            )), options["duration"])
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+        self.stdout.write(self.style.SUCCESS("✅ Server benchmark finished"))
+
+    def report(self, label, view, endpoint, connections, results, duration):
+        latencies, errors = results
+        if latencies:
+            p50, p99 = percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+        else:
+            p50 = p99 = float("nan")
+        self.stdout.write(
+            f"{label:<15} {view:<6} {endpoint:<12} {connections:>6} {len(latencies) / duration:>9.1f} "
+            f"{p50:>8.1f} {p99:>9.1f} {len(errors):>7}"
+        )
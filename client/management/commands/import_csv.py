@@ -0,0 +1,41 @@
+# client/management/commands/import_csv.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from client.imports import IMPORT_BATCH_SIZE, IMPORTERS, ImportFileError, import_csv
+
+
+class Command(BaseCommand):
+    help = "Bulk import employees, attendance or performance records from a CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path", help="CSV file with a header row (UTF-8)")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per transaction")
+        parser.add_argument("--max-errors", type=int, default=50, help="Row errors to print")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and write, then roll everything back")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = import_csv(
+                    options["kind"], stream, batch_size=options["batch_size"],
+                    max_errors=options["max_errors"], dry_run=options["dry_run"],
+                )
+        except (OSError, UnicodeDecodeError, ImportFileError) as error:
+            raise CommandError(str(error))
+        elapsed = time.perf_counter() - started
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... and {result.failed - len(result.errors)} more errors")
+
+        rate = result.rows / elapsed if elapsed > 0 else 0
+        prefix = "(dry run) " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {prefix}{options['kind']}: {result.rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s) - "
+            f"{result.created} created, {result.updated} updated, {result.unchanged} unchanged, {result.failed} failed"
+        ))
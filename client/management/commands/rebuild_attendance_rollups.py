@@ -0,0 +1,17 @@
+# client/management/commands/rebuild_attendance_rollups.py
+from django.core.management.base import BaseCommand
+
+from client.services import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly employee/department attendance rollups from raw attendance"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        employee_rollups, department_rollups = rebuild_attendance_rollups(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rebuilt {employee_rollups} employee and {department_rollups} department monthly rollups"
+        ))
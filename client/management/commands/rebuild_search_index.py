@@ -0,0 +1,15 @@
+# client/management/commands/rebuild_search_index.py
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from client.search import rebuild_fulltext_index, refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rewrite every employee search document and rebuild the full-text index from them"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            documents = refresh_search_documents()
+            rebuild_fulltext_index()
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt the search index for {len(documents)} employees"))
@@ -1,44 +1,156 @@
 # client/management/commands/seed_data.py
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
 from client.models import Employee, Attendance, Performance
+from client.search import refresh_search_documents
+from client.services import bulk_create_users, rebuild_attendance_rollups
 from faker import Faker
-import random
+
+DEPARTMENTS = ["IT", "HR", "Finance", "Marketing"]
+TASKS = ["Code review", "Sprint delivery", "Client report", "Training", "Audit", "Recruitment drive"]
+
 
 class Command(BaseCommand):
-    help = "Seed DB with users, employees, attendance, performance"
+    help = "Seed DB with users, employees, attendance, performance (scales to load-test volumes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=25, help="Employees to ensure exist (employee1..N)")
+        parser.add_argument("--days", type=int, default=0, help="Days of attendance per employee, ending today")
+        parser.add_argument("--performance-per-employee", type=int, default=0, help="Performance rows per employee")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk_create / transaction")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed; same seed, same data")
+        parser.add_argument("--password", default="employee123", help="Password for every seeded employee")
+        parser.add_argument("--skip-rollups", action="store_true", help="Do not rebuild the monthly rollups afterwards")
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
         fake = Faker()
+        fake.seed_instance(options["seed"])
+        # Faker is the slow part at scale, so draw from fixed pools instead
+        self.names = [fake.name() for _ in range(1000)]
+        self.cities = [fake.city() for _ in range(200)]
+        self.phones = [fake.phone_number() for _ in range(1000)]
+        self.batch_size = max(options["batch_size"], 1)
 
         # Create admin if not exists
         if not User.objects.filter(username="admin").exists():
             User.objects.create_superuser("admin", "admin@example.com", "admin123")
 
-        # Create 25 employees
-        for i in range(1, 26):
+        self.seed_employees(options["employees"], options["password"])
+        employee_ids = list(
+            Employee.objects.filter(user__is_staff=False).order_by("id").values_list("id", flat=True)
+        )
+        if options["days"] > 0:
+            self.seed_attendance(employee_ids, options["days"])
+        if options["performance_per_employee"] > 0:
+            self.seed_performance(employee_ids, options["performance_per_employee"], max(options["days"], 365))
+        if options["days"] > 0 and not options["skip_rollups"]:
+            started = time.perf_counter()
+            employee_rollups, department_rollups = rebuild_attendance_rollups(batch_size=self.batch_size)
+            self.report("rollups", employee_rollups + department_rollups, started)
+
+    # -------------------------------
+    # Phases
+    # -------------------------------
+    def seed_employees(self, count, password):
+        started = time.perf_counter()
+        existing = set(User.objects.filter(username__startswith="employee").values_list("username", flat=True))
+        password_hash = make_password(password)  # hashed once, shared by every seeded user
+
+        pending = []
+        created = 0
+        for i in range(1, count + 1):
             username = f"employee{i}"
-            email = f"{username}@example.com"
-
-            if not User.objects.filter(username=username).exists():
-                user = User.objects.create_user(
-                    username=username,
-                    email=email,
-                    password="employee123",
-                    is_staff=False
-                )
-            else:
-                user = User.objects.get(username=username)
-
-            # Create employee
-            if not Employee.objects.filter(user=user).exists():
-                Employee.objects.create(
-                    user=user,
-                    name=fake.name(),
-                    role="employee",
-                    department=random.choice(["IT", "HR", "Finance", "Marketing"]),
-                    address=fake.city(),
-                    phone=fake.phone_number()
-                )
-
-        self.stdout.write(self.style.SUCCESS("✅ 25 employees created successfully!"))
+            if username in existing:
+                continue
+            pending.append(username)
+            if len(pending) >= self.batch_size:
+                created += self.create_employee_batch(pending, password_hash)
+                pending = []
+        if pending:
+            created += self.create_employee_batch(pending, password_hash)
+        self.report("employees", created, started)
+
+    def create_employee_batch(self, usernames, password_hash):
+        users = [
+            User(username=username, email=f"{username}@example.com", password=password_hash)
+            for username in usernames
+        ]
+        profiles = {
+            username: {
+                "name": self.rng.choice(self.names),
+                "role": "employee",
+                "department": self.rng.choice(DEPARTMENTS),
+                "address": self.rng.choice(self.cities),
+                "phone": self.rng.choice(self.phones),
+            }
+            for username in usernames
+        }
+        created = bulk_create_users(users, profiles, batch_size=self.batch_size)
+        refresh_search_documents(Employee.objects.filter(user__username__in=usernames))
+        return len(created)
+
+    def seed_attendance(self, employee_ids, days):
+        started = time.perf_counter()
+        today = timezone.localdate()
+        rows = (
+            Attendance(
+                employee_id=employee_id,
+                date=today - datetime.timedelta(days=offset),
+                status=Attendance.STATUS_PRESENT if self.rng.random() < 0.85 else Attendance.STATUS_ABSENT,
+            )
+            for employee_id in employee_ids
+            for offset in range(days)
+        )
+        # ignore_conflicts keeps reruns from failing on the (employee, date) constraint
+        written = self.write_batches(Attendance, rows, ignore_conflicts=True)
+        self.report("attendance", written, started)
+
+    def seed_performance(self, employee_ids, per_employee, days):
+        started = time.perf_counter()
+        today = timezone.localdate()
+        rows = (
+            Performance(
+                employee_id=employee_id,
+                task=self.rng.choice(TASKS),
+                rating=self.rng.randint(1, 5),
+                remarks="",
+                date=today - datetime.timedelta(days=self.rng.randrange(days)),
+            )
+            for employee_id in employee_ids
+            for _ in range(per_employee)
+        )
+        written = self.write_batches(Performance, rows)
+        self.report("performance", written, started)
+
+    # -------------------------------
+    # Helpers
+    # -------------------------------
+    def write_batches(self, model, rows, **bulk_options):
+        written = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                written += self.write_batch(model, batch, bulk_options)
+                batch = []
+        if batch:
+            written += self.write_batch(model, batch, bulk_options)
+        return written
+
+    def write_batch(self, model, batch, bulk_options):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, **bulk_options)
+        return len(batch)
+
+    def report(self, label, rows, started):
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(f"✅ {label}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)"))
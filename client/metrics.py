@@ -0,0 +1,409 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# -------------------------------
+# Per-request measurements
+# -------------------------------
+class RequestMetrics:
+    """
+    Timings and SQL for one request. Called by the record_query execute
+    wrapper, so every query is counted and timed; queries are fingerprinted
+    by their parameterised SQL, which makes an N+1 loop show up as one
+    fingerprint executed many times.
+
+    The middleware marks when the view starts, when it returns and when the
+    response has been rendered, which splits the request into:
+    db (all SQL), serialize (TimedSerializerMixin output, less its SQL),
+    view (the rest of the view: auth, validation, queries built), render
+    (JSON encoding, or producing a streamed body) and total.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.queries = 0
+        self.fingerprints = {}
+        self.view_started = self.view_finished = self.render_finished = None
+        self.db_at_view_start = self.db_at_view_finish = self.db_at_render_finish = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[sql] = self.fingerprints.get(sql, 0) + 1
+
+    @contextmanager
+    def serializer_span(self):
+        """Time the outermost serializer call; nested ones run inside it."""
+        started, db_started, self.serializing = time.perf_counter(), self.db_time, True
+        try:
+            yield
+        finally:
+            self.serializing = False
+            self.serialize_time += (time.perf_counter() - started) - (self.db_time - db_started)
+
+    def mark_view_started(self):
+        self.view_started, self.db_at_view_start = time.perf_counter(), self.db_time
+
+    def mark_view_finished(self):
+        self.view_finished, self.db_at_view_finish = time.perf_counter(), self.db_time
+
+    def mark_render_finished(self, response=None):
+        self.render_finished, self.db_at_render_finish = time.perf_counter(), self.db_time
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def total(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def view_time(self):
+        if self.view_started is None:
+            return 0.0
+        if self.view_finished is None:
+            # Plain and streaming responses skip the template-response hook
+            elapsed, db_time = (self.finished or time.perf_counter()) - self.view_started, self.db_time - self.db_at_view_start
+        else:
+            elapsed, db_time = self.view_finished - self.view_started, self.db_at_view_finish - self.db_at_view_start
+        return max(0.0, elapsed - db_time - self.serialize_time)
+
+    @property
+    def render_time(self):
+        if self.view_finished is None or self.render_finished is None:
+            return 0.0
+        return max(0.0, (self.render_finished - self.view_finished) - (self.db_at_render_finish - self.db_at_view_finish))
+
+    @property
+    def duplicate_queries(self):
+        """Queries that repeated an earlier fingerprint in the same request."""
+        return self.queries - len(self.fingerprints)
+
+    def worst_fingerprint(self):
+        if not self.fingerprints:
+            return None, 0
+        return max(self.fingerprints.items(), key=lambda item: item[1])
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f"serialize;dur={self.serialize_time * 1000:.2f}",
+            f"view;dur={self.view_time * 1000:.2f}",
+            f"render;dur={self.render_time * 1000:.2f}",
+            f"total;dur={self.total * 1000:.2f}",
+        ])
+
+
+# -------------------------------
+# Process-wide aggregates
+# -------------------------------
+class MetricsRegistry:
+    """
+    Counters and a duration histogram per view, kept in this process.
+    Each worker exposes its own numbers; Prometheus sums them across
+    scrape targets.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.views = {}
+
+    def observe(self, view, method, status_code, metrics):
+        total = metrics.total
+        with self.lock:
+            key = (view, method, str(status_code))
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            stats = self.views.get(view)
+            if stats is None:
+                stats = self.views[view] = {
+                    "buckets": [0] * len(DURATION_BUCKETS), "count": 0, "sum": 0.0,
+                    "db": 0.0, "serialize": 0.0, "view": 0.0, "render": 0.0, "queries": 0, "duplicates": 0,
+                }
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if total <= bound:
+                    stats["buckets"][index] += 1
+            stats["count"] += 1
+            stats["sum"] += total
+            stats["db"] += metrics.db_time
+            stats["serialize"] += metrics.serialize_time
+            stats["view"] += metrics.view_time
+            stats["render"] += metrics.render_time
+            stats["queries"] += metrics.queries
+            stats["duplicates"] += metrics.duplicate_queries
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self.lock:
+            requests = sorted(self.requests.items())
+            views = sorted((view, dict(stats, buckets=list(stats["buckets"]))) for view, stats in self.views.items())
+
+        lines = [
+            "# HELP ems_http_requests_total Requests handled, by view, method and status.",
+            "# TYPE ems_http_requests_total counter",
+        ]
+        for (view, method, status_code), count in requests:
+            lines.append(
+                f'ems_http_requests_total{{view="{label(view)}",method="{method}",status="{status_code}"}} {count}'
+            )
+
+        lines += [
+            "# HELP ems_http_request_duration_seconds Total request time, by view.",
+            "# TYPE ems_http_request_duration_seconds histogram",
+        ]
+        for view, stats in views:
+            name = label(view)
+            for bound, count in zip(DURATION_BUCKETS, stats["buckets"]):
+                lines.append(f'ems_http_request_duration_seconds_bucket{{view="{name}",le="{bound}"}} {count}')
+            lines.append(f'ems_http_request_duration_seconds_bucket{{view="{name}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'ems_http_request_duration_seconds_sum{{view="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'ems_http_request_duration_seconds_count{{view="{name}"}} {stats["count"]}')
+
+        for metric, field, help_text in (
+            ("ems_http_request_db_seconds_total", "db", "Time spent in SQL"),
+            ("ems_http_request_serialize_seconds_total", "serialize", "Time spent in serializers outside SQL"),
+            ("ems_http_request_view_seconds_total", "view", "Time spent in view code outside SQL and serializers"),
+            ("ems_http_request_render_seconds_total", "render", "Time spent rendering responses"),
+            ("ems_http_request_queries_total", "queries", "SQL queries executed"),
+            ("ems_http_request_duplicate_queries_total", "duplicates", "Queries repeating a fingerprint within a request"),
+        ):
+            lines += [f"# HELP {metric} {help_text}, by view.", f"# TYPE {metric} counter"]
+            for view, stats in views:
+                value = stats[field]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{metric}{{view="{label(view)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+# -------------------------------
+# Middleware
+# -------------------------------
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return match.view_name or match.url_name or "unnamed"
+
+
+current_metrics = ContextVar("request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every connection. It reports to the
+    RequestMetrics of the current request through a context variable, which
+    also follows async views into the threads running their ORM calls.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+class TimedSerializerMixin:
+    """
+    Adds a serializer's output time to the current request's serialize span.
+    Only the outermost call is timed, and SQL run by lazy relations inside
+    it stays in the db span.
+    """
+    def to_representation(self, instance):
+        metrics = current_metrics.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        with metrics.serializer_span():
+            return super().to_representation(instance)
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+def stream_content(chunks, metrics, done):
+    """Streamed body whose SQL is recorded on `metrics`; `done` runs once it ends or is closed."""
+    try:
+        while True:
+            token = current_metrics.set(metrics)
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                current_metrics.reset(token)
+            yield chunk
+    finally:
+        done()
+
+
+async def astream_content(chunks, metrics, done):
+    try:
+        while True:
+            token = current_metrics.set(metrics)
+            try:
+                chunk = await anext(chunks)
+            except StopAsyncIteration:
+                return
+            finally:
+                current_metrics.reset(token)
+            yield chunk
+    finally:
+        done()
+
+
+class RequestMetricsMiddleware:
+    """
+    Records total, SQL, view and render time plus query counts for
+    every request, then:
+      - adds a Server-Timing header (REQUEST_METRICS_SERVER_TIMING),
+      - writes one JSON log line on the client.metrics logger, and a warning
+        when one query fingerprint repeats REQUEST_METRICS_DUPLICATE_THRESHOLD
+        times (a likely N+1),
+      - feeds the per-view aggregates served by /api/metrics.
+    Cost is a perf_counter pair and a dict update per query, so it is meant
+    to stay on in production. Place it first in MIDDLEWARE. Works in both
+    sync and async stacks, so it never forces a thread hop under ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Async hooks, or the handler would run each one in a thread
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            return self.get_response(request)
+
+        install_query_recorder(connection=connection)
+        metrics = request.request_metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", True):
+            return await self.get_response(request)
+
+        metrics = request.request_metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        name = view_name(request)
+        if response.streaming:
+            # The body (and its SQL) is produced after this returns: the
+            # header covers the work before it, the log and registry all of it
+            metrics.mark_view_finished()
+            if getattr(settings, "REQUEST_METRICS_SERVER_TIMING", True):
+                response["Server-Timing"] = metrics.server_timing()
+            stream = astream_content if response.is_async else stream_content
+            response.streaming_content = stream(
+                response.streaming_content, metrics, partial(self.record, request, response, name, metrics),
+            )
+            return response
+
+        metrics.finish()
+        if getattr(settings, "REQUEST_METRICS_SERVER_TIMING", True):
+            response["Server-Timing"] = metrics.server_timing()
+        self.record(request, response, name, metrics)
+        return response
+
+    def record(self, request, response, name, metrics):
+        if response.streaming:
+            metrics.mark_render_finished()
+            metrics.finish()
+        registry.observe(name, request.method, response.status_code, metrics)
+        self.log(request, response, name, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = getattr(request, "request_metrics", None)
+        if metrics is not None:
+            metrics.mark_view_started()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook; the callback closes the render span
+        metrics = getattr(request, "request_metrics", None)
+        if metrics is not None:
+            metrics.mark_view_finished()
+            response.add_post_render_callback(metrics.mark_render_finished)
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        RequestMetricsMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return RequestMetricsMiddleware.process_template_response(self, request, response)
+
+    def log(self, request, response, name, metrics):
+        if not getattr(settings, "REQUEST_METRICS_LOG", True):
+            return
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                "event": "request",
+                "view": name,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(metrics.total * 1000, 2),
+                "db_ms": round(metrics.db_time * 1000, 2),
+                "serialize_ms": round(metrics.serialize_time * 1000, 2),
+                "view_ms": round(metrics.view_time * 1000, 2),
+                "render_ms": round(metrics.render_time * 1000, 2),
+                "queries": metrics.queries,
+                "duplicate_queries": metrics.duplicate_queries,
+            }))
+
+        sql, repeats = metrics.worst_fingerprint()
+        if repeats >= getattr(settings, "REQUEST_METRICS_DUPLICATE_THRESHOLD", 5):
+            logger.warning(json.dumps({
+                "event": "duplicate_queries", "view": name, "path": request.path,
+                "repeats": repeats, "sql": sql[:500],
+            }))
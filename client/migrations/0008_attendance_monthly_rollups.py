@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0007_remove_attendance_absent_days_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.CharField(blank=True, default='', max_length=100)),
+                ('month', models.DateField()),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('absent_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-month', 'department'],
+                'unique_together': {('department', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AttendanceMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('absent_count', models.PositiveIntegerField(default=0)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='client.employee')),
+            ],
+            options={
+                'ordering': ['-month'],
+                'unique_together': {('employee', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0008_attendance_monthly_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='attendance_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['-date', 'id'], name='attendance_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department'], name='employee_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['role'], name='employee_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='performance',
+            index=models.Index(fields=['employee', '-date'], name='performance_employee_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='performance',
+            index=models.Index(fields=['-date', 'id'], name='performance_date_id_idx'),
+        ),
+    ]
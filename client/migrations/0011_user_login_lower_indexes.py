@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:35
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+# auth.User belongs to django.contrib.auth, so its functional indexes are
+# created here through the schema editor instead of AddIndex.
+LOGIN_INDEXES = [
+    models.Index(Lower("username"), name="auth_user_username_lower_idx"),
+    models.Index(Lower("email"), name="auth_user_email_lower_idx"),
+]
+
+
+def create_login_indexes(apps, schema_editor):
+    if not schema_editor.connection.features.supports_expression_indexes:
+        return
+    User = apps.get_model("auth", "User")
+    for index in LOGIN_INDEXES:
+        schema_editor.add_index(User, index)
+
+
+def drop_login_indexes(apps, schema_editor):
+    if not schema_editor.connection.features.supports_expression_indexes:
+        return
+    User = apps.get_model("auth", "User")
+    for index in LOGIN_INDEXES:
+        schema_editor.remove_index(User, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('client', '0010_employee_attendance_performance_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_login_indexes, drop_login_indexes),
+    ]
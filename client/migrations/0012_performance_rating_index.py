@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0011_user_login_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='performance',
+            index=models.Index(fields=['rating', 'id'], name='performance_rating_id_idx'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Full-text index over the search documents: an external-content FTS5 table
+# kept in step by triggers on SQLite, a FULLTEXT index on MySQL. Other
+# backends fall back to LIKE in client.search.
+DOCUMENT_TABLE = "client_employeesearchdocument"
+FTS_TABLE = "client_employeesearch_fts"
+COLUMNS = "name, username, email, phone, department"
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        {COLUMNS}, content='{DOCUMENT_TABLE}', content_rowid='employee_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS})
+        VALUES (new.employee_id, new.name, new.username, new.email, new.phone, new.department);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS})
+        VALUES ('delete', old.employee_id, old.name, old.username, old.email, old.phone, old.department);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS})
+        VALUES ('delete', old.employee_id, old.name, old.username, old.email, old.phone, old.department);
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS})
+        VALUES (new.employee_id, new.name, new.username, new.email, new.phone, new.department);
+    END""",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+MYSQL_CREATE = [f"ALTER TABLE {DOCUMENT_TABLE} ADD FULLTEXT INDEX employee_search_fulltext ({COLUMNS})"]
+MYSQL_DROP = [f"ALTER TABLE {DOCUMENT_TABLE} DROP INDEX employee_search_fulltext"]
+
+
+def run_statements(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def create_fulltext_index(apps, schema_editor):
+    run_statements(schema_editor, {"sqlite": SQLITE_CREATE, "mysql": MYSQL_CREATE})
+
+
+def drop_fulltext_index(apps, schema_editor):
+    run_statements(schema_editor, {"sqlite": SQLITE_DROP, "mysql": MYSQL_DROP})
+
+
+def backfill_documents(apps, schema_editor):
+    Employee = apps.get_model("client", "Employee")
+    EmployeeSearchDocument = apps.get_model("client", "EmployeeSearchDocument")
+    rows = Employee.objects.using(schema_editor.connection.alias).values_list(
+        "id", "name", "user__username", "user__email", "phone", "department"
+    )
+    EmployeeSearchDocument.objects.using(schema_editor.connection.alias).bulk_create([
+        EmployeeSearchDocument(
+            employee_id=pk, name=name or "", username=username or "", email=email or "",
+            phone=phone or "", department=department or "",
+        )
+        for pk, name, username, email, phone, department in rows.iterator(chunk_size=2000)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0012_performance_rating_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchDocument',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='client.employee')),
+                ('name', models.CharField(blank=True, default='', max_length=200)),
+                ('username', models.CharField(blank=True, default='', max_length=150)),
+                ('email', models.CharField(blank=True, default='', max_length=254)),
+                ('phone', models.CharField(blank=True, default='', max_length=30)),
+                ('department', models.CharField(blank=True, default='', max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at'], name='employee_search_updated_idx')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0013_employee_search_document'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['status', 'employee', 'updated_at'], name='attendance_status_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='performance',
+            index=models.Index(fields=['employee', 'updated_at'], name='performance_employee_state_idx'),
+        ),
+    ]
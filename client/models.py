@@ -1,12 +1,84 @@
 from django.db import models
+from django.db.models import DEFERRED
 from django.conf import settings
 from django.utils import timezone
 
 
+# -------------------------------
+# Dirty-field tracking
+# -------------------------------
+class TrackedModel(models.Model):
+    """
+    Remembers the column values an instance was loaded with. save() on a
+    loaded row writes only the fields that changed (plus auto_now fields)
+    and skips the UPDATE entirely when nothing did.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field.attname: value
+            for field, value in zip(cls._meta.concrete_fields, instance._iter_loaded(field_names, values))
+            if value is not DEFERRED
+        }
+        return instance
+
+    @classmethod
+    def _iter_loaded(cls, field_names, values):
+        # from_db() receives either every concrete column or only the loaded ones
+        if len(values) == len(cls._meta.concrete_fields):
+            return values
+        loaded = dict(zip(field_names, values))
+        return [loaded.get(field.attname, DEFERRED) for field in cls._meta.concrete_fields]
+
+    def get_dirty_fields(self):
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return None
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or getattr(field, "auto_now", False):
+                continue
+            if field.attname in loaded:
+                if getattr(self, field.attname) != loaded[field.attname]:
+                    dirty.append(field.attname)
+            elif field.attname in self.__dict__:
+                dirty.append(field.attname)
+        return dirty
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None and not args:
+            dirty = self.get_dirty_fields()
+            if dirty is not None:
+                if not dirty:
+                    return
+                auto_now = [f.attname for f in self._meta.concrete_fields if getattr(f, "auto_now", False)]
+                kwargs["update_fields"] = dirty + auto_now
+        super().save(*args, **kwargs)
+        self._remember_values(None if args else kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_values(fields)
+
+    def _remember_values(self, field_names=None):
+        """Record the written/refreshed fields (default: every loaded one) as the stored values."""
+        if field_names is None or getattr(self, "_loaded_values", None) is None:
+            self._loaded_values = {}
+        fields = self._meta.concrete_fields if field_names is None else map(self._meta.get_field, field_names)
+        for field in fields:
+            if field.attname in self.__dict__:
+                self._loaded_values[field.attname] = getattr(self, field.attname)
+
+
 # -------------------------------
 # Employee Model (Main Profile)
 # -------------------------------
-class Employee(models.Model):
+class Employee(TrackedModel):
     ROLE_CHOICES = [
         ("employee", "Employee"),
         ("admin", "Admin"),
@@ -23,15 +95,54 @@ class Employee(models.Model):
     address = models.TextField(blank=True, default="")
     phone = models.CharField(max_length=30, blank=True, default="")
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default="employee")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["department"], name="employee_department_idx"),
+            models.Index(fields=["role"], name="employee_role_idx"),
+        ]
 
     def __str__(self):
         return self.name or self.user.username
 
 
+# -------------------------------
+# Employee Search Documents (maintained by signals)
+# -------------------------------
+class EmployeeSearchDocument(models.Model):
+    """
+    The searchable text of one employee, copied from Employee and its User
+    so a single table carries the full-text index (SQLite FTS5 / MySQL
+    FULLTEXT, see migration 0013) without joining at query time.
+    """
+    employee = models.OneToOneField(
+        Employee,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document"
+    )
+    name = models.CharField(max_length=200, blank=True, default="")
+    username = models.CharField(max_length=150, blank=True, default="")
+    email = models.CharField(max_length=254, blank=True, default="")
+    phone = models.CharField(max_length=30, blank=True, default="")
+    department = models.CharField(max_length=100, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Incremental typeahead index sync: WHERE updated_at >= ?
+            models.Index(fields=["updated_at"], name="employee_search_updated_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.name or self.username}"
+
+
 # -------------------------------
 # Attendance Model
 # -------------------------------
-class Attendance(models.Model):
+class Attendance(TrackedModel):
     STATUS_PRESENT = "present"
     STATUS_ABSENT = "absent"
     STATUS_CHOICES = [
@@ -46,19 +157,64 @@ class Attendance(models.Model):
     )
     date = models.DateField(default=timezone.now)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_ABSENT)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("employee", "date")
         ordering = ["-date"]
+        indexes = [
+            # Per-day status counts (dashboard, bulk marking)
+            models.Index(fields=["date", "status"], name="attendance_date_status_idx"),
+            # Keyset list pages: ORDER BY date DESC, id
+            models.Index(fields=["-date", "id"], name="attendance_date_id_idx"),
+            # List ETags (COUNT / MAX(updated_at) joined to employee) from the index alone;
+            # ?status= lists seek it
+            models.Index(fields=["status", "employee", "updated_at"], name="attendance_status_state_idx"),
+        ]
 
     def __str__(self):
         return f"{self.employee.user.username} - {self.date} - {self.status}"
 
 
+# -------------------------------
+# Attendance Rollups (maintained by signals)
+# -------------------------------
+class AttendanceMonthlyRollup(models.Model):
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="attendance_rollups"
+    )
+    month = models.DateField()  # first day of the month
+    present_count = models.PositiveIntegerField(default=0)
+    absent_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("employee", "month")
+        ordering = ["-month"]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.month:%Y-%m} - {self.present_count}/{self.absent_count}"
+
+
+class DepartmentMonthlyRollup(models.Model):
+    department = models.CharField(max_length=100, blank=True, default="")
+    month = models.DateField()  # first day of the month
+    present_count = models.PositiveIntegerField(default=0)
+    absent_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("department", "month")
+        ordering = ["-month", "department"]
+
+    def __str__(self):
+        return f"{self.department or '-'} - {self.month:%Y-%m} - {self.present_count}/{self.absent_count}"
+
+
 # -------------------------------
 # Performance Model
 # -------------------------------
-class Performance(models.Model):
+class Performance(TrackedModel):
     employee = models.ForeignKey(
         Employee,
         on_delete=models.CASCADE,
@@ -68,9 +224,21 @@ class Performance(models.Model):
     rating = models.PositiveSmallIntegerField(null=True, blank=True)
     remarks = models.TextField(blank=True, default="")
     date = models.DateField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            # "Latest for employee" and per-employee lists ordered newest first
+            models.Index(fields=["employee", "-date"], name="performance_employee_date_idx"),
+            # Keyset list pages: ORDER BY date DESC, id
+            models.Index(fields=["-date", "id"], name="performance_date_id_idx"),
+            # ?rating_min= / ?rating_max= filters and ?ordering=rating pages
+            models.Index(fields=["rating", "id"], name="performance_rating_id_idx"),
+            # List ETags (COUNT / MAX(updated_at) joined to employee) from the index alone;
+            # ?department= lists seek it per employee
+            models.Index(fields=["employee", "updated_at"], name="performance_employee_state_idx"),
+        ]
 
     def __str__(self):
         rating_display = self.rating if self.rating is not None else "-"
@@ -0,0 +1,194 @@
+import base64
+import json
+
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# -------------------------------
+# Keyset (cursor) pagination
+# -------------------------------
+class KeysetPagination(BasePagination):
+    """
+    Seek-based pagination over a fixed, unique ordering.
+
+    The cursor stores the ordering values of the last row of a page instead of
+    an offset, so every page is a `WHERE (date, id) < (...) LIMIT n` index range
+    scan and cursors stay valid while rows are inserted or deleted.
+
+    `orderings` lists the alternatives a client may pick with ?ordering=;
+    each must match an index (or one read backwards). Rows with NULL in an
+    ordering column cannot be seeked past and are left out.
+    """
+    ordering = ("id",)
+    orderings = {}
+    ordering_query_param = "ordering"
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset() for async views, fetching the page with the async ORM."""
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """The unevaluated page query: seek past the cursor, fetch one extra row."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = [(name.lstrip("-"), name.startswith("-")) for name in self.get_requested_ordering(request)]
+
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+        self.has_cursor = position is not None
+
+        for name, _ in self.fields:
+            if queryset.model._meta.get_field(name).null:
+                queryset = queryset.filter(**{f"{name}__isnull": False})
+        queryset = queryset.order_by(*self.get_ordering(self.reverse))
+        if position is not None:
+            queryset = queryset.filter(self.build_seek_filter(position, self.reverse))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else self.has_cursor
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw:
+            try:
+                size = int(raw)
+            except (TypeError, ValueError):
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size)
+        return self.page_size
+
+    def get_requested_ordering(self, request):
+        value = request.query_params.get(self.ordering_query_param)
+        if not value or not self.orderings:
+            return self.ordering
+        if value not in self.orderings:
+            raise ValidationError({self.ordering_query_param: [f"Expected one of: {', '.join(self.orderings)}."]})
+        return self.orderings[value]
+
+    def get_ordering(self, reverse=False):
+        ordering = []
+        for name, descending in self.fields:
+            if descending != reverse:
+                ordering.append(f"-{name}")
+            else:
+                ordering.append(name)
+        return ordering
+
+    def build_seek_filter(self, position, reverse=False):
+        """
+        Expand a row-value comparison into a portable OR-of-ANDs:
+        (a < x) OR (a = x AND b > y) ...
+        """
+        seek = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields, position):
+            lookup = "lt" if descending != reverse else "gt"
+            seek |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return seek
+
+    # -------------------------------
+    # Cursor encoding
+    # -------------------------------
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            values = payload["p"]
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.fields, values)
+            ]
+            return position, bool(payload.get("r"))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse=False):
+        values = []
+        for name, _ in self.fields:
+            value = getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class IdKeysetPagination(KeysetPagination):
+    """Employees and users: ordered by primary key."""
+    ordering = ("id",)
+
+
+class DateKeysetPagination(KeysetPagination):
+    """Attendance and performance: newest first, `id` breaks ties within a day."""
+    ordering = ("-date", "id")
+    orderings = {
+        "-date": ("-date", "id"),
+        "date": ("date", "-id"),  # the (-date, id) index read backwards
+    }
+
+
+class PerformanceKeysetPagination(DateKeysetPagination):
+    """Performance lists can also be ordered by rating (rated records only)."""
+    orderings = {
+        **DateKeysetPagination.orderings,
+        "-rating": ("-rating", "-id"),  # the (rating, id) index read backwards
+        "rating": ("rating", "id"),
+    }
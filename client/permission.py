@@ -1,5 +1,9 @@
+from django.conf import settings
+from django.http import Http404
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from .authentication import METRICS_SCRAPE, get_employee_id
+
 class IsAdminOrReadOnly(BasePermission):
     """Allow read-only access to everyone, write access only to admins"""
     def has_permission(self, request, view):
@@ -14,11 +18,26 @@ class IsAdminOrOwner(BasePermission):
         return (
             request.user.is_staff or
             request.user.is_superuser or
-            (hasattr(request.user, "employee") and obj.employee == request.user.employee)
+            (obj.employee_id is not None and obj.employee_id == get_employee_id(request.user))
         )
 
 
 class IsEmployeeMarkingOwnAttendance(BasePermission):
     """Only allow employee to update their own attendance"""
     def has_object_permission(self, request, view, obj):
-        return hasattr(request.user, "employee") and obj.employee == request.user.employee
+        return obj.employee_id is not None and obj.employee_id == get_employee_id(request.user)
+
+
+class CanScrapeMetrics(BasePermission):
+    """
+    /api/metrics: 404 unless REQUEST_METRICS_ENDPOINT is on, then admins, the
+    REQUEST_METRICS_TOKEN bearer or a REQUEST_METRICS_ALLOWED_IPS address
+    """
+    def has_permission(self, request, view):
+        if not getattr(settings, "REQUEST_METRICS_ENDPOINT", False):
+            raise Http404
+        if request.auth == METRICS_SCRAPE:
+            return True
+        if request.META.get("REMOTE_ADDR") in getattr(settings, "REQUEST_METRICS_ALLOWED_IPS", ()):
+            return True
+        return bool(request.user and (request.user.is_staff or request.user.is_superuser))
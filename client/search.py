@@ -0,0 +1,416 @@
+import datetime
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Employee, EmployeeSearchDocument
+from .services import upsert_options
+
+FTS_TABLE = "client_employeesearch_fts"
+DOCUMENT_TABLE = EmployeeSearchDocument._meta.db_table
+# Document columns in ranking order: a match in the name counts most
+SEARCH_FIELDS = ("name", "username", "email", "phone", "department")
+FTS_WEIGHTS = (10.0, 5.0, 3.0, 1.0, 2.0)
+MAX_QUERY_TOKENS = 8
+# InnoDB's default stopword list (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD)
+INNODB_STOPWORDS = frozenset((
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from", "how", "i", "in",
+    "is", "it", "la", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www",
+))
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(value):
+    """Lower-cased words without accents, split like the FTS5 unicode61 tokenizer."""
+    value = str(value or "")
+    if value.isascii():
+        return TOKEN_RE.findall(value.lower())
+    value = unicodedata.normalize("NFKD", value).casefold()
+    return TOKEN_RE.findall("".join(char for char in value if not unicodedata.combining(char)))
+
+
+# -------------------------------
+# Search documents
+# -------------------------------
+# One EmployeeSearchDocument per employee, written by the signals in
+# client/signals.py. Bulk paths that bypass signals (bulk_create_users,
+# the employee CSV import, seed_data) call refresh_search_documents().
+
+def build_document(employee_id, name, username, email, phone, department):
+    return EmployeeSearchDocument(
+        employee_id=employee_id, name=name or "", username=username or "", email=email or "",
+        phone=phone or "", department=department or "",
+    )
+
+
+def save_search_documents(documents):
+    """Upsert documents; the FTS5 triggers / FULLTEXT index follow in the same transaction."""
+    documents = list(documents)
+    if documents:
+        EmployeeSearchDocument.objects.bulk_create(
+            documents, batch_size=1000, **upsert_options(["employee"], [*SEARCH_FIELDS, "updated_at"]),
+        )
+        transaction.on_commit(lambda: prefix_index.upsert(document_values(document) for document in documents))
+    return documents
+
+
+def refresh_search_documents(employees=None):
+    """Rewrite the documents of `employees` (an Employee queryset; default all) from their rows."""
+    employees = Employee.objects.all() if employees is None else employees
+    rows = employees.values_list("id", "name", "user__username", "user__email", "phone", "department")
+    return save_search_documents(build_document(*row) for row in rows.iterator(chunk_size=2000))
+
+
+def index_employee(employee):
+    """Document for one saved Employee; reuses a loaded user instead of querying it."""
+    if Employee.user.is_cached(employee):
+        user = employee.user
+        return save_search_documents([build_document(
+            employee.pk, employee.name, user.username, user.email, employee.phone, employee.department,
+        )])
+    return refresh_search_documents(Employee.objects.filter(pk=employee.pk))
+
+
+def forget_employee(employee_id):
+    """
+    The document row goes with the employee (CASCADE). This worker drops it
+    from its typeahead index; the new generation makes the others drop it
+    on their next search when the cache is shared, else at their next sync.
+    """
+    def forget():
+        previous, generation = get_search_generation(), time.time_ns()
+        cache.set(SEARCH_GENERATION_KEY, generation, None)
+        prefix_index.remove([employee_id], previous, generation)
+    transaction.on_commit(forget)
+
+
+def rebuild_fulltext_index():
+    """Re-derive the FTS5 table from the documents (SQLite; MySQL maintains FULLTEXT itself)."""
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def document_values(document):
+    return (document.employee_id, *(getattr(document, field) for field in SEARCH_FIELDS))
+
+
+# -------------------------------
+# Ranked full-text search
+# -------------------------------
+def fts5_query(tokens):
+    # Every token must match, each as a prefix; tokens are plain words, so quoting is safe
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+# InnoDB FULLTEXT leaves words shorter than innodb_ft_min_token_size and
+# stopwords out of the index, so "+li*" can never find the surname "Li".
+# Such tokens are matched with LIKE beside the MATCH instead. Set the two
+# settings below to the server's values; with innodb_ft_min_token_size=1 and
+# innodb_ft_enable_stopword=OFF (then rebuild the index) every word is indexed.
+
+def fulltext_indexed(token):
+    """Whether MySQL's FULLTEXT index holds `token` as a word."""
+    if len(token) < getattr(settings, "SEARCH_FULLTEXT_MIN_TOKEN_SIZE", 3):
+        return False
+    return not (getattr(settings, "SEARCH_FULLTEXT_STOPWORDS", True) and token in INNODB_STOPWORDS)
+
+
+def boolean_mode_query(tokens):
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def like_condition(tokens):
+    """SQL requiring every token inside some document column, with its params."""
+    any_field = "(" + " OR ".join(f"{field} LIKE %s" for field in SEARCH_FIELDS) + ")"
+    return " AND ".join([any_field] * len(tokens)), [f"%{token}%" for token in tokens for _ in SEARCH_FIELDS]
+
+
+def fulltext_ranking(tokens, limit):
+    """[(employee_id, score)] best first, from the vendor's full-text index; None without one."""
+    limit_sql = "LIMIT %s" if limit else ""
+    limit_params = [limit] if limit else []
+    if connection.vendor == "sqlite":
+        # Every match is scored: FTS5 sorts by rank itself, so LIMIT keeps the
+        # best rows rather than the first ones found
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        sql = (
+            f"SELECT rowid, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND rank MATCH 'bm25({weights})' ORDER BY rank, rowid {limit_sql}"
+        )
+        params = [fts5_query(tokens), *limit_params]
+    elif connection.vendor == "mysql":
+        indexed = [token for token in tokens if fulltext_indexed(token)]
+        if not indexed:
+            return None  # nothing the index can answer; the LIKE path handles it
+        match = f"MATCH ({', '.join(SEARCH_FIELDS)}) AGAINST (%s IN BOOLEAN MODE)"
+        where, where_params = match, []
+        unindexed = [token for token in tokens if token not in indexed]
+        if unindexed:
+            like_sql, where_params = like_condition(unindexed)
+            where = f"{match} AND {like_sql}"
+        sql = (
+            f"SELECT employee_id, {match} AS score FROM {DOCUMENT_TABLE} "
+            f"WHERE {where} ORDER BY score DESC, employee_id {limit_sql}"
+        )
+        query = boolean_mode_query(indexed)
+        params = [query, query, *where_params, *limit_params]
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    except DatabaseError:
+        # No FTS5 in this SQLite build, or the index was never created
+        return None
+
+
+def like_ranking(tokens, limit):
+    """Unindexed fallback for other backends: every token inside some field, by name."""
+    documents = EmployeeSearchDocument.objects.all()
+    for token in tokens:
+        any_field = Q()
+        for field in SEARCH_FIELDS:
+            any_field |= Q(**{f"{field}__icontains": token})
+        documents = documents.filter(any_field)
+    ids = documents.order_by("name", "employee_id").values_list("employee_id", flat=True)
+    return [(pk, None) for pk in (ids[:limit] if limit else ids)]
+
+
+def search_employee_ids(query, limit=None):
+    """Employee ids matching every word of `query` as a prefix, best match first."""
+    tokens = tokenize(query)[:MAX_QUERY_TOKENS]
+    if not tokens:
+        return []
+    ranking = fulltext_ranking(tokens, limit)
+    if ranking is None:
+        ranking = like_ranking(tokens, limit)
+    return [pk for pk, _ in ranking]
+
+
+def search_employees(query, limit):
+    """Matching Employee rows (with their user), best match first: two queries."""
+    ids = search_employee_ids(query, limit)
+    if not ids:
+        return []
+    employees = Employee.objects.select_related("user").in_bulk(ids)
+    return [employees[pk] for pk in ids if pk in employees]
+
+
+# -------------------------------
+# In-memory typeahead index
+# -------------------------------
+# Each worker keeps every document's words in one sorted list of
+# "word\0field\0employee_id" keys, so a prefix is a bisect range and a
+# typeahead query costs microseconds without touching the database.
+# Saves in this process are applied on commit; saves in other workers are
+# pulled every SEARCH_INDEX_SYNC_INTERVAL seconds by updated_at. A delete
+# leaves nothing to pull, so each sync also compares the count and id sum of
+# the documents with the index and drops the missing employees when they
+# differ. Deletes also bump a generation number in the cache; with a cache
+# shared between workers that makes the others drop them on their next
+# search instead of at their next sync.
+
+SEARCH_GENERATION_KEY = "search:employees:generation"
+BULK_UPSERT_ROWS = 256
+PHONE_RANK = SEARCH_FIELDS.index("phone")
+
+
+def get_search_generation():
+    generation = cache.get(SEARCH_GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        if not cache.add(SEARCH_GENERATION_KEY, generation, None):
+            generation = cache.get(SEARCH_GENERATION_KEY, generation)
+    return generation
+
+
+def sync_interval():
+    return getattr(settings, "SEARCH_INDEX_SYNC_INTERVAL", 5)
+
+
+def sync_overlap():
+    return getattr(settings, "SEARCH_INDEX_SYNC_OVERLAP", 60)
+
+
+class PrefixIndex:
+    """Word-prefix lookups over (employee_id, *SEARCH_FIELDS) rows."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.keys = []      # sorted index_key() strings
+            self.words = {}     # employee_id -> {word: field rank}
+            self.entries = {}   # employee_id -> typeahead payload
+            self.generation = None
+            self.synced_at = None
+            self.checked_at = 0.0
+
+    @staticmethod
+    def row_words(row):
+        """{word: rank of the first field it appears in}."""
+        words = {}
+        for rank in range(len(SEARCH_FIELDS), 0, -1):
+            tokens = tokenize(row[rank])
+            words.update(dict.fromkeys(tokens, rank - 1))
+            if rank - 1 == PHONE_RANK and len(tokens) > 1:
+                # "+1 555-0100" is also found by typing 15550100
+                words["".join(tokens)] = PHONE_RANK
+        return words
+
+    @staticmethod
+    def row_keys(employee_id, words):
+        # Strings sort faster than tuples; a word never contains NUL
+        return [f"{word}\0{rank}\0{employee_id}" for word, rank in words.items()]
+
+    @staticmethod
+    def key_employee(key):
+        return int(key[key.rindex("\0") + 1:])
+
+    @staticmethod
+    def entry(row):
+        return dict(zip(("id", *SEARCH_FIELDS), row))
+
+    def load(self, rows, generation=None, synced_at=None):
+        """Replace the whole index; the sort runs outside the lock."""
+        words, entries, keys = {}, {}, []
+        for row in rows:
+            words[row[0]] = self.row_words(row)
+            entries[row[0]] = self.entry(row)
+            keys += self.row_keys(row[0], words[row[0]])
+        keys.sort()
+        with self.lock:
+            self.keys, self.words, self.entries = keys, words, entries
+            self.generation, self.synced_at, self.checked_at = generation, synced_at, time.monotonic()
+
+    def upsert(self, rows):
+        rows = list(rows)
+        with self.lock:
+            if self.generation is None:
+                return  # not loaded yet; the first search loads everything
+            if len(rows) > BULK_UPSERT_ROWS:
+                # One filtered copy and a (mostly sorted) sort beat thousands of insorts
+                changed = {row[0] for row in rows}
+                keys = [key for key in self.keys if self.key_employee(key) not in changed]
+                for row in rows:
+                    self.words[row[0]] = self.row_words(row)
+                    self.entries[row[0]] = self.entry(row)
+                    keys += self.row_keys(row[0], self.words[row[0]])
+                keys.sort()
+                self.keys = keys
+                return
+            for row in rows:
+                self._remove(row[0])
+                self.words[row[0]] = self.row_words(row)
+                self.entries[row[0]] = self.entry(row)
+                for key in self.row_keys(row[0], self.words[row[0]]):
+                    insort(self.keys, key)
+
+    def remove(self, employee_ids, previous=None, generation=None):
+        """Drop rows; moving from `previous` to `generation` keeps an up-to-date index loaded."""
+        with self.lock:
+            for employee_id in employee_ids:
+                self._remove(employee_id)
+            if generation is not None and self.generation == previous:
+                self.generation = generation
+
+    def _remove(self, employee_id):
+        for key in self.row_keys(employee_id, self.words.pop(employee_id, {})):
+            position = bisect_left(self.keys, key)
+            if position < len(self.keys) and self.keys[position] == key:
+                del self.keys[position]
+        self.entries.pop(employee_id, None)
+
+    def search(self, query, limit=10):
+        """
+        Employees with a word starting with every word of `query`. Exact
+        words rank before longer completions, then by field (name first).
+        Walks the narrowest prefix range only, so the cost follows `limit`
+        rather than the number of employees.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TOKENS]
+        if not tokens:
+            return []
+        with self.lock:
+            ranges = [
+                (bisect_left(self.keys, token), bisect_left(self.keys, token + "\U0010ffff"), token)
+                for token in tokens
+            ]
+            start, stop, driver = min(ranges, key=lambda item: item[1] - item[0])
+            others = [token for token in tokens if token != driver]
+            results, seen = [], set()
+            for position in range(start, stop):
+                employee_id = self.key_employee(self.keys[position])
+                if employee_id in seen:
+                    continue
+                seen.add(employee_id)
+                words = self.words[employee_id]
+                if all(any(word.startswith(token) for word in words) for token in others):
+                    results.append(self.entries[employee_id])
+                    if len(results) >= limit:
+                        break
+            return results
+
+    def ensure_loaded(self):
+        """
+        Load on first use. Every SEARCH_INDEX_SYNC_INTERVAL seconds pull the
+        documents other workers saved and drop the ones they deleted; a new
+        generation (a delete anywhere) forces that sync straight away.
+        """
+        generation = get_search_generation()
+        stale = generation != self.generation
+        if not stale and time.monotonic() - self.checked_at < sync_interval():
+            return
+        with self.load_lock:
+            if self.generation is None:
+                synced_at = timezone.now()
+                self.load(self.fetch(EmployeeSearchDocument.objects.all()), generation, synced_at)
+                return
+            stale = generation != self.generation
+            if not stale and time.monotonic() - self.checked_at < sync_interval():
+                return
+            synced_at = timezone.now()
+            since = self.synced_at - datetime.timedelta(seconds=sync_overlap())
+            self.upsert(list(self.fetch(EmployeeSearchDocument.objects.filter(updated_at__gte=since))))
+            if stale or self.stored_fingerprint() != self.fingerprint():
+                existing = set(EmployeeSearchDocument.objects.values_list("employee_id", flat=True).iterator(chunk_size=5000))
+                self.remove(self.words.keys() - existing)
+            with self.lock:
+                self.generation, self.synced_at, self.checked_at = generation, synced_at, time.monotonic()
+
+    def fingerprint(self):
+        with self.lock:
+            return len(self.words), sum(self.words)
+
+    @staticmethod
+    def stored_fingerprint():
+        """(count, sum of ids) of the documents: an index-only aggregate that changes on any delete."""
+        totals = EmployeeSearchDocument.objects.aggregate(count=Count("employee_id"), total=Sum("employee_id"))
+        return totals["count"], totals["total"] or 0
+
+    @staticmethod
+    def fetch(documents):
+        return documents.values_list("employee_id", *SEARCH_FIELDS).iterator(chunk_size=5000)
+
+
+prefix_index = PrefixIndex()
+
+
+def typeahead(query, limit=10):
+    prefix_index.ensure_loaded()
+    return prefix_index.search(query, limit)
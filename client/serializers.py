@@ -1,11 +1,14 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Employee, Attendance, Performance
+from .authentication import get_employee_id
+from .fieldsets import FlexFieldsMixin
+from .metrics import TimedSerializerMixin
+from .models import Employee, Attendance, Performance, AttendanceMonthlyRollup, DepartmentMonthlyRollup
 
 # -------------------------
 # User Serializer
 # -------------------------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email", "first_name", "last_name"]
@@ -14,7 +17,7 @@ class UserSerializer(serializers.ModelSerializer):
 # -------------------------
 # Employee Serializer
 # -------------------------
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(),
@@ -38,10 +41,22 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+# -------------------------
+# Compact Employee Serializer (side-loaded lookups)
+# -------------------------
+class EmployeeCompactSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
+    user_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Employee
+        fields = ["id", "user_id", "name", "department", "role"]
+        read_only_fields = fields
+
+
 # -------------------------
 # Attendance Serializer
 # -------------------------
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
     employee = EmployeeSerializer(read_only=True)
 
     class Meta:
@@ -55,15 +70,86 @@ class AttendanceSerializer(serializers.ModelSerializer):
         """
         request = self.context["request"]
         user = request.user
-        if hasattr(user, "employee") and not user.is_staff:
-            validated_data["employee"] = user.employee
+        employee_id = get_employee_id(user)
+        if employee_id and not user.is_staff:
+            validated_data["employee_id"] = employee_id
         return super().create(validated_data)
 
 
+# -------------------------
+# Compact Attendance Serializer (list ?compact=true)
+# -------------------------
+class AttendanceCompactSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
+    employee_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Attendance
+        fields = ["id", "employee_id", "date", "status"]
+        read_only_fields = fields
+
+
+# -------------------------
+# Bulk Attendance Serializer
+# -------------------------
+class AttendanceBulkRowSerializer(serializers.Serializer):
+    employee_id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES)
+
+
+class AttendanceBulkSerializer(serializers.Serializer):
+    """
+    Either an explicit list of records, a department marked with one
+    default status, or both (explicit records override the default).
+    """
+    date = serializers.DateField()
+    records = AttendanceBulkRowSerializer(many=True, required=False)
+    department = serializers.CharField(required=False)
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES, default=Attendance.STATUS_PRESENT)
+
+    def validate(self, attrs):
+        if not attrs.get("records") and not attrs.get("department"):
+            raise serializers.ValidationError("Provide either records or a department.")
+        return attrs
+
+
+# -------------------------
+# Attendance Summary Query Serializer
+# -------------------------
+class AttendanceSummaryQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=["employee", "department", "date"], default="employee")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    department = serializers.CharField(required=False)
+
+
+# -------------------------
+# Monthly Rollup Serializers
+# -------------------------
+class AttendanceMonthlyQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=["employee", "department"], default="employee")
+    month = serializers.DateField(required=False)  # any day within the month
+
+
+class AttendanceMonthlyRollupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    employee_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = AttendanceMonthlyRollup
+        fields = ["employee_id", "month", "present_count", "absent_count"]
+        read_only_fields = fields
+
+
+class DepartmentMonthlyRollupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = DepartmentMonthlyRollup
+        fields = ["department", "month", "present_count", "absent_count"]
+        read_only_fields = fields
+
+
 # -------------------------
 # Performance Serializer
 # -------------------------
-class PerformanceSerializer(serializers.ModelSerializer):
+class PerformanceSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
     employee = EmployeeSerializer(read_only=True)
     employee_id = serializers.PrimaryKeyRelatedField(
         queryset=Employee.objects.all(),
@@ -97,3 +183,92 @@ class PerformanceSerializer(serializers.ModelSerializer):
             # validated_data["employee"] = Employee.objects.first()
 
         return super().create(validated_data)
+
+
+# -------------------------
+# Compact Performance Serializer (list ?compact=true)
+# -------------------------
+class PerformanceCompactSerializer(TimedSerializerMixin, FlexFieldsMixin, serializers.ModelSerializer):
+    employee_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Performance
+        fields = ["id", "employee_id", "task", "rating", "remarks", "date"]
+        read_only_fields = fields
+
+
+# -------------------------
+# Performance Analytics Query Serializer
+# -------------------------
+class PerformanceAnalyticsQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=["employee", "department"], default="employee")
+    bucket = serializers.ChoiceField(choices=["week", "month"], default="month")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    department = serializers.CharField(required=False)
+
+
+# -------------------------
+# Export Query Serializer
+# -------------------------
+class ExportQuerySerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=["csv", "ndjson"], default="csv")  # ?format= is taken by DRF
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    department = serializers.CharField(required=False)
+
+
+# -------------------------
+# Bootstrap Request Serializers
+# -------------------------
+class BootstrapResourceSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    key = serializers.CharField(required=False)  # response key; defaults to name
+    params = serializers.DictField(required=False, default=dict)
+
+
+class BootstrapSerializer(serializers.Serializer):
+    resources = serializers.ListField(child=BootstrapResourceSerializer(), min_length=1, max_length=10)
+
+    def validate_resources(self, resources):
+        for resource in resources:
+            resource.setdefault("key", resource["name"])
+        keys = [resource["key"] for resource in resources]
+        duplicates = sorted({key for key in keys if keys.count(key) > 1})
+        if duplicates:
+            raise serializers.ValidationError(f"Duplicate resource keys: {', '.join(duplicates)}")
+        if "errors" in keys:
+            raise serializers.ValidationError('"errors" is reserved for failed resources.')
+        return resources
+
+
+# -------------------------
+# List Filter Serializers (?date_from=&status=&employee_id=...)
+# -------------------------
+class RecordFilterSerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    employee_id = serializers.IntegerField(required=False, min_value=1)
+    department = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError("date_from must not be after date_to.")
+        return attrs
+
+
+class AttendanceFilterSerializer(RecordFilterSerializer):
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES, required=False)
+
+
+class PerformanceFilterSerializer(RecordFilterSerializer):
+    rating_min = serializers.IntegerField(required=False, min_value=0)
+    rating_max = serializers.IntegerField(required=False, min_value=0)
+
+
+# -------------------------
+# Employee Search Query Serializer (?q=&limit=)
+# -------------------------
+class EmployeeSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200, trim_whitespace=True)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50, default=10)
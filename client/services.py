@@ -0,0 +1,523 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, F, IntegerField, Max, Min, OuterRef, Q, Subquery, Sum, Value, Window
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Coalesce, CumeDist, TruncMonth, TruncWeek
+
+from django.utils import timezone
+
+from .cache import dashboard_cache_key, dashboard_cache_timeout, invalidate_dashboard_metrics
+from .models import Employee, Attendance, Performance, AttendanceMonthlyRollup, DepartmentMonthlyRollup
+
+
+# -------------------------------
+# Upserts
+# -------------------------------
+def upsert_options(unique_fields, update_fields):
+    """
+    bulk_create() kwargs for INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE.
+    MySQL resolves the conflict target itself and rejects `unique_fields`.
+    """
+    options = {"update_conflicts": True, "update_fields": list(update_fields)}
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = list(unique_fields)
+    return options
+
+
+def attendance_upsert_options(update_fields=("status", "updated_at")):
+    """Upsert against the ("employee", "date") unique constraint."""
+    return upsert_options(["employee", "date"], update_fields)
+
+
+def insert_rows(model, fields, rows, unique_fields=(), update_fields=()):
+    """
+    INSERT `rows` (tuples of Python values for `fields`) as multi-row VALUES
+    statements, upserting on `unique_fields` when `update_fields` is given.
+    For imports: skips bulk_create()'s per-object model instances and SQL
+    compilation, and prepares each distinct value once per column. No
+    signals, no auto_now / defaults (pass every NOT NULL column), no pks back.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    opts, quote = model._meta, connection.ops.quote_name
+    model_fields = [opts.get_field(name) for name in fields]
+    prepared = [{} for _ in model_fields]
+
+    def prepare(index, value):
+        cache = prepared[index]
+        if value not in cache:
+            cache[value] = model_fields[index].get_db_prep_save(value, connection)
+        return cache[value]
+
+    sql = "INSERT INTO %s (%s) VALUES " % (quote(opts.db_table), ", ".join(quote(field.column) for field in model_fields))
+    suffix = ""
+    if update_fields:
+        suffix = " " + connection.ops.on_conflict_suffix_sql(
+            model_fields, OnConflict.UPDATE,
+            [opts.get_field(name).column for name in update_fields],
+            [opts.get_field(name).column for name in unique_fields],
+        )
+    placeholder = "(%s)" % ", ".join(["%s"] * len(model_fields))
+    batch_size = max(connection.ops.bulk_batch_size(model_fields, rows), 1)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            params = [prepare(index, value) for row in chunk for index, value in enumerate(row)]
+            cursor.execute(sql + ", ".join([placeholder] * len(chunk)) + suffix, params)
+
+
+def bulk_upsert_attendance(date, statuses):
+    """
+    Write one attendance row per employee for `date` in a single transaction.
+    `statuses` maps employee_id -> status; existing rows get their status updated.
+    """
+    rows = [
+        Attendance(employee_id=employee_id, date=date, status=row_status)
+        for employee_id, row_status in statuses.items()
+    ]
+    if not rows:
+        return []
+    with transaction.atomic():
+        Attendance.objects.bulk_create(rows, **attendance_upsert_options())
+        refresh_attendance_rollups((employee_id, month_start(date)) for employee_id in statuses)
+        invalidate_dashboard_metrics()
+    return rows
+
+
+def mark_present(employee_id, date):
+    """
+    Idempotent single-row upsert of a "present" mark; repeated or concurrent
+    calls for the same (employee, date) collapse onto one row.
+    """
+    row = Attendance(employee_id=employee_id, date=date, status=Attendance.STATUS_PRESENT)
+    with transaction.atomic():
+        Attendance.objects.bulk_create([row], **attendance_upsert_options())
+        if row.pk is None:
+            # Backends without RETURNING (MySQL) leave the pk unset, inserted or updated
+            row.pk = Attendance.objects.filter(employee_id=employee_id, date=date).values_list("id", flat=True).get()
+        refresh_attendance_rollups([(employee_id, month_start(date))])
+        invalidate_dashboard_metrics()
+    return row
+
+
+# -------------------------------
+# Bulk user creation
+# -------------------------------
+def bulk_create_users(users, profiles=None, batch_size=1000):
+    """
+    Insert unsaved User objects (password hashes already set) and their
+    Employee profiles with two bulk_create() calls per batch. post_save
+    does not fire, so create_employee_profile is bypassed; `profiles` maps
+    username -> extra Employee fields (name defaults to the username).
+    Search documents are not written either: callers follow up with
+    client.search.refresh_search_documents().
+    """
+    profiles = profiles or {}
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(users), batch_size):
+            batch = User.objects.bulk_create(users[start:start + batch_size])
+            if batch and batch[0].pk is None:
+                # Backends without RETURNING (MySQL) leave pks unset
+                ids = dict(User.objects.filter(
+                    username__in=[user.username for user in batch]
+                ).values_list("username", "id"))
+                for user in batch:
+                    user.pk = ids[user.username]
+            Employee.objects.bulk_create([
+                Employee(user_id=user.pk, **{"name": user.username, **profiles.get(user.username, {})})
+                for user in batch
+            ])
+            created.extend(batch)
+        invalidate_dashboard_metrics()
+    return created
+
+
+# -------------------------------
+# Attendance summaries
+# -------------------------------
+SUMMARY_GROUPS = {
+    "employee": (("employee_id",), {"name": F("employee__name"), "department": F("employee__department")}),
+    "department": ((), {"department": F("employee__department")}),
+    "date": (("date",), {}),
+}
+
+
+def attendance_summary(queryset=None, group_by="employee", date_from=None, date_to=None, department=None):
+    """
+    Present/absent/total counts grouped by employee, department or date,
+    computed in one GROUP BY query.
+    """
+    if queryset is None:
+        queryset = Attendance.objects.all()
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if department:
+        queryset = queryset.filter(employee__department=department)
+
+    fields, expressions = SUMMARY_GROUPS[group_by]
+    keys = list(fields) + list(expressions)
+    return (
+        queryset.order_by()
+        .values(*fields, **expressions)
+        .annotate(
+            present=Count("id", filter=Q(status=Attendance.STATUS_PRESENT)),
+            absent=Count("id", filter=Q(status=Attendance.STATUS_ABSENT)),
+            total=Count("id"),
+        )
+        .order_by(*keys)
+    )
+
+
+def employee_status_count(status, employee_ref="employee"):
+    """
+    Correlated COUNT of an employee's attendance rows with `status`, for
+    annotating querysets whose rows point at an employee via `employee_ref`.
+    """
+    counts = (
+        Attendance.objects.filter(employee=OuterRef(employee_ref), status=status)
+        .order_by()
+        .values("employee")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+# -------------------------------
+# Monthly rollups
+# -------------------------------
+ROLLUP_CHUNK_SIZE = 500
+
+
+def month_start(value):
+    """First day of the month for a date (or datetime, converted like DateField does)."""
+    value = Attendance._meta.get_field("date").to_python(value)
+    return value.replace(day=1)
+
+
+def next_month(month):
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def refresh_attendance_rollups(keys):
+    """
+    Recompute the employee rollups for the given (employee_id, month) pairs and
+    add the difference to the department rollups they feed. Each pass reads at
+    most one month of attendance for a chunk of employees, so cost tracks the
+    change, not the table.
+
+    Department rows only ever take increments worked out from locked
+    employee rows: concurrent writers (the 9 AM mark-present burst) in one
+    department add to each other's counts instead of overwriting them with a
+    total summed from their own snapshot.
+    """
+    by_month = {}
+    for employee_id, month in set(keys):
+        by_month.setdefault(month, []).append(employee_id)
+
+    with transaction.atomic(savepoint=False):
+        for month, employee_ids in by_month.items():
+            refresh_month_rollups(month, employee_ids)
+
+
+def refresh_month_rollups(month, employee_ids):
+    deltas = {}
+    for start in range(0, len(employee_ids), ROLLUP_CHUNK_SIZE):
+        chunk = employee_ids[start:start + ROLLUP_CHUNK_SIZE]
+        # Create missing rows before locking: a locking read of absent rows
+        # takes MySQL gap locks that deadlock concurrent first-of-month inserts
+        AttendanceMonthlyRollup.objects.bulk_create(
+            [AttendanceMonthlyRollup(employee_id=employee_id, month=month) for employee_id in chunk],
+            ignore_conflicts=True,
+        )
+        previous = {
+            employee_id: (present, absent)
+            for employee_id, present, absent in AttendanceMonthlyRollup.objects.select_for_update()
+            .filter(employee_id__in=chunk, month=month)
+            .values_list("employee_id", "present_count", "absent_count")
+        }
+        counts = (
+            Attendance.objects.filter(employee_id__in=chunk, date__gte=month, date__lt=next_month(month))
+            .order_by()
+            .values("employee_id", department=Coalesce(F("employee__department"), Value("")))
+            .annotate(
+                present=Count("id", filter=Q(status=Attendance.STATUS_PRESENT)),
+                absent=Count("id", filter=Q(status=Attendance.STATUS_ABSENT)),
+            )
+        )
+        rollups = []
+        for row in counts:
+            old_present, old_absent = previous.pop(row["employee_id"], (0, 0))
+            add_rollup_delta(deltas, row["department"], row["present"] - old_present, row["absent"] - old_absent)
+            rollups.append(AttendanceMonthlyRollup(
+                employee_id=row["employee_id"],
+                month=month,
+                present_count=row["present"],
+                absent_count=row["absent"],
+            ))
+        if rollups:
+            AttendanceMonthlyRollup.objects.bulk_create(
+                rollups,
+                **upsert_options(["employee", "month"], ["present_count", "absent_count"]),
+            )
+        # Left in `previous`: employees without attendance this month any more
+        if previous:
+            AttendanceMonthlyRollup.objects.filter(employee_id__in=previous, month=month).delete()
+            emptied = {employee_id: values for employee_id, values in previous.items() if values != (0, 0)}
+            departments = Employee.objects.filter(id__in=emptied).values_list("id", "department")
+            for employee_id, department in departments:
+                add_rollup_delta(deltas, department or "", *(-count for count in emptied[employee_id]))
+    apply_department_deltas(month, deltas)
+
+
+def add_rollup_delta(deltas, department, present, absent):
+    total = deltas.setdefault(department, [0, 0])
+    total[0] += present
+    total[1] += absent
+
+
+def apply_department_deltas(month, deltas):
+    """
+    Add {department: [present, absent]} to the department rollups of `month`
+    in one upsert whose SET clause adds each department's (signed) delta to
+    the stored counts, then drop the rows that reached zero, as a rebuild
+    would. New rows take the delta as is; VALUES are clamped at zero so the
+    counters' CHECK constraints accept them.
+    """
+    if not deltas:
+        return
+    opts, quote = DepartmentMonthlyRollup._meta, connection.ops.quote_name
+    table = quote(opts.db_table)
+    fields = [opts.get_field(name) for name in ("department", "month", "present_count", "absent_count")]
+    counters = [field.column for field in fields[2:]]
+    suffix = connection.ops.on_conflict_suffix_sql(
+        fields, OnConflict.UPDATE, counters, [field.column for field in fields[:2]],
+    )
+    params = []
+    for department, counts in deltas.items():
+        params += [department, fields[1].get_db_prep_save(month, connection), *(max(count, 0) for count in counts)]
+    department_column = "%s.%s" % (table, quote(fields[0].column))
+    for index, column in enumerate(counters):
+        column = quote(column)
+        # Each dialect writes "col = <new row's col>"; make it "col = table.col + CASE ... END"
+        case = "CASE %s %s ELSE 0 END" % (department_column, " ".join(["WHEN %s THEN %s"] * len(deltas)))
+        suffix = re.sub(re.escape(column) + r" = [^,]+", lambda match: f"{column} = {table}.{column} + {case}", suffix)
+        for department, counts in deltas.items():
+            params += [department, counts[index]]
+    placeholder = "(%s)" % ", ".join(["%s"] * len(fields))
+    sql = "INSERT INTO %s (%s) VALUES %s %s" % (
+        table, ", ".join(quote(field.column) for field in fields), ", ".join([placeholder] * len(deltas)), suffix,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+    DepartmentMonthlyRollup.objects.filter(
+        department__in=deltas, month=month, present_count=0, absent_count=0,
+    ).delete()
+
+
+def rebuild_attendance_rollups(batch_size=1000):
+    """
+    Drop and rebuild both rollup tables from the raw attendance rows with
+    one grouped scan. Returns (employee_rollups, department_rollups) written.
+    """
+    employee_rows = (
+        Attendance.objects.order_by()
+        .annotate(month=TruncMonth("date"))
+        .values("employee_id", "month")
+        .annotate(
+            present=Count("id", filter=Q(status=Attendance.STATUS_PRESENT)),
+            absent=Count("id", filter=Q(status=Attendance.STATUS_ABSENT)),
+        )
+    )
+    employee_count = 0
+    with transaction.atomic():
+        AttendanceMonthlyRollup.objects.all().delete()
+        DepartmentMonthlyRollup.objects.all().delete()
+
+        batch = []
+        for row in employee_rows.iterator(chunk_size=batch_size):
+            batch.append(AttendanceMonthlyRollup(
+                employee_id=row["employee_id"],
+                month=row["month"],
+                present_count=row["present"],
+                absent_count=row["absent"],
+            ))
+            if len(batch) >= batch_size:
+                AttendanceMonthlyRollup.objects.bulk_create(batch)
+                employee_count += len(batch)
+                batch = []
+        if batch:
+            AttendanceMonthlyRollup.objects.bulk_create(batch)
+            employee_count += len(batch)
+
+        department_rows = (
+            AttendanceMonthlyRollup.objects.order_by()
+            .values("month", department=Coalesce(F("employee__department"), Value("")))
+            .annotate(present=Sum("present_count"), absent=Sum("absent_count"))
+        )
+        department_rollups = DepartmentMonthlyRollup.objects.bulk_create(
+            [
+                DepartmentMonthlyRollup(
+                    department=row["department"],
+                    month=row["month"],
+                    present_count=row["present"],
+                    absent_count=row["absent"],
+                )
+                for row in department_rows
+            ],
+            batch_size=batch_size,
+        )
+    return employee_count, len(department_rollups)
+
+
+# -------------------------------
+# Dashboard metrics
+# -------------------------------
+def dashboard_attendance_aggregates(day):
+    return {
+        "total": Count("id"),
+        "present_today": Count("id", filter=Q(date=day, status=Attendance.STATUS_PRESENT)),
+        "absent_today": Count("id", filter=Q(date=day, status=Attendance.STATUS_ABSENT)),
+    }
+
+
+DASHBOARD_PERFORMANCE_AGGREGATES = {"total": Count("id"), "average_rating": Avg("rating")}
+
+
+def dashboard_payload(day, attendance, performance, total_employees):
+    average_rating = performance["average_rating"]
+    return {
+        "total_employees": total_employees,
+        "total_attendance": attendance["total"],
+        "total_performance": performance["total"],
+        "present_today": attendance["present_today"],
+        "absent_today": attendance["absent_today"],
+        "average_rating": round(average_rating, 2) if average_rating is not None else None,
+        "date": day.isoformat(),
+    }
+
+
+def compute_dashboard_metrics(day=None):
+    """Three aggregate queries, one per table."""
+    day = day or timezone.localdate()
+    attendance = Attendance.objects.aggregate(**dashboard_attendance_aggregates(day))
+    performance = Performance.objects.aggregate(**DASHBOARD_PERFORMANCE_AGGREGATES)
+    return dashboard_payload(day, attendance, performance, Employee.objects.count())
+
+
+async def acompute_dashboard_metrics(day=None):
+    """compute_dashboard_metrics() on the async ORM."""
+    day = day or timezone.localdate()
+    attendance = await Attendance.objects.aaggregate(**dashboard_attendance_aggregates(day))
+    performance = await Performance.objects.aaggregate(**DASHBOARD_PERFORMANCE_AGGREGATES)
+    return dashboard_payload(day, attendance, performance, await Employee.objects.acount())
+
+
+def get_dashboard_metrics():
+    """Cached counters; signals drop the entry on writes, the timeout bounds staleness."""
+    day = timezone.localdate()
+    return cache.get_or_set(
+        dashboard_cache_key(day),
+        lambda: compute_dashboard_metrics(day),
+        dashboard_cache_timeout(),
+    )
+
+
+async def aget_dashboard_metrics():
+    day = timezone.localdate()
+    key = dashboard_cache_key(day)
+    metrics = await cache.aget(key)
+    if metrics is None:
+        metrics = await acompute_dashboard_metrics(day)
+        await cache.aset(key, metrics, dashboard_cache_timeout())
+    return metrics
+
+
+# -------------------------------
+# Performance analytics
+# -------------------------------
+ANALYTICS_GROUPS = {
+    "employee": ("employee_id", F("employee_id")),
+    "department": ("department", Coalesce(F("employee__department"), Value(""))),
+}
+ANALYTICS_BUCKETS = {"week": TruncWeek, "month": TruncMonth}
+ANALYTICS_PERCENTILES = (25, 50, 75, 90)
+
+
+def performance_analytics(queryset=None, group_by="employee", bucket="month",
+                          date_from=None, date_to=None, department=None):
+    """
+    Per-group rating statistics and a bucketed trend, computed in three
+    queries: a grouped aggregate, a CUME_DIST() window for percentiles and
+    a grouped aggregate per (group, period).
+    """
+    if queryset is None:
+        queryset = Performance.objects.all()
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if department:
+        queryset = queryset.filter(employee__department=department)
+
+    key_name, key = ANALYTICS_GROUPS[group_by]
+    queryset = queryset.order_by().annotate(group_key=key)
+
+    groups = {}
+    summary = queryset.values("group_key").annotate(
+        count=Count("id"),
+        rated=Count("rating"),
+        average=Avg("rating"),
+        min=Min("rating"),
+        max=Max("rating"),
+    ).order_by("group_key")
+    for row in summary:
+        group = row.pop("group_key")
+        average = row["average"]
+        row["average"] = round(average, 2) if average is not None else None
+        groups[group] = {key_name: group, **row, "percentiles": {}, "trend": []}
+
+    # Nearest-rank percentiles: the smallest rating whose cumulative share reaches p
+    distribution = queryset.filter(rating__isnull=False).annotate(
+        cume=Window(CumeDist(), partition_by=[F("group_key")], order_by=F("rating").asc()),
+    ).values("group_key", "rating", "cume").distinct().order_by("group_key", "rating")
+    for row in distribution:
+        percentiles = groups[row["group_key"]]["percentiles"]
+        for p in ANALYTICS_PERCENTILES:
+            name = f"p{p}"
+            if name not in percentiles and row["cume"] >= p / 100:
+                percentiles[name] = row["rating"]
+
+    trend = queryset.annotate(period=ANALYTICS_BUCKETS[bucket]("date")).values("group_key", "period").annotate(
+        count=Count("id"),
+        average=Avg("rating"),
+    ).order_by("group_key", "period")
+    for row in trend:
+        average = row["average"]
+        groups[row["group_key"]]["trend"].append({
+            "period": row["period"],
+            "count": row["count"],
+            "average": round(average, 2) if average is not None else None,
+        })
+
+    return list(groups.values())
+
+
+# -------------------------------
+# Latest performance per employee
+# -------------------------------
+def latest_performances(employee_ids):
+    """{employee_id: newest Performance} for many employees in one query."""
+    newest = Performance.objects.filter(employee_id=OuterRef("pk")).order_by("-date", "-id").values("id")[:1]
+    latest_ids = Employee.objects.filter(id__in=set(employee_ids)).annotate(latest_id=Subquery(newest))
+    performances = Performance.objects.filter(id__in=latest_ids.values("latest_id"))
+    return {performance.employee_id: performance for performance in performances}
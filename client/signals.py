@@ -1,18 +1,129 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Employee
+from django.utils import timezone
+from .cache import bump_profile_version, invalidate_dashboard_metrics, invalidate_jwt_user
+from .models import Employee, Attendance, AttendanceMonthlyRollup, Performance
+from .serializers import UserSerializer
+from .search import SEARCH_FIELDS, forget_employee, index_employee, refresh_search_documents
+from .services import apply_department_deltas, month_start, refresh_attendance_rollups
 
 
 @receiver(post_save, sender=User)
-def create_employee_profile(sender, instance, created, **kwargs):
-    """Create an Employee profile automatically when a new User is created."""
-    if created:
+def create_employee_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    Create an Employee profile automatically when a new User is created.
+    Later User saves (last_login, password re-hash, ...) leave the profile
+    alone; bulk_create_users() creates profiles without this signal.
+    """
+    if created and not raw:
         Employee.objects.create(user=instance, name=instance.username)
 
 
+@receiver(post_save, sender=Attendance)
+def refresh_rollups_on_attendance_save(sender, instance, **kwargs):
+    """Keep the monthly rollups in step with the saved row (and where it moved from)."""
+    keys = {(instance.employee_id, month_start(instance.date))}
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded and "employee_id" in loaded and "date" in loaded:
+        keys.add((loaded["employee_id"], month_start(loaded["date"])))
+    refresh_attendance_rollups(keys)
+
+
+@receiver(post_delete, sender=Attendance)
+def refresh_rollups_on_attendance_delete(sender, instance, origin=None, **kwargs):
+    # Rows cascading from an employee delete are handled once per employee below
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origin_model is not Attendance:
+        return
+    refresh_attendance_rollups([(instance.employee_id, month_start(instance.date))])
+
+
+@receiver(post_save, sender=Employee)
+def refresh_rollups_on_department_change(sender, instance, created, raw=False, **kwargs):
+    """Moving an employee moves their counts between the two departments' rollups."""
+    loaded = getattr(instance, "_loaded_values", None)
+    if created or raw or not loaded or "department" not in loaded or loaded["department"] == instance.department:
+        return
+    with transaction.atomic(savepoint=False):
+        for month, present, absent in locked_rollups(instance.pk):
+            apply_department_deltas(month, {
+                loaded["department"] or "": [-present, -absent],
+                instance.department or "": [present, absent],
+            })
+
+
+@receiver(pre_delete, sender=Employee)
+def remember_rollups(sender, instance, **kwargs):
+    instance._rollups = locked_rollups(instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+def refresh_rollups_on_employee_delete(sender, instance, **kwargs):
+    """The employee's rollups cascaded away; take their counts off the department."""
+    for month, present, absent in getattr(instance, "_rollups", ()):
+        apply_department_deltas(month, {instance.department or "": [-present, -absent]})
+
+
+def locked_rollups(employee_id):
+    return list(
+        AttendanceMonthlyRollup.objects.select_for_update().filter(employee_id=employee_id)
+        .values_list("month", "present_count", "absent_count")
+    )
+
+
+@receiver([post_save, post_delete], sender=Employee)
+@receiver([post_save, post_delete], sender=Attendance)
+@receiver([post_save, post_delete], sender=Performance)
+def invalidate_dashboard_on_change(sender, **kwargs):
+    """Any write to a counted table invalidates the cached dashboard counters."""
+    invalidate_dashboard_metrics()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_caches(sender, instance, **kwargs):
+    """Cached my-profile payloads and JWT user lookups go stale with the user row."""
+    bump_profile_version(instance.pk)
+    invalidate_jwt_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_employee_profile_cache(sender, instance, **kwargs):
+    bump_profile_version(instance.user_id)
+
+
+@receiver(post_save, sender=Employee)
+def refresh_search_document_on_employee_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Rewrite the search document when a searchable column may have changed."""
+    if raw or (update_fields is not None and not set(update_fields) & {*SEARCH_FIELDS, "user", "user_id"}):
+        return
+    index_employee(instance)
+
+
+@receiver(post_save, sender=User)
+def refresh_search_document_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Username / email live on the user. New users are indexed with their
+    profile, and last_login / password saves name their update_fields.
+    """
+    if created or raw or (update_fields is not None and not {"username", "email"} & set(update_fields)):
+        return
+    refresh_search_documents(Employee.objects.filter(user_id=instance.pk))
+
+
 @receiver(post_save, sender=User)
-def save_employee_profile(sender, instance, **kwargs):
-    """Save employee profile linked to the user."""
-    if hasattr(instance, "employee"):
-        instance.employee.save()
+def touch_employee_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Employee payloads embed the user, so a user edit bumps
+    Employee.updated_at and with it the ETags built on it.
+    """
+    if created or raw or (update_fields is not None and not {*UserSerializer.Meta.fields} & set(update_fields)):
+        return
+    Employee.objects.filter(user_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Employee)
+def drop_search_document(sender, instance, **kwargs):
+    forget_employee(instance.pk)
@@ -1,3 +1,760 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from itertools import combinations, product
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .authentication import issue_tokens
+from .benchmarks import full_table_scans, run_suite, searched_tables, seed_benchmark_data, uncovered_routes
+from .conditional import EMBEDS_EMPLOYEE, queryset_state
+from .filters import filter_attendance, filter_performance
+from .imports import import_csv
+from .metrics import registry
+from .models import (
+    Attendance, AttendanceMonthlyRollup, DepartmentMonthlyRollup, Employee, EmployeeSearchDocument, Performance,
+)
+from .pagination import DateKeysetPagination, PerformanceKeysetPagination
+from .search import fulltext_indexed, prefix_index, search_employee_ids, typeahead
+from .services import month_start, rebuild_attendance_rollups, refresh_attendance_rollups
+from .throttling import LoginIdentityThrottle, take_token
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    LOGIN_THROTTLE_ENABLED=False,
+    REQUEST_METRICS_LOG=False,
+    REQUEST_METRICS_ENDPOINT=True,
+)
+class QueryBudgetTests(TestCase):
+    """
+    Runs the benchmark suite (client/benchmarks.py) at two dataset sizes:
+    every endpoint must stay within its query budget, and no endpoint may
+    issue more queries just because the tables grew.
+    """
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(uncovered_routes(), [])
+
+    def test_query_counts_are_bounded_and_flat(self):
+        small = run_suite(seed_benchmark_data(employees=5, days=3), repeat=2)
+        large = run_suite(seed_benchmark_data(employees=40, days=6), repeat=2)
+
+        for before, after in zip(small, large):
+            with self.subTest(endpoint=after["label"]):
+                self.assertTrue(all(code < 400 for code in after["status"]), after)
+                self.assertLessEqual(after["queries"], after["budget"])
+                self.assertEqual(before["queries"], after["queries"])
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class QueryPlanTests(TestCase):
+    """
+    Every combination of list filters and ?ordering= on the attendance and
+    performance lists, and the ETag state aggregate behind it, is answered
+    through an index, never a full table scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        context = seed_benchmark_data(employees=40, days=30)
+        employee = Employee.objects.get(pk=context["employee_id"])
+        cls.common = {
+            "dates": {"date_from": context["today"].replace(day=1).isoformat(), "date_to": context["today"].isoformat()},
+            "employee": {"employee_id": employee.pk},
+            "department": {"department": employee.department or ""},
+        }
+
+    def assert_index_only(self, queryset, filter_queryset, pagination_class, filters, selective, seeks_state):
+        """
+        No full table scans in any page or list-state (ETag) query. Pages
+        with a `selective` filter, and states with a `seeks_state` one, must
+        look rows up through an index rather than walk one.
+        """
+        table = queryset.model._meta.db_table
+        for size in range(len(filters) + 1):
+            for names, ordering in product(combinations(filters, size), pagination_class.orderings):
+                params = {"ordering": ordering}
+                for name in names:
+                    params.update(filters[name])
+                request = Request(APIRequestFactory().get("/", params))
+                filtered = filter_queryset(queryset, request)
+                page = pagination_class().page_queryset(filtered, request)
+                with CaptureQueriesContext(connection) as state:
+                    queryset_state(filtered, related=EMBEDS_EMPLOYEE)
+                with self.subTest(params=params):
+                    self.assertEqual(full_table_scans(page), [])
+                    self.assertEqual(full_table_scans(state[0]["sql"]), [])
+                    if selective & set(names):
+                        self.assertIn(table, searched_tables(page))
+                    if seeks_state & set(names):
+                        self.assertIn(table, searched_tables(state[0]["sql"]))
+
+    def test_attendance_filters_use_indexes(self):
+        self.assert_index_only(
+            Attendance.objects.select_related("employee", "employee__user"), filter_attendance,
+            DateKeysetPagination, {**self.common, "status": {"status": "present"}},
+            selective={"dates", "employee"}, seeks_state={"dates", "employee", "status"},
+        )
+
+    def test_performance_filters_use_indexes(self):
+        self.assert_index_only(
+            Performance.objects.select_related("employee", "employee__user"), filter_performance,
+            PerformanceKeysetPagination, {**self.common, "rating": {"rating_min": 2, "rating_max": 4}},
+            selective={"dates", "employee", "rating"}, seeks_state={"dates", "employee", "rating", "department"},
+        )
+
+
+class SparseFieldsetWriteTests(TestCase):
+    """?fields= on a write shapes the response but never drops submitted fields."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", is_staff=True)
+        cls.user = User.objects.create_user("worker", "worker@example.com", "pw")
+        cls.performance = Performance.objects.create(employee=cls.user.employee, rating=3, task="Review")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_update_saves_fields_missing_from_fieldset(self):
+        response = self.client_for(self.admin).put(
+            f"/api/performance/{self.performance.pk}/?fields=id", {"rating": 5, "task": "Review"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {"id": self.performance.pk})
+        self.performance.refresh_from_db()
+        self.assertEqual(self.performance.rating, 5)
+
+    def test_create_saves_fields_missing_from_fieldset(self):
+        response = self.client_for(self.user).post(
+            "/api/employee-api/attendance/?fields=id", {"date": "2024-03-01", "status": "present"}, format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(set(response.data), {"id"})
+        row = Attendance.objects.get(pk=response.data["id"])
+        self.assertEqual((row.employee_id, row.status), (self.user.employee.pk, "present"))
+
+    def test_fieldset_still_narrows_reads(self):
+        response = self.client_for(self.admin).get(f"/api/performance/{self.performance.pk}/?fields=id,rating")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"id": self.performance.pk, "rating": 3})
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"], LOGIN_THROTTLE_ENABLED=False)
+class TokenClaimTests(TestCase):
+    """Access tokens carry the user claims; refresh tokens re-read them."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("boss", "boss@example.com", "pw", is_staff=True)
+        response = APIClient().post("/api/login/", {"email": "boss@example.com", "password": "pw"}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.tokens = response.data
+
+    def refreshed_access(self):
+        response = APIClient().post("/api/token/refresh/", {"refresh": self.tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        return AccessToken(response.data["access"])
+
+    def test_refresh_token_has_no_privilege_claims(self):
+        access, refresh = AccessToken(self.tokens["access"]), RefreshToken(self.tokens["refresh"])
+        self.assertTrue(access["is_staff"])
+        self.assertEqual(access["employee_id"], self.user.employee.pk)
+        self.assertFalse({"is_staff", "is_superuser", "employee_id"} & set(refresh.payload))
+
+    def test_refresh_picks_up_demotion(self):
+        self.user.is_staff = False
+        self.user.save()
+        self.assertFalse(self.refreshed_access()["is_staff"])
+
+    def test_refresh_picks_up_profile_changes(self):
+        self.user.employee.delete()
+        self.assertIsNone(self.refreshed_access()["employee_id"])
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class LoginThrottleTests(TestCase):
+    """Token buckets on login: bursts beyond the bucket get 429 + Retry-After."""
+
+    def setUp(self):
+        cache.clear()
+
+    @staticmethod
+    def rates(**rates):
+        return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates})
+
+    def login(self, email, **extra):
+        return APIClient().post("/api/login/", {"email": email, "password": "wrong"}, format="json", **extra)
+
+    @rates(login_ip="100/min", login_identity="3/min")
+    def test_burst_on_one_identity_is_throttled(self):
+        codes = [self.login("victim@example.com").status_code for _ in range(3)]
+        self.assertNotIn(429, codes)
+        response = self.login("victim@example.com")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        self.assertNotEqual(self.login("other@example.com").status_code, 429)
+
+    @rates(login_ip="3/min", login_identity="100/min")
+    def test_forwarded_for_does_not_change_the_ip_key(self):
+        codes = [
+            self.login(f"user{n}@example.com", HTTP_X_FORWARDED_FOR=f"10.0.0.{n}").status_code for n in range(4)
+        ]
+        self.assertEqual(codes[-1], 429)
+
+    @rates(login_identity="5/min")
+    def test_concurrent_burst_spends_each_token_once(self):
+        def slow_take_token(*args):
+            time.sleep(0.002)  # widen the read-modify-write window
+            return take_token(*args)
+
+        request = Request(
+            APIRequestFactory().post("/", {"email": "victim@example.com"}, format="json"), parsers=[JSONParser()],
+        )
+        request.data  # parse once, before the threads share the request
+        allowed = []
+        with mock.patch("client.throttling.take_token", slow_take_token):
+            threads = [
+                threading.Thread(target=lambda: allowed.append(LoginIdentityThrottle().allow_request(request, None)))
+                for _ in range(20)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(allowed.count(True), 5)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class KeysetPaginationTests(TestCase):
+    """Following `next` visits every row exactly once, in order, across date ties."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", is_staff=True)
+        employees = [User.objects.create_user(f"e{n}", f"e{n}@example.com", "pw").employee for n in range(6)]
+        today = timezone.localdate()
+        Attendance.objects.bulk_create(
+            Attendance(employee=employee, date=today - timedelta(days=day), status="present")
+            for employee in employees for day in range(3)
+        )
+
+    def collect(self, url):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        rows, pages = [], 0
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            rows += response.data["results"]
+            url, pages = response.data["next"], pages + 1
+        return rows, pages
+
+    def test_next_links_cover_attendance_once(self):
+        rows, pages = self.collect("/api/attendance/?page_size=4")
+        expected = list(Attendance.objects.order_by("-date", "id").values_list("id", flat=True))
+        self.assertEqual([row["id"] for row in rows], expected)
+        self.assertEqual(pages, 5)
+
+    def test_next_links_cover_employees_once(self):
+        rows, _ = self.collect("/api/admin-api/employees/?page_size=3")
+        self.assertEqual([row["id"] for row in rows], list(Employee.objects.order_by("id").values_list("id", flat=True)))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ConditionalGetTests(TestCase):
+    """ETags change when an embedded employee / user row or the row set changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", is_staff=True)
+        cls.user = User.objects.create_user("worker", "worker@example.com", "pw")
+        cls.rows = [
+            Attendance.objects.create(employee=cls.user.employee, date=timezone.localdate() - timedelta(days=day))
+            for day in range(2)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def assert_revalidates(self, url, change):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+    def edit_employee(self):
+        employee = Employee.objects.get(pk=self.user.employee.pk)
+        employee.name = "Renamed"
+        employee.save()
+
+    def edit_user(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.email = "renamed@example.com"
+        user.save()
+
+    def test_list_changes_with_nested_employee(self):
+        self.assert_revalidates("/api/attendance/", self.edit_employee)
+
+    def test_list_changes_with_nested_user(self):
+        self.assert_revalidates("/api/attendance/", self.edit_user)
+
+    def test_performance_list_changes_with_nested_employee(self):
+        Performance.objects.create(employee=self.user.employee, rating=3)
+        self.assert_revalidates("/api/performance/", self.edit_employee)
+
+    def test_detail_changes_with_nested_employee(self):
+        self.assert_revalidates(f"/api/attendance/{self.rows[0].pk}/", self.edit_employee)
+
+    def test_list_changes_on_delete_and_sends_no_last_modified(self):
+        response = self.client.get("/api/attendance/")
+        self.assertNotIn("Last-Modified", response)
+        self.assert_revalidates("/api/attendance/", self.rows[-1].delete)
+
+
+class AsyncListTests(TestCase):
+    """The async list views: ?fields= and a 304 that skips the page query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", is_staff=True)
+        Attendance.objects.create(employee=cls.admin.employee, status=Attendance.STATUS_PRESENT)
+
+    def setUp(self):
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {issue_tokens(self.admin).access_token}"}
+
+    def test_fields_shape_the_results(self):
+        response = self.client.get("/api/async/attendance/?fields=id,status,employee.name", **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [
+            {"id": Attendance.objects.get().pk, "status": "present", "employee": {"name": "admin"}},
+        ])
+
+    def test_not_modified_reads_only_the_state(self):
+        first = self.client.get("/api/async/attendance/", **self.auth)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/async/attendance/", HTTP_IF_NONE_MATCH=first["ETag"], **self.auth)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+
+
+@override_settings(REQUEST_METRICS_ENDPOINT=True, REQUEST_METRICS_TOKEN="scrape-secret", REQUEST_METRICS_ALLOWED_IPS=[])
+class RequestMetricsTests(TestCase):
+    """RequestMetricsMiddleware spans and who may read /api/metrics."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", is_staff=True)
+        cls.user = User.objects.create_user("worker", "worker@example.com", "pw")
+        for day in range(3):
+            Performance.objects.create(employee=cls.user.employee, rating=3, date=timezone.localdate() - timedelta(days=day))
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_metrics_need_an_admin_the_token_or_an_allowed_ip(self):
+        self.assertEqual(APIClient().get("/api/metrics").status_code, 401)
+        self.assertEqual(self.client_for(self.user).get("/api/metrics").status_code, 403)
+        self.assertEqual(self.client_for(self.admin).get("/api/metrics").status_code, 200)
+        self.assertEqual(APIClient().get("/api/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret").status_code, 200)
+        self.assertEqual(APIClient().get("/api/metrics", HTTP_AUTHORIZATION="Bearer guess").status_code, 401)
+        with self.settings(REQUEST_METRICS_ALLOWED_IPS=["127.0.0.1"]):
+            self.assertEqual(APIClient().get("/api/metrics").status_code, 200)
+        with self.settings(REQUEST_METRICS_ENDPOINT=False):
+            self.assertEqual(self.client_for(self.admin).get("/api/metrics").status_code, 404)
+
+    def test_serializer_time_has_its_own_span(self):
+        response = self.client_for(self.admin).get("/api/performance/")
+        self.assertIn("serialize;dur=", response["Server-Timing"])
+        self.assertGreater(registry.views["performance"]["serialize"], 0)
+        self.assertIn("ems_http_request_serialize_seconds_total", registry.render_prometheus())
+
+    def test_sql_of_a_streamed_body_is_recorded(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client_for(self.admin).get("/api/performance/export/?output=csv")
+            body = b"".join(response.streaming_content)
+            response.close()
+        self.assertEqual(body.count(b"\n"), 4)
+        self.assertEqual(registry.views["performance-export"]["queries"], len(queries))
+        self.assertEqual(registry.requests[("performance-export", "GET", "200")], 1)
+
+
+class RollupMaintenanceTests(TestCase):
+    """Signals keep the monthly rollups equal to a full rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ann = User.objects.create_user("ann").employee
+        cls.bob = User.objects.create_user("bob").employee
+        Employee.objects.filter(pk=cls.ann.pk).update(department="Sales")
+        Employee.objects.filter(pk=cls.bob.pk).update(department="Ops")
+        cls.today = timezone.localdate()
+
+    def rollups(self):
+        return (
+            sorted(AttendanceMonthlyRollup.objects.values_list("employee_id", "month", "present_count", "absent_count")),
+            sorted(DepartmentMonthlyRollup.objects.values_list("department", "month", "present_count", "absent_count")),
+        )
+
+    def assert_matches_rebuild(self):
+        maintained = self.rollups()
+        rebuild_attendance_rollups()
+        self.assertEqual(maintained, self.rollups())
+
+    def mark(self, employee, days, status="present"):
+        return [
+            Attendance.objects.create(employee=employee, date=self.today - timedelta(days=day), status=status)
+            for day in days
+        ]
+
+    def test_save_and_status_change(self):
+        row, _ = self.mark(self.ann, [0, 40])
+        self.mark(self.bob, [0], "absent")
+        row.status = "absent"
+        row.save()
+        self.assertEqual(
+            DepartmentMonthlyRollup.objects.get(department="Sales", month=month_start(self.today)).absent_count, 1,
+        )
+        self.assert_matches_rebuild()
+
+    def test_department_rows_take_increments(self):
+        # Counts another writer committed after this one's snapshot are kept, not re-summed away
+        DepartmentMonthlyRollup.objects.create(department="Sales", month=month_start(self.today), present_count=5)
+        row, = self.mark(self.ann, [0], "absent")
+        row.status = "present"
+        row.save()
+        rollup = DepartmentMonthlyRollup.objects.get(department="Sales", month=month_start(self.today))
+        self.assertEqual((rollup.present_count, rollup.absent_count), (6, 0))
+
+    def test_delete(self):
+        rows = self.mark(self.ann, [0, 1])
+        rows[0].delete()
+        self.assert_matches_rebuild()
+
+    def test_department_change_moves_counts(self):
+        self.mark(self.ann, [0, 40])
+        self.mark(self.bob, [0])
+        ann = Employee.objects.get(pk=self.ann.pk)
+        ann.department = "Ops"
+        ann.save()
+        self.assertFalse(DepartmentMonthlyRollup.objects.filter(department="Sales").exists())
+        self.assert_matches_rebuild()
+
+    def test_employee_delete_refreshes_once_per_month(self):
+        self.mark(self.ann, range(10))
+        self.mark(self.bob, [0])
+        with mock.patch("client.signals.refresh_attendance_rollups") as per_row:
+            Employee.objects.get(pk=self.ann.pk).delete()
+        per_row.assert_not_called()
+        self.assertFalse(DepartmentMonthlyRollup.objects.filter(department="Sales").exists())
+        self.assert_matches_rebuild()
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentRollupTests(TransactionTestCase):
+    """Two employees of one department marked at once both count (needs real row locks, not SQLite)."""
+
+    def setUp(self):
+        self.employees = [User.objects.create_user(username).employee for username in ("ann", "bob")]
+        Employee.objects.filter(pk__in=[employee.pk for employee in self.employees]).update(department="Sales")
+        self.today = timezone.localdate()
+
+    def test_interleaved_writers_add_up(self):
+        barrier = threading.Barrier(2, timeout=10)
+        errors = []
+
+        def write(employee):
+            try:
+                with transaction.atomic():
+                    Attendance.objects.bulk_create([Attendance(employee=employee, date=self.today, status="present")])
+                    # Both transactions read before either commits: a re-sum would see only its own row
+                    DepartmentMonthlyRollup.objects.filter(department="Sales").count()
+                    barrier.wait()
+                    refresh_attendance_rollups([(employee.pk, month_start(self.today))])
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        writers = [threading.Thread(target=write, args=(employee,)) for employee in self.employees]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+        self.assertEqual(errors, [])
+        rollup = DepartmentMonthlyRollup.objects.get(department="Sales", month=month_start(self.today))
+        self.assertEqual((rollup.present_count, rollup.absent_count), (2, 0))
+
+
+class TrackedModelTests(TestCase):
+    """save() on a loaded row writes only the dirty fields, or nothing."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee_id = User.objects.create_user("ann").employee.pk
+
+    def save_sql(self, instance, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            instance.save(**kwargs)
+        return [query["sql"] for query in queries if query["sql"].startswith("UPDATE")]
+
+    def test_clean_save_skips_the_update(self):
+        self.assertEqual(self.save_sql(Employee.objects.get(pk=self.employee_id)), [])
+
+    def test_dirty_save_writes_changed_fields_and_auto_now(self):
+        employee = Employee.objects.get(pk=self.employee_id)
+        before = employee.updated_at
+        employee.phone = "555"
+        self.assertEqual(employee.get_dirty_fields(), ["phone"])
+        [sql] = self.save_sql(employee)
+        self.assertIn(connection.ops.quote_name("phone"), sql)
+        self.assertIn(connection.ops.quote_name("updated_at"), sql)
+        self.assertNotIn(connection.ops.quote_name("address"), sql)
+        self.assertEqual(employee.get_dirty_fields(), [])
+        self.assertGreater(Employee.objects.get(pk=self.employee_id).updated_at, before)
+
+    def test_deferred_fields_count_only_when_assigned(self):
+        employee = Employee.objects.only("id", "name").get(pk=self.employee_id)
+        self.assertEqual(employee.get_dirty_fields(), [])
+        employee.address = "1 Main St"
+        self.assertEqual(employee.get_dirty_fields(), ["address"])
+        employee.save()
+        self.assertEqual(Employee.objects.get(pk=self.employee_id).address, "1 Main St")
+
+    def test_explicit_update_fields_are_respected(self):
+        employee = Employee.objects.get(pk=self.employee_id)
+        employee.phone, employee.address = "555", "1 Main St"
+        [sql] = self.save_sql(employee, update_fields=["phone"])
+        self.assertNotIn(connection.ops.quote_name("address"), sql)
+        stored = Employee.objects.get(pk=self.employee_id)
+        self.assertEqual((stored.phone, stored.address), ("555", ""))
+        # The field left out is still dirty and goes out with the next save()
+        self.assertEqual(employee.get_dirty_fields(), ["address"])
+        [sql] = self.save_sql(employee)
+        self.assertIn(connection.ops.quote_name("address"), sql)
+        self.assertNotIn(connection.ops.quote_name("phone"), sql)
+        self.assertEqual(Employee.objects.get(pk=self.employee_id).address, "1 Main St")
+
+    def test_refresh_from_db_resets_the_loaded_values(self):
+        employee = Employee.objects.get(pk=self.employee_id)
+        Employee.objects.filter(pk=self.employee_id).update(phone="555")
+        employee.refresh_from_db()
+        self.assertEqual(employee.get_dirty_fields(), [])
+        self.assertEqual(self.save_sql(employee), [])
+        employee = Employee.objects.only("id").get(pk=self.employee_id)
+        self.assertEqual(employee.phone, "555")  # deferred load goes through refresh_from_db(fields=...)
+        self.assertEqual(employee.get_dirty_fields(), [])
+
+    def test_unsaved_instances_save_every_field(self):
+        employee = Employee(user=User.objects.create_user("bob-extra"), name="Bob")
+        self.assertIsNone(employee.get_dirty_fields())
+        Employee.objects.filter(user=employee.user).delete()
+        employee.save()
+        self.assertEqual(Employee.objects.get(pk=employee.pk).name, "Bob")
+
+
+class MarkPresentTests(TestCase):
+    """employee-api/attendance/mark-present/ is a safe-to-repeat upsert."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ann")
+
+    def mark(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.post("/api/employee-api/attendance/mark-present/")
+
+    def test_repeated_calls_keep_one_present_row(self):
+        responses = [self.mark() for _ in range(3)]
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+        rows = Attendance.objects.filter(employee=self.user.employee)
+        self.assertEqual(list(rows.values_list("date", "status")), [(timezone.localdate(), "present")])
+        rollup = AttendanceMonthlyRollup.objects.get(employee=self.user.employee)
+        self.assertEqual((rollup.present_count, rollup.absent_count), (1, 0))
+
+    def test_response_carries_the_stored_row_id(self):
+        first = self.mark().json()["id"]
+        # Without RETURNING (MySQL) the upsert gives no pk back
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            second = self.mark().json()["id"]
+        self.assertEqual(first, Attendance.objects.get(employee=self.user.employee).pk)
+        self.assertEqual(second, first)
+
+    def test_absent_mark_for_today_becomes_present(self):
+        Attendance.objects.create(employee=self.user.employee, date=timezone.localdate(), status="absent")
+        self.assertEqual(self.mark().status_code, 200)
+        self.assertEqual(Attendance.objects.get(employee=self.user.employee).status, "present")
+        rollup = AttendanceMonthlyRollup.objects.get(employee=self.user.employee)
+        self.assertEqual((rollup.present_count, rollup.absent_count), (1, 0))
+
+
+class CsvImportTests(TestCase):
+    """client.imports: validation, duplicate handling and what each kind writes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ann = User.objects.create_user("ann", "ann@example.com")
+        Employee.objects.filter(user=cls.ann).update(name="Ann Smith")
+
+    def errors(self, result):
+        return {error["line"]: error["error"] for error in result.errors}
+
+    def test_duplicate_emails_are_rejected_ignoring_case(self):
+        result = import_csv("employees", (
+            "username,email\n"
+            "bob,bob@example.com\n"
+            "carl,BOB@example.com\n"
+            "dora,ANN@example.com\n"
+            "erin,Bob@Example.com\n"
+        ), batch_size=2)
+        self.assertEqual(set(self.errors(result)), {3, 4, 5})
+        self.assertEqual(result.created, 1)
+        self.assertFalse(User.objects.filter(username__in=["carl", "dora", "erin"]).exists())
+
+    def test_users_may_keep_their_own_email(self):
+        result = import_csv("employees", "username,email\nann,Ann@Example.com\n")
+        self.assertEqual((result.failed, result.updated), (0, 1))
+        self.assertEqual(User.objects.get(username="ann").email, "Ann@Example.com")
+
+    def test_blank_email_keeps_the_current_email(self):
+        result = import_csv("employees", "username,email,phone\nann,,555\n")
+        self.assertEqual((result.failed, result.updated), (0, 1))
+        self.assertEqual(User.objects.get(username="ann").email, "ann@example.com")
+
+    def test_usernames_are_unique_ignoring_case(self):
+        result = import_csv("employees", "username\nANN\nbob\nBOB\n")
+        self.assertEqual(set(self.errors(result)), {2, 4})
+        self.assertEqual(User.objects.filter(username__iexact="ann").count(), 1)
+
+    def test_role_sets_staff_flags(self):
+        import_csv("employees", "username,role\nann,admin\nbob,superuser\ncarl,\n")
+        flags = dict(
+            (name, (staff, superuser))
+            for name, staff, superuser in User.objects.values_list("username", "is_staff", "is_superuser")
+        )
+        self.assertEqual(flags, {"ann": (True, False), "bob": (True, True), "carl": (False, False)})
+        import_csv("employees", "username,role\nann,employee\nbob,\n")
+        self.assertFalse(User.objects.get(username="ann").is_staff)
+        self.assertTrue(User.objects.get(username="bob").is_superuser)
+
+    def test_blank_name_keeps_the_current_name(self):
+        result = import_csv("employees", "username,name,phone\nann,,555\nbob,,\n")
+        self.assertEqual(result.failed, 0)
+        self.assertEqual(
+            dict(Employee.objects.values_list("user__username", "name")), {"ann": "Ann Smith", "bob": "bob"},
+        )
+        self.assertEqual(Employee.objects.get(user=self.ann).phone, "555")
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        result = import_csv("attendance", (
+            "username,date,status\n"
+            "ann,2024-03-01,present\n"
+            "ann,2024-03-02,late\n"
+            "ann,03/03/2024,absent\n"
+            "nobody,2024-03-04,present\n"
+        ))
+        self.assertEqual(set(self.errors(result)), {3, 4, 5})
+        self.assertEqual(result.created, 1)
+
+    def test_attendance_upserts_and_refreshes_rollups(self):
+        csv_text = "employee_id,date,status\n" + "".join(
+            f"{self.ann.employee.pk},2024-03-{day:02d},{'present' if day % 2 else 'absent'}\n" for day in range(1, 11)
+        )
+        first = import_csv("attendance", csv_text, batch_size=3)
+        again = import_csv("attendance", csv_text.replace("absent", "present"), batch_size=3)
+        self.assertEqual((first.created, again.created, again.updated), (10, 0, 10))
+        rollup = AttendanceMonthlyRollup.objects.get(employee=self.ann.employee)
+        self.assertEqual((rollup.present_count, rollup.absent_count), (10, 0))
+        self.assertEqual(DepartmentMonthlyRollup.objects.get().present_count, 10)
+
+    def test_performance_rows_are_appended(self):
+        result = import_csv("performance", "username,date,task,rating\nann,2024-03-01,Review,4\nann,2024-03-02,,\n")
+        self.assertEqual(result.created, 2)
+        self.assertEqual(
+            sorted(Performance.objects.values_list("task", "rating")), [("", None), ("Review", 4)],
+        )
+
+    def test_dry_run_writes_nothing(self):
+        result = import_csv("employees", "username\nbob\n", dry_run=True)
+        self.assertEqual(result.created, 1)
+        self.assertFalse(User.objects.filter(username="bob").exists())
+
+
+class SearchTests(TestCase):
+    """client.search: ranking, the search documents and the typeahead index."""
+
+    def setUp(self):
+        prefix_index.clear()
+        self.addCleanup(prefix_index.clear)
+
+    def employee(self, username, name, email=None):
+        user = User.objects.create_user(username, email or f"{username}@example.com")
+        employee = Employee.objects.get(user=user)
+        employee.name = name
+        employee.save()
+        return employee
+
+    def names(self, results):
+        return [entry["name"] for entry in results]
+
+    def test_name_match_outranks_earlier_email_matches(self):
+        for number in range(5):
+            self.employee(f"user{number}", f"Pat {number}", f"morgan.{number}@example.com")
+        named = self.employee("lee", "Morgan Lee")
+        self.assertEqual(search_employee_ids("morgan", limit=1), [named.pk])
+        self.assertEqual(len(search_employee_ids("morgan")), 6)
+
+    def test_document_follows_employee_and_user_saves(self):
+        employee = self.employee("sam", "Sam Cole")
+        employee.user.email = "samuel@example.com"
+        employee.user.save()
+        document = EmployeeSearchDocument.objects.get(pk=employee.pk)
+        self.assertEqual((document.name, document.email), ("Sam Cole", "samuel@example.com"))
+        self.assertEqual(search_employee_ids("samuel"), [employee.pk])
+
+    def test_typeahead_sees_saves_after_commit(self):
+        employee = self.employee("sam", "Sam Cole")
+        self.assertEqual(self.names(typeahead("sam")), ["Sam Cole"])
+        with self.captureOnCommitCallbacks(execute=True):
+            employee.name = "Samira Cole"
+            employee.save()
+        self.assertEqual(self.names(typeahead("samir")), ["Samira Cole"])
+
+    @override_settings(SEARCH_INDEX_SYNC_INTERVAL=0)
+    def test_typeahead_drops_employees_deleted_by_another_worker(self):
+        kept, gone = self.employee("sam", "Sam Cole"), self.employee("sal", "Sal Cole")
+        self.assertEqual(len(typeahead("cole")), 2)
+        # Another worker's delete: its on-commit hook, and the generation bump, never run here
+        with self.captureOnCommitCallbacks(execute=False):
+            gone.delete()
+        self.assertEqual(self.names(typeahead("cole")), [kept.name])
+
+    def test_short_words_and_stopwords_skip_the_mysql_index(self):
+        self.assertEqual([fulltext_indexed(token) for token in ("li", "the", "lee")], [False, False, True])
+        with self.settings(SEARCH_FULLTEXT_MIN_TOKEN_SIZE=1, SEARCH_FULLTEXT_STOPWORDS=False):
+            self.assertTrue(fulltext_indexed("li") and fulltext_indexed("the"))
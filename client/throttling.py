@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------
+# In-process token buckets
+# -------------------------------
+class LocalTokenBuckets:
+    """
+    Thread-safe token buckets kept in this process. Used when the shared
+    cache is unreachable so throttling degrades to per-worker limits
+    instead of switching off.
+    """
+    max_keys = 100_000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def consume(self, key, capacity, rate, now):
+        with self.lock:
+            if len(self.buckets) >= self.max_keys and key not in self.buckets:
+                self.buckets.clear()
+            state = self.buckets.get(key)
+            state, wait = take_token(state, capacity, rate, now)
+            self.buckets[key] = state
+            return wait
+
+
+local_buckets = LocalTokenBuckets()
+
+
+def take_token(state, capacity, rate, now):
+    """
+    Refill `state` = (tokens, last_seen) at `rate` tokens/second up to
+    `capacity` and try to take one. Returns (new_state, wait_seconds);
+    wait is 0 when the request may proceed.
+    """
+    tokens, last_seen = state if state else (capacity, now)
+    tokens = min(capacity, tokens + (now - last_seen) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / rate
+
+
+# -------------------------------
+# DRF throttles
+# -------------------------------
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket per key: a rate of "10/min" allows a burst of 10 and then
+    one request every 6 seconds. State lives in the LOGIN_THROTTLE_CACHE
+    cache so limits hold across workers, and in-process buckets take over
+    if that cache errors. The read-modify-write of a bucket runs under a
+    short cache.add() lock so a concurrent burst cannot spend one token
+    twice. Runs in APIView.initial(), so rejected requests never reach the
+    password hasher or the database.
+    """
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    lock_timeout = 1  # seconds; frees the bucket if a worker dies holding it
+    lock_attempts = 20
+    lock_retry_delay = 0.005
+
+    def __init__(self):
+        # Rates are read per request so settings overrides apply
+        pass
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "LOGIN_THROTTLE_ENABLED", True):
+            return True
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity = self.num_requests
+        rate = self.num_requests / self.duration
+        now = time.time()
+        try:
+            shared = caches[getattr(settings, "LOGIN_THROTTLE_CACHE", "default")]
+            self.wait_seconds = self.consume_shared(shared, capacity, rate)
+        except Exception:
+            logger.warning("Throttle cache unavailable; using in-process buckets", exc_info=True)
+            self.wait_seconds = local_buckets.consume(self.key, capacity, rate, now)
+        return self.wait_seconds == 0
+
+    def consume_shared(self, shared, capacity, rate):
+        lock_key = f"{self.key}:lock"
+        for _ in range(self.lock_attempts):
+            if shared.add(lock_key, 1, self.lock_timeout):
+                try:
+                    state, wait = take_token(shared.get(self.key), capacity, rate, time.time())
+                    shared.set(self.key, state, self.duration)
+                    return wait
+                finally:
+                    shared.delete(lock_key)
+            time.sleep(self.lock_retry_delay)
+        # Still contended: this key is being hammered, so reject rather than skip the count
+        return 1 / rate
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """Attempts per client IP."""
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginIdentityThrottle(TokenBucketThrottle):
+    """Attempts per submitted username/email, whichever IP they come from."""
+    scope = "login_identity"
+
+    def get_cache_key(self, request, view):
+        identity = request.data.get("username") or request.data.get("email")
+        if not identity or not isinstance(identity, str):
+            return None
+        ident = hashlib.sha1(identity.strip().lower().encode("utf-8")).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class SignupIPThrottle(LoginIPThrottle):
+    scope = "signup_ip"
@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
+from .bootstrap import bootstrap_view
 from .views import (
     performance_latest_for_employee, signup_view, login_view, my_profile, dashboard_home,
     EmployeeViewSet, EmployeeReadOnlyViewSet,
     AttendanceViewSet, EmployeeAttendanceViewSet,
-    performance_view, performance_detail, # function-based
+    performance_view, performance_detail, performance_analytics_view, performance_export_view, metrics_view, import_view, # function-based
     UserViewSet
 )
 
@@ -30,12 +32,32 @@ urlpatterns = [
     # Profile
     path('my-profile/', my_profile, name='my-profile'),
 
+    # Dashboard
+    path('dashboard/', dashboard_home, name='dashboard'),
+
+    # Several SPA resources in one request
+    path('bootstrap/', bootstrap_view, name='bootstrap'),
+
     # ✅ Performance view added here
     path('performance/', performance_view, name='performance'),
     path("performance/latest/<int:employee_id>/", performance_latest_for_employee, name="performance-latest"),
+    path("performance/analytics/", performance_analytics_view, name="performance-analytics"),
+    path("performance/export/", performance_export_view, name="performance-export"),
 
     path("performance/<int:pk>/", performance_detail, name="performance-detail"),
 
+    # Async read path (native async views, for ASGI deployments)
+    path("async/my-profile/", async_views.my_profile, name="async-my-profile"),
+    path("async/dashboard/", async_views.dashboard_home, name="async-dashboard"),
+    path("async/performance/", async_views.performance_list, name="async-performance"),
+    path("async/attendance/", async_views.attendance_list, name="async-attendance"),
+
+    # Bulk CSV import (admin)
+    path("admin-api/import/<str:kind>/", import_view, name="import"),
+
+    # Prometheus scrape target (opt-in, see REQUEST_METRICS_ENDPOINT)
+    path("metrics", metrics_view, name="metrics"),
+
 
     # Include router URLs
     path('', include(router.urls)),
@@ -1,18 +1,45 @@
-from django.contrib.auth import authenticate
+import csv
+import io
+
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.utils import timezone
 
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    action, api_view, authentication_classes, parser_classes, permission_classes, throttle_classes,
+)
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
-
-from rest_framework_simplejwt.tokens import RefreshToken
-
-from .models import Employee, Attendance, Performance
-from .serializers import EmployeeSerializer, AttendanceSerializer, PerformanceSerializer, UserSerializer
-from .permission import IsAdminOrReadOnly, IsAdminOrOwner, IsEmployeeMarkingOwnAttendance
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.settings import api_settings
+
+from .authentication import MetricsTokenAuthentication, get_db_user, get_employee_id, issue_tokens, users_by_login
+from .cache import get_cached_profile, get_profile_version, set_cached_profile
+from .conditional import EMBEDS_EMPLOYEE, ConditionalGetMixin, conditional_response, instance_state, queryset_state
+from .exports import ATTENDANCE_EXPORT_COLUMNS, PERFORMANCE_EXPORT_COLUMNS, export_response
+from .fieldsets import SparseFieldsMixin, always_loaded, sparse_queryset, wants_sparse
+from .filters import AttendanceFilterMixin, filter_performance, filter_records
+from .imports import IMPORTERS, ImportFileError, import_csv
+from .metrics import registry
+from .models import Employee, Attendance, Performance, AttendanceMonthlyRollup, DepartmentMonthlyRollup
+from .pagination import IdKeysetPagination, DateKeysetPagination, PerformanceKeysetPagination
+from .search import search_employees, typeahead
+from .serializers import (
+    EmployeeSerializer, AttendanceSerializer, PerformanceSerializer, UserSerializer,
+    EmployeeCompactSerializer, AttendanceCompactSerializer, PerformanceCompactSerializer,
+    AttendanceBulkSerializer, AttendanceSummaryQuerySerializer,
+    AttendanceMonthlyQuerySerializer, AttendanceMonthlyRollupSerializer, DepartmentMonthlyRollupSerializer,
+    PerformanceAnalyticsQuerySerializer, ExportQuerySerializer, EmployeeSearchQuerySerializer,
+)
+from .services import (
+    attendance_summary, bulk_upsert_attendance, get_dashboard_metrics, mark_present, month_start,
+    performance_analytics,
+)
+from .throttling import LoginIdentityThrottle, LoginIPThrottle, SignupIPThrottle
+from .permission import CanScrapeMetrics, IsAdminOrReadOnly, IsAdminOrOwner, IsEmployeeMarkingOwnAttendance
 
 
 # ======================================
@@ -21,6 +48,7 @@ from .permission import IsAdminOrReadOnly, IsAdminOrOwner, IsEmployeeMarkingOwnA
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([SignupIPThrottle, LoginIdentityThrottle])
 def signup_view(request):
     username = request.data.get("username")
     email = request.data.get("email")
@@ -30,25 +58,22 @@ def signup_view(request):
     if not username or not email or not password:
         return Response({"error": "All fields are required"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if User.objects.filter(username__iexact=username).exists():
+    if users_by_login("username", username).exists():
         return Response({"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST)
-    if User.objects.filter(email__iexact=email).exists():
+    if users_by_login("email", email).exists():
         return Response({"error": "Email already exists"}, status=status.HTTP_400_BAD_REQUEST)
 
+    # One INSERT for the user; the post_save signal creates the Employee profile
     with transaction.atomic():
-        user = User.objects.create_user(username=username, email=email, password=password)
-
-        if role == "admin":
-            user.is_staff = True
-        elif role == "superuser":
-            user.is_staff = True
-            user.is_superuser = True
-        user.save()
-
-        if role == "employee":
-            Employee.objects.get_or_create(user=user, defaults={"name": username, "role": "employee"})
-
-    refresh = RefreshToken.for_user(user)
+        user = User.objects.create_user(
+            username=username,
+            email=email,
+            password=password,
+            is_staff=role in ("admin", "superuser"),
+            is_superuser=role == "superuser",
+        )
+
+    refresh = issue_tokens(user)
     return Response({
         "id": user.id,
         "username": user.username,
@@ -61,6 +86,7 @@ def signup_view(request):
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginIdentityThrottle])
 def login_view(request):
     """
     Accepts either username or email in the 'username' or 'email' field and a 'password'.
@@ -72,21 +98,23 @@ def login_view(request):
     if not username_or_email or not password:
         return Response({"detail": "Username/email and password required"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if "@" in username_or_email:
-        users = User.objects.filter(email__iexact=username_or_email)
-    else:
-        users = User.objects.filter(username__iexact=username_or_email)
+    # One indexed query; two rows are enough to detect ambiguous logins
+    field = "email" if "@" in username_or_email else "username"
+    users = list(users_by_login(field, username_or_email)[:2])
 
-    if not users.exists():
+    if not users:
+        # Hash anyway so response time does not reveal which accounts exist
+        User().set_password(password)
         return Response({"detail": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
-    if users.count() > 1:
+    if len(users) > 1:
         return Response({"detail": "Multiple accounts found. Contact admin."}, status=status.HTTP_400_BAD_REQUEST)
 
-    user = authenticate(username=users.first().username, password=password)
-    if not user:
+    # check_password() also re-hashes with the active hasher profile when needed
+    user = users[0]
+    if not user.check_password(password) or not user.is_active:
         return Response({"detail": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    refresh = RefreshToken.for_user(user)
+    refresh = issue_tokens(user)
     role = "superuser" if user.is_superuser else ("admin" if user.is_staff else "employee")
 
     return Response({
@@ -106,7 +134,29 @@ def login_view(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def my_profile(request):
+    """
+    Served from a per-user cache entry whose version the User/Employee
+    signals bump, so a hit needs no queries beyond authentication.
+    """
     user = request.user
+    version = get_profile_version(user.id)
+    cached = get_cached_profile(user.id, version)
+    if cached is None:
+        cached = build_profile(request)
+        set_cached_profile(user.id, version, *cached)
+
+    data, updated_at = cached
+    return conditional_response(
+        request, updated_at, 1, lambda: Response(data, status=status.HTTP_200_OK), version=version
+    )
+
+
+def build_profile(request):
+    """(payload, employee updated_at or None) for the logged-in user."""
+    return profile_payload(get_db_user(request.user), request)
+
+
+def profile_payload(user, request=None):
     if hasattr(user, "employee"):
         serializer = EmployeeSerializer(user.employee, context={"request": request})
         data = serializer.data
@@ -116,41 +166,43 @@ def my_profile(request):
             "email": user.email,
             "role": user.employee.role,
         })
-        return Response(data, status=status.HTTP_200_OK)
+        return dict(data), user.employee.updated_at
 
     # If user has no employee (admin / superuser)
-    return Response({
+    return {
         "id": user.id,
         "username": user.username,
         "email": user.email,
         "role": "superuser" if user.is_superuser else "admin",
-    }, status=status.HTTP_200_OK)
+    }, None
 
 
 # ======================================
 # USER VIEWSET
 # ======================================
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all().order_by("id")
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = IdKeysetPagination
 
 
 # ======================================
 # EMPLOYEE VIEWSET
 # ======================================
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = EmployeeSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = IdKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
         if user.is_staff or user.is_superuser:
             return Employee.objects.select_related("user").all()
-        if hasattr(user, "employee"):
-            return Employee.objects.filter(user=user).select_related("user")
+        if get_employee_id(user):
+            return Employee.objects.filter(user_id=user.id).select_related("user")
         return Employee.objects.none()
 
     def perform_create(self, serializer):
@@ -161,17 +213,42 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         user = self.request.user
         employee = self.get_object()
-        if user.is_staff or user.is_superuser or employee.user == user:
+        if user.is_staff or user.is_superuser or employee.user_id == user.id:
             serializer.save()
         else:
             raise PermissionDenied("You can only modify your own account.")
 
+    def search_params(self, request):
+        if not (request.user.is_staff or request.user.is_superuser):
+            raise PermissionDenied("Only admins can search employees.")
+        params = EmployeeSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data["q"], params.validated_data["limit"]
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Ranked full-text search over name, username, email, phone and
+        department (SQLite FTS5 / MySQL FULLTEXT); every word of ?q= must
+        match as a word prefix. Query: ?q=&limit= (max 50), admins only.
+        """
+        employees = search_employees(*self.search_params(request))
+        return Response({"results": self.get_serializer(employees, many=True).data}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def typeahead(self, request):
+        """
+        As-you-type suggestions from this worker's in-memory prefix index:
+        no SQL once the index is loaded. Query: ?q=&limit=, admins only.
+        """
+        return Response({"results": typeahead(*self.search_params(request))}, status=status.HTTP_200_OK)
+
 
 # ======================================
 # EMPLOYEE READ-ONLY VIEWSET
 # ======================================
 
-class EmployeeReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+class EmployeeReadOnlyViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     """
     Exposed at employee-api/profile/ for employees to read their own profile.
     """
@@ -180,30 +257,209 @@ class EmployeeReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        if hasattr(user, "employee"):
-            return Employee.objects.filter(user=user).select_related("user")
+        if get_employee_id(user):
+            return Employee.objects.filter(user_id=user.id).select_related("user")
         return Employee.objects.none()
 
 
+# ======================================
+# COMPACT LIST HELPERS
+# ======================================
+
+def wants_compact(request):
+    """?compact=true returns `employee_id` instead of the nested employee."""
+    return request.query_params.get("compact", "").lower() in ("1", "true", "yes")
+
+
+def wants_employee_sideload(request):
+    """?include=employees adds an `employees` lookup keyed by id."""
+    return "employees" in request.query_params.get("include", "").split(",")
+
+
+def sideload_employees(employee_ids):
+    employees = Employee.objects.filter(id__in=set(employee_ids)).only(
+        "id", "user_id", "name", "department", "role"
+    )
+    return {employee.id: EmployeeCompactSerializer(employee).data for employee in employees}
+
+
+class CompactListMixin:
+    """
+    Serves `list` through `compact_serializer_class` when ?compact=true,
+    dropping the employee/user joins from the queryset.
+    """
+    compact_serializer_class = None
+
+    def is_compact_list(self):
+        return self.action == "list" and wants_compact(self.request)
+
+    def get_serializer_class(self):
+        if self.is_compact_list():
+            return self.compact_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.is_compact_list():
+            queryset = queryset.select_related(None)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.is_compact_list() and wants_employee_sideload(request):
+            rows = response.data["results"] if isinstance(response.data, dict) else response.data
+            response.data["employees"] = sideload_employees(row["employee_id"] for row in rows if "employee_id" in row)
+        return response
+
+
 # ======================================
 # ATTENDANCE VIEWSET
 # ======================================
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(ConditionalGetMixin, CompactListMixin, AttendanceFilterMixin, SparseFieldsMixin,
+                        viewsets.ModelViewSet):
     queryset = Attendance.objects.select_related("employee", "employee__user").all()
     serializer_class = AttendanceSerializer
+    compact_serializer_class = AttendanceCompactSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateKeysetPagination
+    conditional_related = EMBEDS_EMPLOYEE
+
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request):
+        """
+        Present/absent counts grouped by employee, department or date.
+        Query: ?group_by=employee|department|date&date_from=&date_to=&department=
+        Admins see everyone; employees only their own rows.
+        """
+        params = AttendanceSummaryQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        user = request.user
+        queryset = Attendance.objects.all()
+        if not (user.is_staff or user.is_superuser):
+            queryset = queryset.filter(employee__user_id=user.id)
+
+        results = attendance_summary(queryset, **params.validated_data)
+        return Response({
+            "group_by": params.validated_data["group_by"],
+            "results": list(results),
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="monthly")
+    def monthly(self, request):
+        """
+        Pre-aggregated monthly counts read from the rollup tables.
+        Query: ?group_by=employee|department&month=YYYY-MM-DD
+        Department totals are admin only; employees get their own months.
+        """
+        params = AttendanceMonthlyQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        group_by = params.validated_data["group_by"]
+        month = params.validated_data.get("month")
+
+        user = request.user
+        is_admin = user.is_staff or user.is_superuser
+        if group_by == "department":
+            if not is_admin:
+                raise PermissionDenied("Only admins can view department totals.")
+            rollups = DepartmentMonthlyRollup.objects.all()
+            serializer_class = DepartmentMonthlyRollupSerializer
+        else:
+            rollups = AttendanceMonthlyRollup.objects.all()
+            if not is_admin:
+                rollups = rollups.filter(employee__user_id=user.id)
+            serializer_class = AttendanceMonthlyRollupSerializer
+        if month:
+            rollups = rollups.filter(month=month_start(month))
+
+        return Response({
+            "group_by": group_by,
+            "results": serializer_class(rollups, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="bulk", permission_classes=[IsAdminUser])
+    def bulk(self, request):
+        """
+        Mark attendance for many employees on one date in a single upsert.
+        Body: {"date", "records": [{"employee_id", "status"}]} and/or {"department", "status"}.
+        """
+        serializer = AttendanceBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        date = serializer.validated_data["date"]
+        records = serializer.validated_data.get("records") or []
+        department = serializer.validated_data.get("department")
+
+        statuses = {}
+        if department:
+            default_status = serializer.validated_data["status"]
+            for employee_id in Employee.objects.filter(department=department).values_list("id", flat=True):
+                statuses[employee_id] = default_status
+
+        requested = {row["employee_id"] for row in records}
+        known = set(Employee.objects.filter(id__in=requested).values_list("id", flat=True))
+
+        results = []
+        seen = set()
+        for row in records:
+            employee_id = row["employee_id"]
+            if employee_id not in known:
+                results.append({"employee_id": employee_id, "status": row["status"], "error": "Employee not found"})
+            elif employee_id in seen:
+                results.append({"employee_id": employee_id, "status": row["status"], "error": "Duplicate employee"})
+            else:
+                seen.add(employee_id)
+                statuses[employee_id] = row["status"]
+
+        bulk_upsert_attendance(date, statuses)
+        results.extend(
+            {"employee_id": employee_id, "status": row_status, "saved": True}
+            for employee_id, row_status in statuses.items()
+        )
+        saved = len(statuses)
+        return Response({
+            "date": date,
+            "saved": saved,
+            "failed": len(results) - saved,
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Stream attendance as CSV or NDJSON, newest first.
+        Query: ?output=csv|ndjson&date_from=&date_to=&department=
+        Admins export everyone; employees only their own rows.
+        """
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data.pop("output")
+
+        user = request.user
+        queryset = Attendance.objects.all()
+        if not (user.is_staff or user.is_superuser):
+            queryset = queryset.filter(employee__user_id=user.id)
+
+        return export_response(
+            filter_records(queryset, **params.validated_data), ATTENDANCE_EXPORT_COLUMNS, output, "attendance",
+        )
 
 
-class EmployeeAttendanceViewSet(viewsets.ModelViewSet):
+class EmployeeAttendanceViewSet(ConditionalGetMixin, CompactListMixin, AttendanceFilterMixin, SparseFieldsMixin,
+                                viewsets.ModelViewSet):
     """
     Exposed at employee-api/attendance/ — employees manage their own attendance.
     Admins can manage all via admin-api/employees/ (EmployeeViewSet) or a separate admin attendance view if added.
     """
     serializer_class = AttendanceSerializer
+    compact_serializer_class = AttendanceCompactSerializer
+    pagination_class = DateKeysetPagination
+    conditional_related = EMBEDS_EMPLOYEE
 
     def get_permissions(self):
         user = self.request.user
+        if self.action == "mark_present":
+            return [IsAuthenticated()]
         if user.is_staff or user.is_superuser:
             return [IsAdminUser()]
         return [IsEmployeeMarkingOwnAttendance()]
@@ -212,20 +468,36 @@ class EmployeeAttendanceViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if user.is_staff or user.is_superuser:
             return Attendance.objects.select_related("employee", "employee__user").all()
-        if hasattr(user, "employee"):
-            return Attendance.objects.filter(employee__user=user).select_related("employee", "employee__user")
+        employee_id = get_employee_id(user)
+        if employee_id:
+            return Attendance.objects.filter(employee_id=employee_id).select_related("employee", "employee__user")
         return Attendance.objects.none()
 
     def perform_create(self, serializer):
         user = self.request.user
-        if hasattr(user, "employee"):
-            serializer.save(employee=user.employee)
+        employee_id = get_employee_id(user)
+        if employee_id:
+            serializer.save(employee_id=employee_id)
         elif user.is_staff or user.is_superuser:
             # Admins can provide employee via employee_id write field
             serializer.save()
         else:
             raise PermissionDenied("Not authorized to create attendance.")
 
+    @action(detail=False, methods=["post"], url_path="mark-present")
+    def mark_present(self, request):
+        """
+        Mark the logged-in employee present for today with one upsert;
+        safe to call repeatedly. Returns the stored row.
+        """
+        user = request.user
+        employee_id = get_employee_id(user)
+        if not employee_id:
+            return Response({"error": "Employee record not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        row = mark_present(employee_id, timezone.localdate())
+        return Response(AttendanceCompactSerializer(row).data, status=status.HTTP_200_OK)
+
 
 # ======================================
 # PERFORMANCE FUNCTION VIEW
@@ -236,6 +508,9 @@ class EmployeeAttendanceViewSet(viewsets.ModelViewSet):
 def performance_view(request):
     """
     GET: Admins see all; employees see their own performances.
+         ?compact=true / ?include=employees behave as on the attendance lists.
+         Filters: ?date_from=&date_to=&employee_id=&department=&rating_min=&rating_max=
+         and ?ordering=-date|date|-rating|rating.
     POST: Only admins can create performance records.
     """
     user = request.user
@@ -246,12 +521,33 @@ def performance_view(request):
             performances = Performance.objects.select_related("employee", "employee__user").all()
         else:
             # ensure user has an employee record
-            if not hasattr(user, "employee"):
+            employee_id = get_employee_id(user)
+            if not employee_id:
                 return Response({"error": "Employee record not found"}, status=status.HTTP_404_NOT_FOUND)
-            performances = Performance.objects.filter(employee=user.employee).select_related("employee", "employee__user")
-
-        serializer = PerformanceSerializer(performances, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+            performances = Performance.objects.filter(employee_id=employee_id).select_related("employee", "employee__user")
+
+        performances = filter_performance(performances, request)
+        compact = wants_compact(request)
+        if compact:
+            performances = performances.select_related(None)
+        serializer_class = PerformanceCompactSerializer if compact else PerformanceSerializer
+        context = {"request": request}
+        if wants_sparse(request):
+            performances = sparse_queryset(
+                performances, serializer_class(context=context),
+                always=always_loaded(Performance, PerformanceKeysetPagination) + ["employee"],
+            )
+
+        def render():
+            paginator = PerformanceKeysetPagination()
+            page = paginator.paginate_queryset(performances, request)
+            response = paginator.get_paginated_response(serializer_class(page, many=True, context=context).data)
+            if compact and wants_employee_sideload(request):
+                response.data["employees"] = sideload_employees(perf.employee_id for perf in page)
+            return response
+
+        last_modified, count = queryset_state(performances, related=EMBEDS_EMPLOYEE)
+        return conditional_response(request, last_modified, count, render, send_last_modified=False)
 
     # POST
     if not (user.is_staff or user.is_superuser):
@@ -273,30 +569,78 @@ def performance_latest_for_employee(request, employee_id):
     """
     Returns the latest performance record for the given employee_id
     """
-    try:
-        # Get latest performance
-        perf = Performance.objects.filter(employee_id=employee_id).order_by("-date").first()
-        if not perf:
-            # fallback values for chart
-            return Response([
-                {"name": "Task", "value": 0},
-                {"name": "Rating", "value": 0},
-                {"name": "Remarks", "value": 0},
-            ])
-
-        data = [
-            {"name": "Task", "value": len(perf.task)},
-            {"name": "Rating", "value": perf.rating or 0},
-            {"name": "Remarks", "value": len(perf.remarks)},
-        ]
-        return Response(data)
+    perf = Performance.objects.filter(employee_id=employee_id).order_by("-date", "-id").first()
+    return Response(performance_chart(perf))
+
 
-    except Employee.DoesNotExist:
-        return Response([
+def performance_chart(perf):
+    """Chart points for a performance record; zeros when there is none."""
+    if not perf:
+        # fallback values for chart
+        return [
             {"name": "Task", "value": 0},
             {"name": "Rating", "value": 0},
             {"name": "Remarks", "value": 0},
-        ])
+        ]
+    return [
+        {"name": "Task", "value": len(perf.task)},
+        {"name": "Rating", "value": perf.rating or 0},
+        {"name": "Remarks", "value": len(perf.remarks)},
+    ]
+
+
+# ======================================
+# PERFORMANCE ANALYTICS
+# ======================================
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def performance_analytics_view(request):
+    """
+    Rating count/average/min/max, percentiles and a week/month trend per
+    employee or department, aggregated in the database.
+    Query: ?group_by=employee|department&bucket=week|month&date_from=&date_to=&department=
+    Admins see everyone; employees only their own records.
+    """
+    params = PerformanceAnalyticsQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+
+    user = request.user
+    performances = Performance.objects.all()
+    if not (user.is_staff or user.is_superuser):
+        performances = performances.filter(employee__user_id=user.id)
+
+    return Response({
+        "group_by": params.validated_data["group_by"],
+        "bucket": params.validated_data["bucket"],
+        "results": performance_analytics(performances, **params.validated_data),
+    }, status=status.HTTP_200_OK)
+
+
+# ======================================
+# PERFORMANCE EXPORT
+# ======================================
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def performance_export_view(request):
+    """
+    Stream performance records as CSV or NDJSON, newest first.
+    Query: ?output=csv|ndjson&date_from=&date_to=&department=
+    Admins export everyone; employees only their own records.
+    """
+    params = ExportQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    output = params.validated_data.pop("output")
+
+    user = request.user
+    performances = Performance.objects.all()
+    if not (user.is_staff or user.is_superuser):
+        performances = performances.filter(employee__user_id=user.id)
+
+    return export_response(
+        filter_records(performances, **params.validated_data), PERFORMANCE_EXPORT_COLUMNS, output, "performance",
+    )
 
 
 # ======================================
@@ -311,21 +655,28 @@ def performance_detail(request, pk):
     PUT: Admin only
     DELETE: Admin only
     """
+    performances = Performance.objects.select_related("employee", "employee__user")
+    if request.method == "GET" and wants_sparse(request):
+        performances = sparse_queryset(
+            performances, PerformanceSerializer(context={"request": request}), always=["employee", "updated_at"],
+        )
     try:
-        performance = Performance.objects.get(pk=pk)
+        performance = performances.get(pk=pk)
     except Performance.DoesNotExist:
         return Response({"error": "Performance record not found"}, status=status.HTTP_404_NOT_FOUND)
 
     user = request.user
 
     # Permission for viewing
-    if not (user.is_staff or user.is_superuser) and performance.employee.user != user:
+    if not (user.is_staff or user.is_superuser) and performance.employee_id != get_employee_id(user):
         raise PermissionDenied("You are not allowed to access this record.")
 
     # GET
     if request.method == "GET":
-        serializer = PerformanceSerializer(performance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return conditional_response(
+            request, instance_state(performance, related=EMBEDS_EMPLOYEE), 1,
+            lambda: Response(PerformanceSerializer(performance, context={"request": request}).data, status=status.HTTP_200_OK),
+        )
 
     # PUT
     if request.method == "PUT":
@@ -352,8 +703,51 @@ def performance_detail(request, pk):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def dashboard_home(request):
-    return Response({
-        "total_employees": Employee.objects.count(),
-        "total_attendance": Attendance.objects.count(),
-        "total_performance": Performance.objects.count(),
-    }, status=status.HTTP_200_OK)
+    """
+    Totals plus today's present/absent counts and the average rating,
+    served from the cache (see client/cache.py).
+    """
+    return Response(get_dashboard_metrics(), status=status.HTTP_200_OK)
+
+
+# ======================================
+# CSV IMPORT (admin)
+# ======================================
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+@parser_classes([MultiPartParser])
+def import_view(request, kind):
+    """
+    Bulk import a CSV upload ("file") of employees, attendance or performance.
+    ?dry_run=true validates and rolls back. Returns counts and per-row errors.
+    """
+    if kind not in IMPORTERS:
+        raise Http404
+    upload = request.FILES.get("file")
+    if upload is None:
+        raise ValidationError({"file": "Upload a CSV file in the 'file' field."})
+
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true", "yes")
+    try:
+        result = import_csv(kind, stream, dry_run=dry_run)
+    except (ImportFileError, UnicodeDecodeError, csv.Error) as error:
+        raise ValidationError({"file": str(error)})
+    return Response(dict(result.as_dict(), dry_run=dry_run), status=status.HTTP_200_OK)
+
+
+# ======================================
+# METRICS (Prometheus)
+# ======================================
+
+@api_view(["GET"])
+@authentication_classes([MetricsTokenAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+@permission_classes([CanScrapeMetrics])
+def metrics_view(request):
+    """
+    Per-view request metrics from RequestMetricsMiddleware for this worker,
+    in Prometheus text format. Off unless REQUEST_METRICS_ENDPOINT is set;
+    then open to admins, REQUEST_METRICS_TOKEN and REQUEST_METRICS_ALLOWED_IPS.
+    """
+    return HttpResponse(registry.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
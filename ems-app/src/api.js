@@ -161,11 +161,37 @@ const getEndpoint = (profile, type) => {
   return isAdmin(profile) ? `admin-api/${type}/` : `employee-api/${type}/`;
 };
 
+// ----------------------
+// Pagination
+// ----------------------
+// List endpoints return keyset pages ({ next, previous, results }); a
+// screen that shows or counts the whole list must follow `next` to the end.
+export const PAGE_SIZE = 500; // the server's page_size cap
+
+export const fetchRemainingPages = async (page) => {
+  const results = [...(page?.results || [])];
+  let next = page?.next;
+  while (next) {
+    const { data } = await api.get(next);
+    results.push(...data.results);
+    next = data.next;
+  }
+  return results;
+};
+
+const getAllPages = async (url, params) => {
+  const { data } = await api.get(url, { params: { page_size: PAGE_SIZE, ...params } });
+  return fetchRemainingPages(data);
+};
+
 // ----------------------
 // Attendance
 // ----------------------
-export const getAttendance = (profile) =>
-  api.get(getEndpoint(profile, "attendance"));
+// params: { date_from, date_to, status, employee_id, department, ordering }
+export const getAttendance = (profile, params) =>
+  api.get(getEndpoint(profile, "attendance"), { params });
+export const getAllAttendance = (profile, params) =>
+  getAllPages(getEndpoint(profile, "attendance"), params);
 export const addAttendance = (profile, payload) =>
   api.post(getEndpoint(profile, "attendance"), payload);
 export const updateAttendance = (profile, id, payload) =>
@@ -180,8 +206,11 @@ export const markTodayAttendance = () =>
 // ----------------------
 export const getPerformanceById = (profile, id) =>
   api.get(`${getEndpoint(profile, "performance")}${id}/`);
-export const getPerformance = (profile) =>
-  api.get(getEndpoint(profile, "performance"));
+// params: { date_from, date_to, employee_id, department, rating_min, rating_max, ordering }
+export const getPerformance = (profile, params) =>
+  api.get(getEndpoint(profile, "performance"), { params });
+export const getAllPerformance = (profile, params) =>
+  getAllPages(getEndpoint(profile, "performance"), params);
 export const addPerformance = (profile, payload) =>
   api.post(getEndpoint(profile, "performance"), payload);
 export const updatePerformance = (profile, id, payload) =>
@@ -213,9 +242,31 @@ export const deleteProfile = (profile, id) =>
     }${id}/`
   );
 
+// Admin directory search: ranked full-text, and in-memory typeahead for
+// as-you-type suggestions ({ id, name, username, email, phone, department })
+export const searchEmployees = (q, limit = 10) =>
+  api.get("admin-api/employees/search/", { params: { q, limit } });
+export const typeaheadEmployees = (q, limit = 10) =>
+  api.get("admin-api/employees/typeahead/", { params: { q, limit } });
+
 // ----------------------
 // Admin Users
 // ----------------------
 export const getUsers = () => api.get("admin-api/users/");
 
+// ----------------------
+// Bootstrap: several resources in one request
+// ----------------------
+// resources: names or { name, key, params }, e.g.
+// ["profile", { name: "attendance", params: { compact: true } }]
+// Failed resources are listed under `errors` instead of failing the call.
+// List resources come back as one page; pass them to fetchRemainingPages.
+export const getBootstrap = (resources) =>
+  api.post("bootstrap/", {
+    resources: resources.map((r) => (typeof r === "string" ? { name: r } : r)),
+  });
+
+// Bootstrap entry for a list the screen needs in full: the largest page
+export const fullList = (name) => ({ name, params: { page_size: PAGE_SIZE } });
+
 export default api;
@@ -1,11 +1,12 @@
 import React, { useEffect, useState, useContext } from "react";
 import { AuthContext } from "./AuthContext";
 import {
-  getAttendance,
+  getBootstrap,
+  fetchRemainingPages,
+  fullList,
   addAttendance,
   updateAttendance,
   deleteAttendance,
-  getProfiles,
 } from "../api";
 import {
   Box,
@@ -54,17 +55,16 @@ export default function Attendance() {
     setLoading(true);
     const fetchData = async () => {
       try {
-        if (isAdmin) {
-          const [attRes, empRes] = await Promise.all([
-            getAttendance(profile),
-            getProfiles(profile),
-          ]);
-          setRecords(attRes.data.results || attRes.data);
-          setEmployees(empRes.data.results || empRes.data);
-        } else {
-          const attRes = await getAttendance(profile);
-          setRecords(attRes.data.results || attRes.data);
-        }
+        const { data } = await getBootstrap(
+          isAdmin ? [fullList("attendance"), fullList("employees")] : [fullList("attendance")]
+        );
+        // Summaries and the admin table need every row, not just the first page
+        const [allRecords, allEmployees] = await Promise.all([
+          fetchRemainingPages(data.attendance),
+          isAdmin ? fetchRemainingPages(data.employees) : [],
+        ]);
+        setRecords(allRecords);
+        if (isAdmin) setEmployees(allEmployees);
       } catch (err) {
         console.error(err);
         if (err.response?.status === 401) handleLogout();
@@ -1,10 +1,12 @@
 import React, { useEffect, useState, useContext, useMemo } from "react";
 import {
-  getPerformance,
+  getBootstrap,
+  fetchRemainingPages,
+  fullList,
+  getAllPerformance,
   addPerformance,
   updatePerformance,
   deletePerformance,
-  getProfiles,
 } from "../api";
 import { AuthContext } from "./AuthContext";
 import {
@@ -48,13 +50,17 @@ const Performance = () => {
     const fetchData = async () => {
       try {
         // Admin fetches all profiles & performances, non-admin fetches only own
-        const [perfRes, profileRes] = await Promise.all([
-          getPerformance(profile),
-          isAdmin ? getProfiles(profile) : Promise.resolve({ data: [profile] }),
-        ]);
+        const { data } = await getBootstrap(
+          isAdmin ? [fullList("performance"), fullList("employees")] : [fullList("performance")]
+        );
+        if (data.errors?.performance) throw new Error(data.errors.performance.detail);
 
-        setPerformances(perfRes.data || perfRes);
-        setProfiles(profileRes.data || profileRes);
+        const [allPerformances, allProfiles] = await Promise.all([
+          fetchRemainingPages(data.performance),
+          isAdmin ? fetchRemainingPages(data.employees) : [profile],
+        ]);
+        setPerformances(allPerformances);
+        setProfiles(allProfiles);
       } catch (err) {
         console.error("Data fetch error:", err);
         alert("❌ Failed to load performance data.");
@@ -100,8 +106,7 @@ const Performance = () => {
       }
 
       // Refresh performance list
-      const updated = await getPerformance(profile);
-      setPerformances(updated.data || updated);
+      setPerformances(await getAllPerformance(profile));
 
       // Reset form
       setFormData({ id: null, userId: "", score: "", remarks: "" });
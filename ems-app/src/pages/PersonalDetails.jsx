@@ -1,12 +1,13 @@
 // src/components/PersonalDetails.jsx
 import React, { useEffect, useState, useContext, useMemo } from "react";
 import {
-  getProfiles,
-  getUsers,
+  getBootstrap,
+  fetchRemainingPages,
+  fullList,
+  PAGE_SIZE,
   addProfile,
   updateProfile,
   deleteProfile,
-  getLatestPerformance, // new API function
 } from "../api";
 import { AuthContext } from "./AuthContext";
 import {
@@ -62,41 +63,41 @@ export default function PersonalDetails() {
     const fetchData = async () => {
       setLoading(true);
       try {
-        if (isAdmin) {
-          // Admin: fetch all profiles and users
-          const [empRes, userRes] = await Promise.all([getProfiles(profile), getUsers()]);
-          const empArray = Array.isArray(empRes.data) ? empRes.data : empRes.data.results || [];
-          const userArray = Array.isArray(userRes.data) ? userRes.data : userRes.data.results || [];
-          setRecords(empArray);
-          setUsers(userArray);
+        // One request: profiles, users (admin) and the latest performance per profile
+        const { data } = await getBootstrap(
+          isAdmin
+            ? [fullList("employees"), fullList("users"), "latest_performance"]
+            : [fullList("employees"), "latest_performance"]
+        );
+        const [empArray, userArray] = await Promise.all([
+          fetchRemainingPages(data.employees),
+          isAdmin ? fetchRemainingPages(data.users) : [],
+        ]);
+        setRecords(empArray);
+        if (isAdmin) setUsers(userArray);
 
-          // Fetch latest performance for all employees
-          const perfMap = {};
-          for (const emp of empArray) {
-            try {
-              const perfRes = await getLatestPerformance(profile, emp.id);
-              perfMap[emp.id] = perfRes?.data || [
-                { name: "Task Efficiency", value: 0 },
-                { name: "Collaboration", value: 0 },
-                { name: "Punctuality", value: 0 },
-              ];
-            } catch {
-              perfMap[emp.id] = [
-                { name: "Task Efficiency", value: 0 },
-                { name: "Collaboration", value: 0 },
-                { name: "Punctuality", value: 0 },
-              ];
-            }
-          }
-          setPerformanceMap(perfMap);
+        // The bootstrap charts cover the first page of employees; fetch the rest by id
+        const latest = { ...(data.latest_performance || {}) };
+        const missing = isAdmin ? empArray.map((emp) => emp.id).filter((id) => !(id in latest)) : [];
+        for (let i = 0; i < missing.length; i += PAGE_SIZE) {
+          const { data: more } = await getBootstrap([
+            { name: "latest_performance", params: { employee_ids: missing.slice(i, i + PAGE_SIZE) } },
+          ]);
+          Object.assign(latest, more.latest_performance);
+        }
+        const perfMap = {};
+        for (const emp of empArray) {
+          perfMap[emp.id] = latest[emp.id] || [
+            { name: "Task Efficiency", value: 0 },
+            { name: "Collaboration", value: 0 },
+            { name: "Punctuality", value: 0 },
+          ];
+        }
+        setPerformanceMap(perfMap);
 
-        } else {
+        if (!isAdmin) {
           // Non-admin: only own profile
-          const myProfileRes = await getProfiles(profile);
-          const empData = Array.isArray(myProfileRes.data) ? myProfileRes.data : [myProfileRes.data];
-          setRecords(empData);
-
-          const emp = empData[0];
+          const emp = empArray[0];
           if (emp) {
             setEditingId(emp.id);
             setFormData({
@@ -105,25 +106,6 @@ export default function PersonalDetails() {
               phone: emp.phone || "",
               role: emp.role || "",
             });
-
-            try {
-              const perfRes = await getLatestPerformance(profile, emp.id);
-              setPerformanceMap({
-                [emp.id]: perfRes?.data || [
-                  { name: "Task Efficiency", value: 0 },
-                  { name: "Collaboration", value: 0 },
-                  { name: "Punctuality", value: 0 },
-                ],
-              });
-            } catch {
-              setPerformanceMap({
-                [emp.id]: [
-                  { name: "Task Efficiency", value: 0 },
-                  { name: "Collaboration", value: 0 },
-                  { name: "Punctuality", value: 0 },
-                ],
-              });
-            }
           }
         }
       } catch (err) {
@@ -33,7 +33,8 @@ INSTALLED_APPS = [
 # Middleware
 # -----------------------------
 MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',  # Must be first
+    'client.metrics.RequestMetricsMiddleware',  # Outermost, so its timings cover the whole stack
+    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,6 +95,27 @@ DATABASES = {
         },
     }
 }
+# -----------------------------
+# Cache
+# -----------------------------
+# Local memory by default; point at Redis/Memcached to share across workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ems-default",
+    }
+}
+DASHBOARD_CACHE_TIMEOUT = 300  # seconds; upper bound on staleness per worker
+PROFILE_CACHE_TIMEOUT = 600  # seconds; entries are also versioned by signals
+JWT_USER_CACHE_TIMEOUT = 0  # seconds; >0 serves JWT user lookups from the cache
+EXPORT_CHUNK_SIZE = 2000  # rows fetched per round trip by the CSV/NDJSON exports
+SEARCH_INDEX_SYNC_INTERVAL = 5  # seconds between pulls of other workers' saves into the typeahead index
+SEARCH_INDEX_SYNC_OVERLAP = 60  # seconds re-read on each pull (clock skew, late commits)
+# MySQL FULLTEXT: match the server's innodb_ft_min_token_size and innodb_ft_enable_stopword.
+# Shorter words and InnoDB's default stopwords are not indexed, so search matches them with LIKE.
+SEARCH_FULLTEXT_MIN_TOKEN_SIZE = 3
+SEARCH_FULLTEXT_STOPWORDS = True
+
 # -----------------------------
 # Password Validation
 # -----------------------------
@@ -104,6 +126,34 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# -----------------------------
+# Password Hashing
+# -----------------------------
+# Pick a profile with EMS_PASSWORD_HASHER_PROFILE. The first hasher signs new
+# passwords; the rest only verify old hashes, which are re-hashed on login.
+# "argon2" needs argon2-cffi (pip install "django[argon2]").
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": [
+        "client.hashers.TunedPBKDF2PasswordHasher",
+        "client.hashers.TunedArgon2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ],
+    "argon2": [
+        "client.hashers.TunedArgon2PasswordHasher",
+        "client.hashers.TunedPBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+    ],
+}
+PASSWORD_HASHER_PROFILE = os.environ.get("EMS_PASSWORD_HASHER_PROFILE", "pbkdf2")
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+PBKDF2_ITERATIONS = int(os.environ.get("EMS_PBKDF2_ITERATIONS", 1_000_000))
+ARGON2_TIME_COST = int(os.environ.get("EMS_ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.environ.get("EMS_ARGON2_MEMORY_COST", 102400))  # KiB
+ARGON2_PARALLELISM = int(os.environ.get("EMS_ARGON2_PARALLELISM", 8))
+
 # -----------------------------
 # Internationalization
 # -----------------------------
@@ -132,19 +182,49 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # -----------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "client.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Keyset pagination: ?page_size= overrides per request (capped at 500)
+    "DEFAULT_PAGINATION_CLASS": "client.pagination.IdKeysetPagination",
+    "PAGE_SIZE": 50,
+    # Token buckets for login/signup (burst size / refill period), see client/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "30/min",
+        "login_identity": "10/min",
+        "signup_ip": "10/hour",
+    },
+    # Reverse proxies in front of Django; the client IP is taken this many hops back in
+    # X-Forwarded-For, and 0 ignores the header so clients cannot pick their own throttle key
+    "NUM_PROXIES": int(os.environ.get("EMS_NUM_PROXIES", "0")),
 }
+LOGIN_THROTTLE_ENABLED = True
+LOGIN_THROTTLE_CACHE = "default"  # use a shared backend (Redis/Memcached) in production
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Embed user_id/employee_id/is_staff/is_superuser in access tokens so requests skip the user query;
+    # refresh tokens carry only user_id and each refresh re-reads the claims from the database
+    "TOKEN_OBTAIN_SERIALIZER": "client.authentication.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "client.authentication.ClaimsTokenRefreshSerializer",
 }
 
+# -----------------------------
+# Request metrics (client/metrics.py)
+# -----------------------------
+REQUEST_METRICS_ENABLED = True
+REQUEST_METRICS_SERVER_TIMING = True  # Server-Timing: db / view / render / total
+REQUEST_METRICS_LOG = True  # one JSON line per request on the client.metrics logger
+REQUEST_METRICS_DUPLICATE_THRESHOLD = 5  # same SQL this many times in one request logs an N+1 warning
+REQUEST_METRICS_ENDPOINT = os.environ.get("EMS_METRICS_ENDPOINT", "") == "1"  # serve /api/metrics
+# /api/metrics is open to admins, to `Authorization: Bearer <token>` and to these scraper addresses
+REQUEST_METRICS_TOKEN = os.environ.get("EMS_METRICS_TOKEN", "")
+REQUEST_METRICS_ALLOWED_IPS = [ip for ip in os.environ.get("EMS_METRICS_ALLOWED_IPS", "").split(",") if ip]
+
 # -----------------------------
 # Email (for dev)
 # -----------------------------
@@ -165,5 +245,10 @@ LOGGING = {
             'level': 'INFO',  # Only log INFO or higher (ignore DEBUG)
             'propagate': False,
         },
+        'client.metrics': {
+            'handlers': ['console'],
+            'level': os.environ.get('EMS_REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
     },
 }